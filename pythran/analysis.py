@@ -19,6 +19,7 @@ This module provides a few code analysis for the pythran language.
     * HasBreak detects if a loop has a direct break
     * HasContinue detects if a loop has a direct continue
     * LazynessAnalysis returns number of time a name is use.
+    * Liveness computes the names still used after each statement
     * OptimizableComp finds whether a comprehension can be optimized.
     * PotentialIterator finds if it is possible to use an iterator.
     * ArgumentReadOnce counts the usages of each argument of each function
@@ -28,6 +29,7 @@ This module provides a few code analysis for the pythran language.
     * OrderedGlobalDeclarations orders all global functions.
     * Literals lists nodes that are only literals
     * NodeCount counts the number of nodes in a node
+    * NonEscapingLists gathers small lists that never leave their function
 '''
 
 from tables import modules, methods, functions
@@ -1684,6 +1686,83 @@ class LazynessAnalysis(FunctionAnalysis):
         return self.result
 
 
+class Liveness(FunctionAnalysis):
+    """
+    Computes, for each statement of a function, the names whose current value
+    may still be used once the statement is executed.
+
+    Compound statements only account for their header: the loop target and
+    iterable for a for loop, the condition for an if or while statement.
+    Names used in an exception handler are live all along the matching try
+    block, as any statement of the block may raise.
+
+    >>> import ast, passmanager
+    >>> pm = passmanager.PassManager("test")
+    >>> node = ast.parse('''
+    ... def foo(a, n):
+    ...     b = a * 2
+    ...     c = b + 1
+    ...     for i in n:
+    ...         c += i
+    ...     return c''')
+    >>> res = pm.gather(Liveness, node.body[0])
+    >>> [sorted(res[stmt]) for stmt in node.body[0].body]
+    [['b', 'n'], ['c', 'n'], ['c', 'i', 'n'], []]
+    """
+    def __init__(self):
+        self.result = dict()
+        super(Liveness, self).__init__(CFG)
+
+    @staticmethod
+    def header(node):
+        """parts of `node' evaluated by the statement itself"""
+        if isinstance(node, ast.For):
+            return [node.target, node.iter]
+        elif isinstance(node, (ast.If, ast.While)):
+            return [node.test]
+        elif isinstance(node, ast.ExceptHandler):
+            return [n for n in (node.type, node.name) if n]
+        elif isinstance(node, (ast.TryExcept, ast.FunctionDef)):
+            return []
+        else:
+            return [node]
+
+    def visit_FunctionDef(self, node):
+        uses, defs, successors = dict(), dict(), dict()
+        for stmt in self.cfg:
+            if stmt is None:
+                continue
+            names = [n for part in Liveness.header(stmt)
+                     for n in ast.walk(part) if isinstance(n, ast.Name)]
+            uses[stmt] = {n.id for n in names if type(n.ctx) is ast.Load}
+            defs[stmt] = {n.id for n in names if type(n.ctx) is not ast.Load}
+            if isinstance(stmt, ast.AugAssign):
+                uses[stmt].update(defs[stmt])
+            successors[stmt] = [n for n in self.cfg.successors(stmt) if n]
+        # the control flow may reach an handler from any statement of the
+        # body of a try block
+        for stmt in ast.walk(node):
+            if isinstance(stmt, ast.TryExcept):
+                for n in stmt.body:
+                    for m in ast.walk(n):
+                        if m in successors:
+                            successors[m].extend(stmt.handlers)
+
+        live_in = {stmt: set(uses[stmt]) for stmt in uses}
+        live_out = {stmt: set() for stmt in uses}
+        changed = True
+        while changed:
+            changed = False
+            for stmt in uses:
+                out = set().union(*(live_in[n] for n in successors[stmt]))
+                if out != live_out[stmt]:
+                    live_out[stmt] = out
+                    live_in[stmt] = uses[stmt].union(out - defs[stmt])
+                    changed = True
+        del live_out[node]
+        self.result = live_out
+
+
 class PotentialIterator(NodeAnalysis):
     """Find whether an expression can be replaced with an iterator."""
     def __init__(self):
@@ -2088,6 +2167,11 @@ class Dependencies(ModuleAnalysis):
         self.result.add(('types', 'generator'))
         self.generic_visit(node)
 
+    def visit_FunctionDef(self, node):
+        if md.get(node, md.Memoize):
+            self.result.add(('utils', 'memoize'))
+        self.generic_visit(node)
+
     def visit_Num(self, node):
         if type(node.n) is complex:
             self.result.add(('types', 'complex'))
@@ -2133,3 +2217,128 @@ class Literals(ModuleAnalysis):
             targets_id = {target.id for target in node.targets
                           if isinstance(target, ast.Name)}
             self.result.update(targets_id)
+
+
+class NonEscapingLists(ModuleAnalysis):
+    '''
+    Gathers small list literals that never escape their function
+
+    Such a list is bound once to a local name and every use of this name
+    consumes it in place: it is read through a non-negative index, iterated
+    over or passed to a builtin that neither stores nor returns it. Its size
+    never changes and no reference to it outlives the function.
+
+    >>> import ast, passmanager
+    >>> node = ast.parse("""                         \\n\
+def foo(a):                                          \\n\
+    l = [1., 2., 3.]                                 \\n\
+    m = [a, a]                                       \\n\
+    n = [a]                                          \\n\
+    o = [a, 1.]                                      \\n\
+    for x in l: a += x + m[1]                        \\n\
+    a += __builtin__.sum(o) + __builtin__.sum(l)     \\n\
+    return n""")
+    >>> pm = passmanager.PassManager("test")
+    >>> res = pm.gather(NonEscapingLists, node)
+    >>> sorted(len(l.elts) for l in res)
+    [2, 3]
+    '''
+
+    MAX_SIZE = 16
+
+    # builtins that only read their argument, whatever its element types
+    readers = ('len',)
+    # builtins that only read their argument, provided it is iterable, which
+    # a tuple of numbers of different types is not
+    iterable_readers = ('max', 'min', 'sum')
+
+    def __init__(self):
+        self.result = set()
+        super(NonEscapingLists, self).__init__(Ancestors)
+
+    def visit_FunctionDef(self, node):
+        self.bindings = defaultdict(list)
+        for n in ast.walk(node):
+            if isinstance(n, ast.Name) and not isinstance(n.ctx, ast.Load):
+                self.bindings[n.id].append(n)
+            elif isinstance(n, ast.Global):
+                for name in n.names:
+                    self.bindings[name].append(n)
+
+        for name, binders in self.bindings.iteritems():
+            if len(binders) != 1:
+                continue
+            parent = self.ancestors[binders[0]][-1]
+            if not (isinstance(parent, ast.Assign)
+                    and len(parent.targets) == 1
+                    and isinstance(parent.value, ast.List)
+                    and 0 < len(parent.value.elts) <= self.MAX_SIZE):
+                continue
+            value = parent.value
+            homogeneous = self.is_homogeneous(value)
+            uses = [n for n in ast.walk(node)
+                    if isinstance(n, ast.Name) and n.id == name
+                    and isinstance(n.ctx, ast.Load)]
+            if all(self.is_local_use(use, value, homogeneous)
+                   for use in uses):
+                self.result.add(value)
+
+    @staticmethod
+    def is_homogeneous(node):
+        '''
+        Checks whether all elements of `node' are numbers of the same type
+
+        Only such lists are turned into an array, other ones become a tuple
+        that cannot be iterated over or indexed by a variable.
+        '''
+        def num_type(elt):
+            if (isinstance(elt, ast.UnaryOp)
+                    and isinstance(elt.op, (ast.USub, ast.UAdd))):
+                elt = elt.operand
+            if isinstance(elt, ast.Num):
+                return type(elt.n)
+        types = set(map(num_type, node.elts))
+        return len(types) == 1 and types.pop() in (int, float, complex)
+
+    def is_builtin(self, func, names):
+        return (isinstance(func, ast.Attribute)
+                and isinstance(func.value, ast.Name)
+                and func.value.id == '__builtin__'
+                and func.attr in names)
+
+    def is_natural(self, name):
+        '''Checks whether `name' is only bound to non-negative integers'''
+        def natural_binding(binder):
+            parent = self.ancestors[binder][-1]
+            if isinstance(parent, ast.Assign):
+                value = parent.value
+                return (isinstance(value, ast.Num)
+                        and type(value.n) is int and value.n >= 0)
+            elif isinstance(parent, ast.For) and parent.target is binder:
+                return (isinstance(parent.iter, ast.Call)
+                        and self.is_builtin(parent.iter.func,
+                                            ('range', 'xrange'))
+                        and len(parent.iter.args) == 1)
+            return False
+        return all(natural_binding(binder) for binder in self.bindings[name])
+
+    def is_local_use(self, use, value, homogeneous):
+        parent = self.ancestors[use][-1]
+        if isinstance(parent, ast.Subscript):
+            if not (isinstance(parent.ctx, ast.Load)
+                    and isinstance(parent.slice, ast.Index)):
+                return False
+            index = parent.slice.value
+            if isinstance(index, ast.Num):
+                return (type(index.n) is int
+                        and 0 <= index.n < len(value.elts))
+            elif isinstance(index, ast.Name):
+                return homogeneous and self.is_natural(index.id)
+            return False
+        elif isinstance(parent, (ast.For, ast.comprehension)):
+            return homogeneous and parent.iter is use
+        elif isinstance(parent, ast.Call) and parent.args == [use]:
+            return (self.is_builtin(parent.func, self.readers)
+                    or (homogeneous and
+                        self.is_builtin(parent.func, self.iterable_readers)))
+        return False
@@ -10,17 +10,21 @@ from cxxtypes import *
 
 from analysis import LocalDeclarations, GlobalDeclarations, Scope, Dependencies
 from analysis import YieldPoints, BoundedExpressions, ArgumentEffects
+from analysis import PureExpressions, Liveness, UseOMP
 from passmanager import Backend
 
 from tables import operator_to_lambda, modules, type_to_suffix
+from intrinsic import Intrinsic, UpdateEffect
 from tables import pytype_to_ctype_table
 from tables import pythran_ward
 from typing import Types
 from syntax import PythranSyntaxError
+from config import cfg
 
 from openmp import OMPDirective
 
 from math import isnan, isinf
+from collections import Counter
 
 import cStringIO
 import unparse
@@ -94,22 +98,35 @@ class Cxx(Backend):
         self.declarations = list()
         self.definitions = list()
         self.break_handlers = list()
+        self.moves = set()
+        self.releases = dict()
         self.result = None
         super(Cxx, self).__init__(Dependencies, GlobalDeclarations,
                                   BoundedExpressions, Types, ArgumentEffects,
                                   Scope)
 
+    def visit(self, node):
+        stmt = super(Cxx, self).visit(node)
+        # release the variables no longer used after this statement
+        released = self.releases.get(node)
+        if released:
+            self.dependencies.add(('utils', 'release'))
+            return Module([stmt] + [
+                Statement("pythonic::utils::release({0})".format(name))
+                for name in released])
+        return stmt
+
     # mod
     def visit_Module(self, node):
+        # remove top-level strings
+        fbody = (n for n in node.body if not isinstance(n, ast.Expr))
+        body = map(self.visit, fbody)
+
         # build all types
         def gen_include(t):
             return "/".join(("pythonic",) + t) + ".hpp"
         headers = map(Include, sorted(map(gen_include, self.dependencies)))
 
-        # remove top-level strings
-        fbody = (n for n in node.body if not isinstance(n, ast.Expr))
-        body = map(self.visit, fbody)
-
         nsbody = body + self.declarations + self.definitions
         ns = Namespace(pythran_ward + self.passmanager.module_name, nsbody)
         self.result = CompilationUnit(headers + [ns])
@@ -128,6 +145,107 @@ class Cxx(Backend):
         self.ldecls = [ld for ld in self.ldecls if ld.id not in locals]
         return Block(locals_visited + [node_visited])
 
+    # liveness processing
+    @staticmethod
+    def intrinsic(node):
+        '''Returns the intrinsic `node' refers to, if any'''
+        path = []
+        while isinstance(node, ast.Attribute):
+            path.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name) or node.id not in modules:
+            return None
+        obj = modules[node.id]
+        for attr in reversed(path):
+            if not isinstance(obj, dict) or attr not in obj:
+                return None
+            obj = obj[attr]
+        return obj if isinstance(obj, Intrinsic) else None
+
+    def process_liveness(self, node, formal_args):
+        '''
+        Computes the local variables of function `node' whose value is used
+        for the last time by a statement.
+        Such a variable is moved from when it is assigned or passed to an
+        intrinsic that does not update it, and its storage is released once
+        the statement is executed, so that temporaries do not outlive their
+        last use.
+        '''
+        self.moves = set()
+        self.releases = dict()
+        # generator states outlive their statements and threads of a
+        # parallel region share their variables
+        if self.yields or self.passmanager.gather(UseOMP, node, self.ctx):
+            return
+        liveness = self.passmanager.gather(Liveness, node, self.ctx)
+        # lazy variables may hold references to the variables they are
+        # computed from, which must then be kept as is
+        lazy = {d.id for d in self.ldecls if isinstance(self.types[d], Lazy)}
+        pinned = set(formal_args)
+        for stmt in ast.walk(node):
+            # loop targets and exception names may be references to the
+            # content of another value
+            if isinstance(stmt, ast.For):
+                bound = [stmt.target]
+            elif isinstance(stmt, ast.ExceptHandler) and stmt.name:
+                bound = [stmt.name]
+            elif (isinstance(stmt, ast.Assign)
+                    and any(isinstance(t, ast.Name) and t.id in lazy
+                            for t in stmt.targets)):
+                bound = [stmt.value]
+            else:
+                continue
+            pinned.update(n.id for b in bound for n in ast.walk(b)
+                          if isinstance(n, ast.Name))
+        candidates = {d.id for d in self.ldecls}.difference(pinned)
+
+        simple_statements = (ast.Assign, ast.AugAssign, ast.Expr, ast.Print,
+                             ast.Return)
+        for stmt, live in liveness.iteritems():
+            if not isinstance(stmt, simple_statements):
+                continue
+            loads = [n for n in ast.walk(stmt)
+                     if isinstance(n, ast.Name) and type(n.ctx) is ast.Load]
+            # names rebound to a new value by this statement
+            rebound = set()
+            # names used or updated by a target of this statement
+            stored = set()
+            for target in (stmt.targets if isinstance(stmt, ast.Assign)
+                           else [getattr(stmt, 'target', None)]):
+                if isinstance(stmt, ast.Assign) and isinstance(target,
+                                                               ast.Name):
+                    rebound.add(target.id)
+                elif target is not None:
+                    stored.update(n.id for n in ast.walk(target)
+                                  if isinstance(n, ast.Name))
+            dead = {n.id for n in loads if n.id not in live}
+            dead.intersection_update(candidates)
+            dead.difference_update(self.scope[stmt])
+
+            # positions where the value of a name is copied
+            copies = set()
+            if isinstance(stmt, ast.Assign):
+                copies.add(stmt.value)
+            for call in ast.walk(stmt):
+                if isinstance(call, ast.Call):
+                    intrinsic = Cxx.intrinsic(call.func)
+                    if intrinsic:
+                        effects = intrinsic.argument_effects
+                        copies.update(
+                            arg for i, arg in enumerate(call.args)
+                            if i < len(effects)
+                            and not isinstance(effects[i], UpdateEffect))
+
+            # moving a name used twice would not leave a value for the other
+            # use, as the evaluation order is unspecified
+            counts = Counter(n.id for n in loads)
+            movable = (dead | (rebound & candidates)) - stored
+            self.moves.update(n for n in loads
+                              if n.id in movable and counts[n.id] == 1
+                              and n in copies)
+            if dead and not isinstance(stmt, ast.Return):
+                self.releases[stmt] = sorted(dead)
+
     # openmp processing
     def process_omp_attachements(self, node, stmt, index=None):
         l = metadata.get(node, OMPDirective)
@@ -220,8 +338,27 @@ class Cxx(Backend):
         self.yields = {k: (1 + v, "yield_point{0}".format(1 + v)) for (v, k) in
                        enumerate(self.passmanager.gather(YieldPoints, node))}
 
+        memoized = metadata.get(node, metadata.Memoize)
+        if memoized:
+            if self.yields:
+                raise PythranSyntaxError("Cannot memoize a generator", node)
+            if not fargs:
+                raise PythranSyntaxError(
+                    "Cannot memoize function `{0}' without arguments".format(
+                        node.name),
+                    node)
+            pure = self.passmanager.gather(PureExpressions, self.ctx.module)
+            if node not in pure:
+                raise PythranSyntaxError(
+                    "Cannot memoize impure function `{0}'".format(node.name),
+                    node)
+
+        self.process_liveness(node, formal_args)
+
         # gather body dump
         operator_body = map(self.visit, node.body)
+        self.moves = set()
+        self.releases = dict()
 
         # compute arg dump
         default_arg_values = (
@@ -477,11 +614,18 @@ class Cxx(Backend):
                    for k, v in self.extra_declarations]
                 )
             dependent_typedefs = ctx.typedefs()
+            operator_statements = (dependent_typedefs
+                                   + operator_local_declarations
+                                   + operator_body)
+            if memoized:
+                operator_statements = self.memoize(
+                    "typename {0}result_type".format(ffscope),
+                    formal_types,
+                    formal_args,
+                    operator_statements)
             operator_definition = FunctionBody(
                 templatize(operator_signature, formal_types),
-                Block(dependent_typedefs
-                      + operator_local_declarations
-                      + operator_body)
+                Block(operator_statements)
                 )
 
             ctx = CachedTypeVisitor()
@@ -510,6 +654,22 @@ class Cxx(Backend):
 
         return EmptyStatement()
 
+    def memoize(self, result_type, formal_types, formal_args, statements):
+        '''
+        Wraps a function body so that its results are looked up in a cache
+        keyed by the argument values before being computed.
+        '''
+        cache_type = "pythonic::utils::lru_cache<std::tuple<{0}>, {1}>".format(
+            ", ".join(formal_types), result_type)
+        compute = "[&]() -> {0} {1}".format(
+            result_type, "\n".join(Block(statements).generate()))
+        return [
+            Statement("static {0} __cache({1})".format(
+                cache_type, cfg.getint('memoize', 'max_size'))),
+            ReturnStatement("__cache(std::make_tuple({0}), {1})".format(
+                ", ".join(formal_args), compute))
+            ]
+
     def visit_Return(self, node):
         if self.yields:
             return Block([
@@ -605,6 +765,12 @@ class Cxx(Backend):
 
         self.break_handlers.pop()
 
+        # the arrays are shadowed by pointers within a restricted loop
+        restrict = self.restricted_arrays(node)
+        if restrict:
+            local_target_decl = NamedType(
+                "typename decltype({0})::iterator".format(local_iter))
+
         # eventually add local_iter in a shared clause
         omp = metadata.get(node, OMPDirective)
         if omp:
@@ -649,6 +815,8 @@ class Cxx(Backend):
                 "++{0}".format(local_target),
                 Block([loop_body_prelude, loop_body])
                 )
+        if restrict:
+            loop = self.process_restrict(restrict, loop)
         stmts = [prelude, loop]
 
         # in that case when can proceed to a reserve
@@ -665,6 +833,34 @@ class Cxx(Backend):
 
         return Block(self.process_omp_attachements(node, stmts, 1))
 
+    def restricted_arrays(self, node):
+        '''
+        Returns the arrays of loop `node' that cannot alias each other and
+        are still used by its body.
+        '''
+        if self.yields:
+            return []
+        used = {n.id for stmt in node.body for n in ast.walk(stmt)
+                if isinstance(n, ast.Name)}
+        return [array for flag in metadata.get(node, metadata.Restrict)
+                for array in flag.arrays
+                if array in used and array in self.local_names]
+
+    def process_restrict(self, arrays, loop):
+        '''
+        Runs `loop' in a lambda whose parameters shadow `arrays', so that
+        flat arrays are accessed through restrict-qualified pointers.
+        '''
+        self.dependencies.add(('utils', 'restrict'))
+        parameters = [
+            "typename pythonic::utils::restrict_type<typename "
+            "std::remove_reference<decltype({0})>::type>::type {0}".format(
+                array)
+            for array in arrays]
+        arguments = ["pythonic::utils::restrict_ptr({0})".format(array)
+                     for array in arrays]
+        return LambdaCall(parameters, Block([loop]), arguments)
+
     def visit_While(self, node):
         test = self.visit(node.test)
 
@@ -914,7 +1110,9 @@ class Cxx(Backend):
             return "{1}[{0}]".format(slice, value)
 
     def visit_Name(self, node):
-        if node.id in self.local_names:
+        if node in self.moves:
+            return "std::move({0})".format(node.id)
+        elif node.id in self.local_names:
             return node.id
         elif node.id in self.global_declarations:
             return "{0}()".format(node.id)
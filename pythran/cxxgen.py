@@ -390,6 +390,24 @@ class FunctionBody(Generable):
             yield b_line
 
 
+class LambdaCall(Generable):
+    def __init__(self, parameters, body, arguments):
+        """Initialize a lambda called where it is defined. *body* is
+        expected to be a :class:`Block` that captures variables by
+        reference.
+        """
+        self.parameters = parameters
+        self.body = body
+        self.arguments = arguments
+
+    def generate(self):
+        yield "[&](%s)" % ", ".join(self.parameters)
+        lines = list(self.body.generate())
+        for line in lines[:-1]:
+            yield line
+        yield "%s(%s);" % (lines[-1], ", ".join(self.arguments))
+
+
 # block -----------------------------------------------------------------------
 class Block(Generable):
     def __init__(self, contents=[]):
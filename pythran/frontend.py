@@ -5,10 +5,14 @@ import re
 import ast
 from passes import NormalizeIdentifiers, ExtractTopLevelStmts
 from openmp import GatherOMPData
-from syntax import check_syntax
+from syntax import check_syntax, PythranSyntaxError
+import metadata
 
 
 def parse(pm, code):
+    # functions whose results should be cached
+    memoized = re.findall(r'^#\s*pythran\s+memoize\s+(\w+)', code, re.M)
+
     # hacky way to turn OpenMP comments into strings
     code = re.sub(r'(\s*)#\s*(omp\s[^\n]+)', r'\1"\2"', code)
 
@@ -24,4 +28,14 @@ def parse(pm, code):
     # avoid conflicts with cxx keywords
     renamings = pm.apply(NormalizeIdentifiers, ir)
     check_syntax(ir)
+
+    # flag memoized functions
+    functions = {stmt.name: stmt for stmt in ir.body
+                 if isinstance(stmt, ast.FunctionDef)}
+    for name in memoized:
+        name = renamings.get(name, name)
+        if name not in functions:
+            raise PythranSyntaxError(
+                "Cannot memoize unknown function `{0}'".format(name))
+        metadata.add(functions[name], metadata.Memoize())
     return ir, renamings
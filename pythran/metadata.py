@@ -27,12 +27,28 @@ class Lazy(AST):
     pass
 
 
+class Memoize(AST):
+    pass
+
+
 class Comprehension(AST):
     def __init__(self, *args):  # no positional argument to be deep copyable
         if args:
             self.target = args[0]
 
 
+class Restrict(AST):
+    def __init__(self, *args):  # no positional argument to be deep copyable
+        if args:
+            self.arrays = args[0]
+
+
+class FixedShape(AST):
+    def __init__(self, *args):  # no positional argument to be deep copyable
+        if args:
+            self.arg, self.extents = args
+
+
 def add(node, data):
     if not hasattr(node, 'metadata'):
         setattr(node, 'metadata', Metadata())
@@ -8,9 +8,48 @@ from passes import NormalizeMethodCalls, FalsePolymorphism
 from passes import RemoveComprehension, RemoveNestedFunctions, ExpandImports
 from passes import NormalizeCompare, ExpandImportAll
 from optimizations import GenExpToImap, ListCompToMap, ListCompToGenexp, Pow2
+from optimizations import GeneratorToGenExp
 
+import logging
+logger = logging.getLogger(__name__)
 
-def refine(pm, node, optimizations):
+
+def fixed_point(pm, node, optimizations, max_iterations):
+    """
+    apply `optimizations' in order on node, in place, until none of them
+    changes it or `max_iterations' iterations are done
+
+    An optimization is not applied again as long as the node has not been
+    changed by another optimization since its last application.
+    Returns, for each iteration, the names of the optimizations that changed
+    the node.
+    """
+    statistics = []
+    changes = 0  # number of changes so far
+    applied = dict()  # number of changes when each optimization was applied
+    for iteration in xrange(max_iterations):
+        updated = []
+        for optimization in optimizations:
+            if applied.get(optimization) == changes:
+                continue
+            update, _ = pm.update(optimization, node)
+            if update:
+                updated.append(optimization.__name__)
+                changes += 1
+            applied[optimization] = changes
+        statistics.append(updated)
+        logger.info("fixed point iteration {0}: {1}".format(
+            iteration, ", ".join(updated) or "no change"))
+        if not updated:
+            break
+    else:
+        logger.info("fixed point not reached after {0} iterations"
+                    .format(max_iterations))
+    return statistics
+
+
+def refine(pm, node, optimizations, fixed_point_optimizations=(),
+           max_iterations=0):
     """refine node in place until it matches pythran's expectations"""
 
     # sanitize input
@@ -23,6 +62,7 @@ def refine(pm, node, optimizations):
 
     #Some early optimizations
     pm.apply(ListCompToMap, node)
+    pm.apply(GeneratorToGenExp, node)
     pm.apply(GenExpToImap, node)
 
     pm.apply(NormalizeTuples, node)
@@ -42,3 +82,7 @@ def refine(pm, node, optimizations):
     # some extra optimizations
     for optimization in optimizations:
         pm.apply(optimization, node)
+
+    # iterate optimizations that enable each other
+    if fixed_point_optimizations:
+        fixed_point(pm, node, fixed_point_optimizations, max_iterations)
@@ -2,31 +2,61 @@
 This modules contains code transformation to turn pythran code into
 optimized pythran code
     * ConstantFolding performs some kind of partial evaluation.
+    * GeneratorToGenExp turns single loop generators into genexp
     * GenExpToImap transforms generator expressions into iterators
     * ListCompToMap transforms list comprehension into intrinsics.
     * ListCompToGenexp transforms list comprehension into genexp
     * IterTransformation replaces expressions by iterators when possible.
+    * IteratorFusion fuses chains of imap and ifilter
     * LoopFullUnrolling fully unrolls loops with static bounds
+    * ReductionRecognition turns accumulation loops into reductions
+    * LoopInterchange swaps nested loops to walk arrays along their rows
+    * LoopTiling blocks nested loops to improve their cache locality
+    * LoopVersioning flags loops over arrays that cannot alias
+    * BlasRecognition turns matrix product loop nests into BLAS calls
+    * ListToTuple turns small lists that never escape into tuples
     * DeadCodeElimination remove useless code
+    * InPlaceUpdate turns rebinding updates into augmented assignments
+    * FunctionSpecialization clones functions called with constant arguments
+    * ShapeSpecialization folds the shape of arrays fixed by the export spec
 '''
 
 from analysis import ConstantExpressions, OptimizableComprehension, NodeCount
 from analysis import PotentialIterator, Aliases, UseOMP, HasBreak, HasContinue
 from analysis import LazynessAnalysis, UsedDefChain, Literals, PureExpressions
+from analysis import NonEscapingLists, Ancestors, Identifiers
+from analysis import GlobalDeclarations
 from passmanager import Transformation
 from tables import modules, equivalent_iterators
 from passes import NormalizeTuples, RemoveNestedFunctions, RemoveLambdas
 from openmp import OMPDirective
+from config import cfg
 import ast
+import cPickle
+import intrinsic
 import metadata
+import logging
+import marshal
+import os
+import select
+import signal
+import struct
+import time
 from copy import deepcopy
 
+logger = logging.getLogger(__name__)
+
 
 ##
 class ConstantFolding(Transformation):
     '''
     Replace constant expression by their evaluation.
 
+    Each expression is evaluated within a time and memory budget, and its
+    result is only folded if it is small enough, as set in the
+    ``[constant_folding]`` section of the configuration file.
+    Expressions that exceed their budget are left to the native code.
+
     >>> import ast, passmanager, backend
     >>> node = ast.parse("def foo(): return 1+3")
     >>> pm = passmanager.PassManager("test")
@@ -43,8 +73,30 @@ class ConstantFolding(Transformation):
     class ConversionError(Exception):
         pass
 
+    class BudgetExceeded(Exception):
+        pass
+
+    # nodes cheap enough to be evaluated without any budget
+    Leaves = (ast.Num, ast.Str, ast.Name, ast.Attribute)
+    # operators whose result is not much bigger than their operands
+    Arithmetic = (ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare,
+                  ast.expr_context, ast.unaryop, ast.boolop, ast.cmpop,
+                  ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.FloorDiv,
+                  ast.RShift, ast.BitOr, ast.BitXor, ast.BitAnd)
+
     def __init__(self):
         Transformation.__init__(self, ConstantExpressions)
+        self.timeout = cfg.getfloat('constant_folding', 'timeout')
+        self.max_memory = cfg.getint('constant_folding', 'max_memory') << 20
+        self.max_size = cfg.getint('constant_folding', 'max_size')
+        self.modified = False
+        self.evaluator = None
+
+    def run(self, node, ctx):
+        try:
+            return super(ConstantFolding, self).run(node, ctx)
+        finally:
+            self.stop_evaluator()
 
     def prepare(self, node, ctx):
         self.env = {'__builtin__': __import__('__builtin__')}
@@ -80,7 +132,149 @@ class ConstantFolding(Transformation):
             pass
         super(ConstantFolding, self).prepare(node, ctx)
 
+    @staticmethod
+    def is_arithmetic(node):
+        '''Checks whether `node' only combines numbers through operators
+        that cannot make it run long or grow large.'''
+        return all(isinstance(n, (ast.Num,) + ConstantFolding.Arithmetic)
+                   for n in ast.walk(node))
+
+    def evaluate(self, node, code):
+        '''Evaluates `code' in the folding environment, within budget.
+
+        Anything but a leaf or some arithmetic on numbers is evaluated by an
+        evaluator process, forked once per pass, so that it can be killed
+        when it runs out of time, and its address space limited, whatever it
+        is doing. Another one is only forked to replace a killed evaluator.
+        '''
+        if (isinstance(node, ConstantFolding.Leaves)
+                or self.is_arithmetic(node)
+                or not hasattr(os, 'fork')):
+            return eval(code, self.env)
+
+        if not self.evaluator:
+            self.start_evaluator()
+        pid, request, reply = self.evaluator
+        deadline = time.time() + self.timeout if self.timeout else None
+        try:
+            self.send(request, marshal.dumps(code))
+            payload = self.receive(reply, deadline)
+        except ConstantFolding.BudgetExceeded:
+            self.stop_evaluator(kill=True)
+            raise
+        except (OSError, EOFError):
+            # the evaluator died, most likely out of memory
+            self.stop_evaluator(kill=True)
+            raise ConstantFolding.BudgetExceeded("memory")
+        success, value = cPickle.loads(payload)
+        if success:
+            return value
+        elif value:
+            raise ConstantFolding.BudgetExceeded(value)
+        else:
+            raise ConstantFolding.ConversionError()
+
+    def start_evaluator(self):
+        '''Forks the process evaluating the code sent by `evaluate'.'''
+        request_read, request_write = os.pipe()
+        reply_read, reply_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # evaluator process
+            try:
+                os.close(request_write)
+                os.close(reply_read)
+                self.serve(request_read, reply_write)
+            finally:
+                os._exit(0)
+        os.close(request_read)
+        os.close(reply_write)
+        self.evaluator = pid, request_write, reply_read
+
+    def stop_evaluator(self, kill=False):
+        '''Stops the evaluator process, if any.'''
+        if not self.evaluator:
+            return
+        pid, request, reply = self.evaluator
+        if kill:
+            os.kill(pid, signal.SIGKILL)
+        # closing the requests ends the evaluator loop
+        os.close(request)
+        os.close(reply)
+        os.waitpid(pid, 0)
+        self.evaluator = None
+
+    def serve(self, requests, replies):
+        '''Evaluates code from `requests' until it is closed, sending the
+        small enough results to `replies'.'''
+        self.limit_memory()
+        while True:
+            try:
+                code = marshal.loads(self.receive(requests))
+            except EOFError:
+                return
+            try:
+                value = eval(code, self.env)
+                self.folded_size = 0
+                self.to_ast(value)  # do not send back oversized results
+                status = (True, value)
+            except MemoryError:
+                status = (False, "memory")
+            except BaseException:
+                status = (False, None)
+            try:
+                payload = cPickle.dumps(status, cPickle.HIGHEST_PROTOCOL)
+            except Exception:
+                payload = cPickle.dumps((False, None))
+            self.send(replies, payload)
+
+    @staticmethod
+    def send(fd, payload):
+        data = struct.pack('!Q', len(payload)) + payload
+        while data:
+            data = data[os.write(fd, data):]
+
+    def receive(self, fd, deadline=None):
+        '''Reads a message sent to `fd' before `deadline'.'''
+        def read(size):
+            chunks = []
+            while size:
+                remaining = deadline and deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise ConstantFolding.BudgetExceeded("timeout")
+                ready, _, _ = select.select([fd], [], [], remaining)
+                if ready:
+                    chunk = os.read(fd, min(size, 1 << 16))
+                    if not chunk:
+                        raise EOFError()
+                    chunks.append(chunk)
+                    size -= len(chunk)
+            return ''.join(chunks)
+        size, = struct.unpack('!Q', read(struct.calcsize('!Q')))
+        return read(size)
+
+    def limit_memory(self):
+        '''Limits the address space growth to `self.max_memory' bytes.
+
+        Only meant to be called from the evaluator process, and a no-op when
+        the resource module or /proc/self/statm are not available.'''
+        if not self.max_memory:
+            return
+        try:
+            import resource
+            with open('/proc/self/statm') as statm:
+                used = int(statm.read().split()[0]) * resource.getpagesize()
+        except (ImportError, IOError, ValueError, IndexError):
+            return
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = used + self.max_memory
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
     def to_ast(self, value):
+        self.folded_size += 1
+        if self.folded_size > self.max_size:
+            raise ConstantFolding.ConversionError()
         if (type(value) in (int, long, float, complex)):
             return ast.Num(value)
         elif isinstance(value, bool):
@@ -108,12 +302,20 @@ class ConstantFolding(Transformation):
                 fake_node = ast.Expression(
                     node.value if isinstance(node, ast.Index) else node)
                 code = compile(fake_node, '<constant folding>', 'eval')
-                value = eval(code, self.env)
+                value = self.evaluate(fake_node.body, code)
+                self.folded_size = 0
                 new_node = self.to_ast(value)
                 if (isinstance(node, ast.Index)
                         and not isinstance(new_node, ast.Index)):
                     new_node = ast.Index(new_node)
+                # literals are refolded into themselves
+                if ast.dump(new_node) != ast.dump(node):
+                    self.modified = True
                 return new_node
+            except ConstantFolding.BudgetExceeded as e:
+                logger.info("constant folding {0} budget exceeded at line {1}"
+                            .format(e, getattr(node, 'lineno', '?')))
+                return Transformation.generic_visit(self, node)
             except Exception:  # as e:
                 #print ast.dump(node)
                 #print 'error in constant folding: ', e
@@ -122,6 +324,93 @@ class ConstantFolding(Transformation):
             return Transformation.generic_visit(self, node)
 
 
+##
+class GeneratorToGenExp(Transformation):
+    '''
+    Turns generators made of a single loop into generator expressions
+
+    A generator whose body is a loop yielding one value per iteration, maybe
+    under a condition, returns an equivalent generator expression instead.
+    GenExpToImap then turns it into an iterator the C++ compiler can inline
+    in the consuming loop, rather than a resumable state machine. The
+    iterable is evaluated when the generator is created, so it may only call
+    intrinsics without side effects.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(l, a):                                        \\n\
+    for x in l:                                       \\n\
+        if x > a:                                     \\n\
+            yield x * a""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(GeneratorToGenExp, node)
+    >>> print pm.dump(backend.Python, node)
+    def foo(l, a):
+        return ((x * a) for x in l if (x > a))
+    '''
+
+    def visit_FunctionDef(self, node):
+        self.generic_visit(node)
+        docstring, body = [], node.body
+        if (body and isinstance(body[0], ast.Expr)
+                and isinstance(body[0].value, ast.Str)):
+            docstring, body = body[:1], body[1:]
+        if (len(body) == 2 and isinstance(body[1], ast.Return)
+                and body[1].value is None):
+            body = body[:1]
+        if len(body) != 1:
+            return node
+        genexp = self.genexp(body[0])
+        if genexp:
+            node.body = docstring + [ast.Return(genexp)]
+        return node
+
+    def genexp(self, loop):
+        '''Returns the generator expression equivalent to `loop', or None'''
+        if not (isinstance(loop, ast.For) and not loop.orelse
+                and isinstance(loop.target, ast.Name)
+                and len(loop.body) == 1
+                and self.is_iterable(loop.iter)):
+            return None
+        stmt, ifs = loop.body[0], []
+        if (isinstance(stmt, ast.If) and not stmt.orelse
+                and len(stmt.body) == 1):
+            stmt, ifs = stmt.body[0], [stmt.test]
+        if not (isinstance(stmt, ast.Expr)
+                and isinstance(stmt.value, ast.Yield)
+                and stmt.value.value is not None):
+            return None
+        if sum(isinstance(n, ast.Yield) for n in ast.walk(loop)) != 1:
+            return None
+        return ast.GeneratorExp(
+            stmt.value.value,
+            [ast.comprehension(loop.target, loop.iter, ifs)])
+
+    @staticmethod
+    def is_const_call(node):
+        '''Checks whether `node' calls an intrinsic without side effects'''
+        path = list()
+        func = node.func
+        while isinstance(func, ast.Attribute):
+            path.insert(0, func.attr)
+            func = func.value
+        if not isinstance(func, ast.Name):
+            return False
+        entry = modules
+        for name in [func.id] + path:
+            if not (isinstance(entry, dict) and name in entry):
+                return False
+            entry = entry[name]
+        return isinstance(entry, intrinsic.Intrinsic) and entry.isconst()
+
+    def is_iterable(self, node):
+        return all(self.is_const_call(n)
+                   if isinstance(n, ast.Call)
+                   else not isinstance(n, (ast.Subscript, ast.Yield))
+                   for n in ast.walk(node))
+
+
+##
 class GenExpToImap(Transformation):
     '''
     Transforms generator expressions into iterators.
@@ -340,6 +629,239 @@ def bar(n):                                       \\n\
         return self.generic_visit(node)
 
 
+##
+class IteratorFusion(Transformation):
+    '''
+    Fuses chains of itertools.imap and itertools.ifilter
+
+    A ``for`` loop over such a chain iterates directly over the innermost
+    iterable and calls the mapped and filtering functions in its body.
+    Elsewhere, nested ``imap`` or nested ``ifilter`` are composed into a
+    single one through a new function.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+import itertools                                      \\n\
+def f(x):                                             \\n\
+    return x * x                                      \\n\
+def g(a, x):                                          \\n\
+    return x > a                                      \\n\
+def foo(l, a):                                        \\n\
+    for y in itertools.imap(f, itertools.ifilter(functools.partial(g, a), \
+l)):                                                  \\n\
+        print y                                       \\n\
+    return __builtin__.sum(itertools.imap(f, itertools.imap(f, l)))""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(IteratorFusion, node)
+    >>> print pm.dump(backend.Python, node)
+    import itertools
+    def f(x):
+        return (x * x)
+    def g(a, x):
+        return (x > a)
+    def foo(l, a):
+        for y_ in l:
+            if g(a, y_):
+                y = f(y_)
+                print y
+        return __builtin__.sum(itertools.imap(foo_fused0, l))
+    def foo_fused0(x0):
+        return f(f(x0))
+    '''
+
+    def __init__(self):
+        Transformation.__init__(self, GlobalDeclarations, Identifiers)
+
+    def visit_Module(self, node):
+        self.imports = list()
+        self.helpers = list()
+        self.generic_visit(node)
+        node.body = self.imports + node.body + self.helpers
+        return node
+
+    def visit_FunctionDef(self, node):
+        self.function = node
+        return self.generic_visit(node)
+
+    @staticmethod
+    def layer(node):
+        '''Returns the itertools function called by `node', if any'''
+        if (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'itertools'
+                and node.func.attr in ('imap', 'ifilter')
+                and len(node.args) >= 2
+                and not (node.keywords or node.starargs or node.kwargs)):
+            return node.func.attr
+        return None
+
+    def callee(self, node):
+        '''
+        Returns the function and the bound arguments of a callable made of a
+        global function or intrinsic, maybe bound by functools.partial to
+        names and constants, or None. The function of None is None.
+        '''
+        if (isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == '__builtin__' and node.attr == 'None'):
+            return None, []
+        if isinstance(node, ast.Name):
+            return ((node, []) if node.id in self.global_declarations
+                    else None)
+        if (isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id in modules):
+            return node, []
+        if (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'functools'
+                and node.func.attr == 'partial'
+                and node.args
+                and not (node.keywords or node.starargs or node.kwargs)
+                and all(isinstance(arg, (ast.Name, ast.Num, ast.Str))
+                        for arg in node.args[1:])):
+            func = self.callee(node.args[0])
+            if func and func[0] is not None and not func[1]:
+                return func[0], node.args[1:]
+        return None
+
+    @staticmethod
+    def call(func, args):
+        '''Calls `func' on `args', None standing for the identity'''
+        function, bound = func
+        if function is None:
+            return args[0] if len(args) == 1 else ast.Tuple(args, ast.Load())
+        return ast.Call(deepcopy(function), map(deepcopy, bound) + args,
+                        [], None, None)
+
+    def fresh(self, name):
+        while name in self.identifiers:
+            name += '_'
+        self.identifiers.add(name)
+        return name
+
+    def use_module(self, name):
+        if name not in self.global_declarations:
+            alias = ast.alias(name, None)
+            self.imports.append(ast.Import([alias]))
+            self.global_declarations[name] = alias
+        return ast.Name(name, ast.Load())
+
+    def visit_Call(self, node):
+        '''Composes an imap of an imap, or an ifilter of an ifilter'''
+        self.generic_visit(node)
+        kind = self.layer(node)
+        if not kind or len(node.args) != 2 or self.layer(node.args[1]) != kind:
+            return node
+        inner = node.args[1]
+        outer_func, inner_func = map(self.callee,
+                                     (node.args[0], inner.args[0]))
+        if not (outer_func and inner_func):
+            return node
+        if kind == 'imap' and None in (outer_func[0], inner_func[0]):
+            return node
+        if kind == 'ifilter' and len(inner.args) != 2:
+            return node
+
+        # bound arguments and elements become parameters of the new function
+        bound = outer_func[1] + inner_func[1]
+        params = ['b{0}'.format(i) for i in xrange(len(bound))]
+        elts = ['x{0}'.format(i) for i in xrange(len(inner.args) - 1)]
+        loads = [ast.Name(param, ast.Load()) for param in params]
+        outer = outer_func[0], loads[:len(outer_func[1])]
+        inner_ = inner_func[0], loads[len(outer_func[1]):]
+        args = [ast.Name(elt, ast.Load()) for elt in elts]
+        if kind == 'imap':
+            body = self.call(outer, [self.call(inner_, args)])
+        else:
+            body = ast.BoolOp(ast.And(), [self.call(inner_, args),
+                                          self.call(outer, args)])
+        name = self.fresh("{0}_fused{1}".format(self.function.name,
+                                                len(self.helpers)))
+        self.helpers.append(ast.FunctionDef(
+            name,
+            ast.arguments([ast.Name(arg, ast.Param())
+                           for arg in params + elts], None, None, []),
+            [ast.Return(body)],
+            []))
+        func = ast.Name(name, ast.Load())
+        if bound:
+            func = ast.Call(
+                ast.Attribute(self.use_module('functools'), 'partial',
+                              ast.Load()),
+                [func] + bound, [], None, None)
+        inner.args[0] = func
+        return inner
+
+    def visit_For(self, node):
+        '''Iterates over the innermost iterable of a chain'''
+        self.generic_visit(node)
+        if not (isinstance(node.target, ast.Name) and self.layer(node.iter)):
+            return node
+        layers = list()
+        iterable = node.iter
+        while self.layer(iterable):
+            func = self.callee(iterable.args[0])
+            if not func:
+                return node
+            layers.insert(0, (self.layer(iterable), func, iterable.args[1:]))
+            if len(iterable.args) > 2:
+                break
+            iterable = iterable.args[1]
+        kind, _, iterables = layers[0]
+        if len(iterables) > 1:
+            if kind == 'ifilter':
+                return node
+            iterable = ast.Call(
+                ast.Attribute(ast.Name('itertools', ast.Load()), 'izip',
+                              ast.Load()),
+                iterables, [], None, None)
+
+        # bound names must keep their value across iterations
+        written = {n.id for stmt in node.body for n in ast.walk(stmt)
+                   if isinstance(n, ast.Name)
+                   and not isinstance(n.ctx, ast.Load)}
+        written.add(node.target.id)
+        if any(isinstance(arg, ast.Name) and arg.id in written
+               for _, (_, bound), _ in layers for arg in bound):
+            return node
+
+        # thread the value of each element through the layers
+        target = node.target.id
+        if all(kind == 'ifilter' for kind, _, _ in layers):
+            value = target
+        else:
+            value = self.fresh(target + '_')
+        current, steps = value, list()
+        for depth, (kind, func, iterables) in enumerate(layers):
+            if len(iterables) > 1:
+                args = [ast.Subscript(ast.Name(current, ast.Load()),
+                                      ast.Index(ast.Num(i)), ast.Load())
+                        for i in xrange(len(iterables))]
+            else:
+                args = [ast.Name(current, ast.Load())]
+            if kind == 'ifilter':
+                steps.append(ast.If(self.call(func, args), [], []))
+            else:
+                if all(k == 'ifilter' for k, _, _ in layers[depth + 1:]):
+                    current = target
+                else:
+                    current = self.fresh(target + '_')
+                steps.append(ast.Assign([ast.Name(current, ast.Store())],
+                                        self.call(func, args)))
+        body = node.body
+        for step in reversed(steps):
+            if isinstance(step, ast.If):
+                step.body = body
+                body = [step]
+            else:
+                body = [step] + body
+        return ast.For(ast.Name(value, ast.Store()), iterable, body,
+                       node.orelse)
+
+
 ##
 class Pow2(Transformation):
     '''
@@ -392,6 +914,10 @@ class LoopFullUnrolling(Transformation):
 
     MAX_NODE_COUNT = 512
 
+    def __init__(self):
+        super(LoopFullUnrolling, self).__init__()
+        self.modified = False
+
     def visit_For(self, node):
         # first unroll children if needed or possible
         self.generic_visit(node)
@@ -414,10 +940,1137 @@ class LoopFullUnrolling(Transformation):
                 def unroll(elt):
                     return ([ast.Assign([deepcopy(node.target)], elt)]
                             + deepcopy(node.body))
+                self.modified = True
                 return reduce(list.__add__, map(unroll, node.iter.elts))
         return node
 
 
+def is_rebound(function, ancestors, index, loop):
+    '''
+    Checks whether the value of loop index `index' is never read after the
+    loop, whose nodes are `loop': it is only read out of the loop by other
+    loops of `function' that rebind it.
+    '''
+    for n in ast.walk(function):
+        if (isinstance(n, ast.Name) and n.id == index
+                and isinstance(n.ctx, ast.Load) and n not in loop):
+            if not any(isinstance(a, ast.For)
+                       and index in {t.id for t in ast.walk(a.target)
+                                     if isinstance(t, ast.Name)}
+                       and n not in ast.walk(a.iter)
+                       for a in ancestors[n]):
+                return False
+    return True
+
+
+##
+class ReductionRecognition(Transformation):
+    '''
+    Turns accumulation loops into calls to reduction functions
+
+    A loop whose body only accumulates its target into a variable, as in
+    ``s += x``, ``p *= x`` or ``m = max(m, x)``, or only sets a flag when its
+    target holds, becomes a call to ``sum``, ``reduce``, ``any`` or ``all``
+    over the iterable of the loop. The accumulator must be a local only bound
+    to literals, so that rebinding it cannot be told from updating it.
+
+    Sums and products may be computed in another order than the loop, which
+    changes the rounding of floating point numbers. Unless ``reassociate`` is
+    set in the ``[reduction]`` section of the configuration file, they are
+    only recognized over ``range`` and ``xrange``, from an integer literal.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(l, n):                                        \\n\
+    s, m, found = 0, 0, __builtin__.False             \\n\
+    for x in __builtin__.xrange(n):                   \\n\
+        s += x                                        \\n\
+    for y in l:                                       \\n\
+        m = __builtin__.max(m, y)                     \\n\
+    for z in l:                                       \\n\
+        if not z:                                     \\n\
+            found = __builtin__.True                  \\n\
+            break                                     \\n\
+    return s, m, found""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(ReductionRecognition, node)
+    >>> print pm.dump(backend.Python, node)
+    def foo(l, n):
+        (s, m, found) = (0, 0, __builtin__.False)
+        s = __builtin__.sum(__builtin__.xrange(n), s)
+        m = __builtin__.reduce(__builtin__.max, l, m)
+        if (not __builtin__.all(l)):
+            found = __builtin__.True
+        return (s, m, found)
+    '''
+
+    def __init__(self):
+        Transformation.__init__(self, Ancestors, GlobalDeclarations)
+        self.reassociate = cfg.getboolean('reduction', 'reassociate')
+
+    def visit_Module(self, node):
+        self.imports = list()
+        self.generic_visit(node)
+        node.body = self.imports + node.body
+        return node
+
+    def visit_FunctionDef(self, node):
+        self.function = node
+        return self.generic_visit(node)
+
+    @staticmethod
+    def builtin(name):
+        return ast.Attribute(ast.Name('__builtin__', ast.Load()), name,
+                             ast.Load())
+
+    @staticmethod
+    def is_builtin(node, names):
+        return (isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == '__builtin__'
+                and node.attr in names)
+
+    def is_literal(self, node):
+        return (isinstance(node, ast.Num)
+                or self.is_builtin(node, ('True', 'False')))
+
+    def use_module(self, name):
+        if name not in self.global_declarations:
+            alias = ast.alias(name, None)
+            self.imports.append(ast.Import([alias]))
+            self.global_declarations[name] = alias
+        return ast.Name(name, ast.Load())
+
+    def literals(self, name, update):
+        '''
+        Returns the literals the local `name' is bound to, or None if it is
+        bound to anything else. Updates of `name', including the `update'
+        statement being reduced, are not bindings.
+        '''
+        values = list()
+        updated = set(ast.walk(update))
+        for n in ast.walk(self.function):
+            if not (isinstance(n, ast.Name) and n.id == name
+                    and not isinstance(n.ctx, ast.Load)
+                    and n not in updated):
+                continue
+            if n not in self.ancestors:
+                return None
+            parent = self.ancestors[n][-1]
+            if isinstance(parent, ast.AugAssign):
+                continue
+            value = None
+            if isinstance(parent, ast.Assign) and parent.targets == [n]:
+                value = parent.value
+            elif isinstance(parent, ast.Tuple):
+                assign = self.ancestors[parent][-1]
+                if (isinstance(assign, ast.Assign)
+                        and assign.targets == [parent]
+                        and isinstance(assign.value, ast.Tuple)
+                        and len(assign.value.elts) == len(parent.elts)):
+                    value = assign.value.elts[parent.elts.index(n)]
+            if not self.is_literal(value):
+                return None
+            values.append(value)
+        return values
+
+    def is_accumulator(self, target, elt, loop):
+        '''
+        Checks whether `target' accumulates the very elements of `loop',
+        and is a local only bound to literals
+        '''
+        return (isinstance(target, ast.Name)
+                and isinstance(elt, ast.Name)
+                and elt.id == loop.target.id
+                and target.id != loop.target.id
+                and self.literals(target.id, loop) is not None)
+
+    def is_exact(self, target, loop):
+        '''Checks whether a sum or product of the loop elements is exact'''
+        if self.reassociate:
+            return True
+        return (isinstance(loop.iter, ast.Call)
+                and self.is_builtin(loop.iter.func, ('range', 'xrange'))
+                and all(isinstance(value, ast.Num)
+                        and isinstance(value.n, (int, long))
+                        for value in self.literals(target.id, loop)))
+
+    def visit_For(self, node):
+        self.generic_visit(node)
+        if (node.orelse or metadata.get(node, OMPDirective)
+                or not isinstance(node.target, ast.Name)
+                or not is_rebound(self.function, self.ancestors,
+                                  node.target.id, set(ast.walk(node)))):
+            return node
+        stmt = node.body[0]
+        if len(node.body) == 1 and isinstance(stmt, ast.AugAssign):
+            return self.reduce_update(node, stmt) or node
+        elif len(node.body) == 1 and isinstance(stmt, ast.Assign):
+            return self.reduce_assign(node, stmt) or node
+        elif len(node.body) == 1 and isinstance(stmt, ast.If):
+            return self.reduce_flag(node, stmt) or node
+        return node
+
+    def reduce_update(self, node, stmt):
+        '''s += x becomes s = sum(..., s), and likewise for a product'''
+        if not (self.is_accumulator(stmt.target, stmt.value, node)
+                and self.is_exact(stmt.target, node)):
+            return None
+        start = ast.Name(stmt.target.id, ast.Load())
+        if isinstance(stmt.op, ast.Add):
+            call = ast.Call(self.builtin('sum'), [node.iter, start],
+                            [], None, None)
+        elif isinstance(stmt.op, ast.Mult):
+            mul = ast.Attribute(self.use_module('operator_'), 'mul',
+                                ast.Load())
+            call = ast.Call(self.builtin('reduce'), [mul, node.iter, start],
+                            [], None, None)
+        else:
+            return None
+        return ast.Assign([stmt.target], call)
+
+    def reduce_assign(self, node, stmt):
+        '''m = max(m, x) becomes m = reduce(max, ..., m)'''
+        value = stmt.value
+        if not (len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+                and isinstance(value, ast.Call)
+                and self.is_builtin(value.func, ('min', 'max'))
+                and len(value.args) == 2
+                and not (value.keywords or value.starargs or value.kwargs)):
+            return None
+        acc = stmt.targets[0].id
+        first, second = value.args
+        if isinstance(first, ast.Name) and first.id == acc:
+            elt = second
+        elif isinstance(second, ast.Name) and second.id == acc:
+            elt = first
+        else:
+            return None
+        if not self.is_accumulator(stmt.targets[0], elt, node):
+            return None
+        call = ast.Call(self.builtin('reduce'),
+                        [self.builtin(value.func.attr),
+                         node.iter,
+                         ast.Name(acc, ast.Load())],
+                        [], None, None)
+        return ast.Assign(stmt.targets, call)
+
+    def reduce_flag(self, node, stmt):
+        '''
+        A loop that sets a flag when its target holds, or does not, and
+        possibly stops there, becomes a test of any or all over its iterable.
+        '''
+        body = stmt.body
+        if not (not stmt.orelse and len(body) in (1, 2)
+                and isinstance(body[0], ast.Assign)
+                and len(body[0].targets) == 1
+                and (len(body) == 1 or isinstance(body[1], ast.Break))):
+            return None
+        assign = body[0]
+        if not self.is_literal(assign.value):
+            return None
+        test = stmt.test
+        if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+            if not self.is_accumulator(assign.targets[0], test.operand, node):
+                return None
+            check = ast.UnaryOp(
+                ast.Not(),
+                ast.Call(self.builtin('all'), [node.iter], [], None, None))
+        else:
+            if not self.is_accumulator(assign.targets[0], test, node):
+                return None
+            check = ast.Call(self.builtin('any'), [node.iter],
+                             [], None, None)
+        return ast.If(check, [assign], [])
+
+
+##
+class LoopInterchange(Transformation):
+    '''
+    Swaps perfectly nested loops so that arrays are walked along their rows
+
+    A pair of ``range`` loops is swapped when most subscripts of the nest
+    index their last dimension with the outer loop index. The nest must be
+    free of loop-carried dependences: every array written is indexed by both
+    loop indices, always in the same way, and cannot be aliased by any other
+    array of the nest, while scalars written are temporaries that do not
+    outlive an iteration.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(a, n, m):                                     \\n\
+    b = numpy.zeros((n, m))                           \\n\
+    for j in __builtin__.xrange(m):                   \\n\
+        for i in __builtin__.xrange(n):               \\n\
+            t = a[i, j]                               \\n\
+            b[i, j] = t * t                           \\n\
+    return b""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(LoopInterchange, node)
+    >>> print pm.dump(backend.Python, node)
+    def foo(a, n, m):
+        b = numpy.zeros((n, m))
+        for i in __builtin__.xrange(n):
+            for j in __builtin__.xrange(m):
+                t = a[(i, j)]
+                b[(i, j)] = (t * t)
+        return b
+    '''
+
+    # statements allowed in an interchanged loop nest
+    statements = (ast.Assign, ast.AugAssign, ast.For, ast.If, ast.Pass)
+    # numpy functions that return a new array
+    allocators = ('zeros', 'ones', 'empty',
+                  'zeros_like', 'ones_like', 'empty_like')
+    # nodes that only read the value of an array element
+    consumers = (ast.BinOp, ast.UnaryOp, ast.Compare, ast.AugAssign,
+                 ast.Print)
+
+    def __init__(self):
+        Transformation.__init__(self, PureExpressions, Ancestors)
+
+    def visit_FunctionDef(self, node):
+        self.function = node
+        return self.generic_visit(node)
+
+    def visit_For(self, node):
+        self.generic_visit(node)
+        if self.is_interchangeable(node) and self.favours_interchange(node):
+            inner = node.body[0]
+            node.target, inner.target = inner.target, node.target
+            node.iter, inner.iter = inner.iter, node.iter
+        return node
+
+    @staticmethod
+    def names(node):
+        return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+    @staticmethod
+    def access(node):
+        '''
+        Returns the root name and the index list of a subscript chain such as
+        ``a[i][j]`` or ``a[i, j]``, or None if it is not made of indices only.
+        '''
+        indices = list()
+        while isinstance(node, ast.Subscript):
+            if not isinstance(node.slice, ast.Index):
+                return None
+            value = node.slice.value
+            indices[:0] = (value.elts if isinstance(value, ast.Tuple)
+                           else [value])
+            node = node.value
+        if isinstance(node, ast.Name) and indices:
+            return node.id, indices
+        return None
+
+    def accesses(self, node):
+        '''Yields the outermost subscript chains of `node' '''
+        for n in ast.walk(node):
+            if isinstance(n, ast.Subscript):
+                parent = self.ancestors[n][-1]
+                if not (isinstance(parent, ast.Subscript)
+                        and parent.value is n):
+                    yield n
+
+    def is_range(self, node):
+        '''Checks whether `node' is a range over non-negative indices'''
+        if not (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == '__builtin__'
+                and node.func.attr in ('range', 'xrange')
+                and 1 <= len(node.args) <= 3
+                and not (node.keywords or node.starargs or node.kwargs)):
+            return False
+        args = node.args
+        if len(args) >= 2 and not (isinstance(args[0], ast.Num)
+                                   and args[0].n >= 0):
+            return False
+        if len(args) == 3 and not (isinstance(args[2], ast.Num)
+                                   and args[2].n > 0):
+            return False
+        return node in self.pure_expressions
+
+    def is_interchangeable(self, node):
+        if not (len(node.body) == 1 and isinstance(node.body[0], ast.For)):
+            return False
+        inner = node.body[0]
+        loops = node, inner
+        if not all(isinstance(loop.target, ast.Name) and not loop.orelse
+                   and self.is_range(loop.iter) for loop in loops):
+            return False
+        outer_index, inner_index = node.target.id, inner.target.id
+        if outer_index in self.names(inner.iter):
+            return False
+
+        body = [n for stmt in inner.body for n in ast.walk(stmt)]
+        stmts = [n for n in body if isinstance(n, ast.stmt)]
+        if not all(isinstance(n, self.statements) for n in stmts):
+            return False
+        if not self.accepts_directives(node):
+            return False
+        if any(metadata.get(n, OMPDirective) for n in [inner] + stmts):
+            return False
+        if not all(n in self.pure_expressions for n in body
+                   if isinstance(n, ast.Call)):
+            return False
+
+        # names used out of the nest
+        nest = set(ast.walk(node))
+        outside = {n.id for n in ast.walk(self.function)
+                   if isinstance(n, ast.Name) and n not in nest}
+        if not all(is_rebound(self.function, self.ancestors, index, nest)
+                   for index in (outer_index, inner_index)):
+            return False
+
+        # gather written scalars and arrays
+        scalars = {n.id for n in body
+                   if isinstance(n, ast.Name)
+                   and not isinstance(n.ctx, ast.Load)}
+        chains = [(chain, self.access(chain))
+                  for chain in self.accesses(inner)]
+        if not all(access for _, access in chains):
+            return False
+        arrays = {access[0] for chain, access in chains
+                  if not isinstance(chain.ctx, ast.Load)}
+        if {outer_index, inner_index} & scalars or scalars & arrays:
+            return False
+        if not all(var not in outside and self.is_private(var, inner.body)
+                   for var in scalars):
+            return False
+
+        # each array written is always accessed at the same element, that
+        # depends on both loop indices
+        variants = scalars | arrays
+        for array in arrays:
+            uses = [n for n in body
+                    if isinstance(n, ast.Name) and n.id == array]
+            indices = [access[1] for _, access in chains
+                       if access[0] == array]
+            if len(indices) != len(uses):
+                return False
+            if len({ast.dump(ast.Tuple(i, ast.Load())) for i in indices}) > 1:
+                return False
+            bare = {i.id for i in indices[0] if isinstance(i, ast.Name)}
+            if not {outer_index, inner_index}.issubset(bare):
+                return False
+            if any(self.names(i) & variants for i in indices[0]):
+                return False
+
+        # if other arrays are read, written arrays must not be aliased
+        if {access[0] for _, access in chains} - arrays:
+            return all(self.is_fresh(array, nest) for array in arrays)
+        return True
+
+    def accepts_directives(self, node):
+        return not metadata.get(node, OMPDirective)
+
+    def is_private(self, var, stmts):
+        '''
+        Checks whether `var' is bound in `stmts' before any use, so that its
+        value does not flow from one iteration to another.
+        '''
+        for stmt in stmts:
+            if var not in self.names(stmt):
+                continue
+            if isinstance(stmt, ast.Assign):
+                targets = [t for target in stmt.targets
+                           for t in (target.elts
+                                     if isinstance(target, ast.Tuple)
+                                     else [target])]
+                return (any(isinstance(t, ast.Name) and t.id == var
+                            for t in targets)
+                        and var not in self.names(stmt.value))
+            elif isinstance(stmt, ast.For):
+                if isinstance(stmt.target, ast.Name) and stmt.target.id == var:
+                    return True
+                return (var not in self.names(stmt.iter)
+                        and var not in self.names(stmt.target)
+                        and self.is_private(var, stmt.body))
+            return False
+        return True
+
+    def is_fresh(self, array, nest):
+        '''
+        Checks whether `array' holds an array allocated in the function, that
+        no other name may reference.
+        '''
+        for n in ast.walk(self.function):
+            if not (isinstance(n, ast.Name) and n.id == array):
+                continue
+            parent = self.ancestors[n][-1]
+            if isinstance(n.ctx, ast.Param):
+                return False
+            elif not isinstance(n.ctx, ast.Load):
+                if not (isinstance(parent, ast.Assign)
+                        and parent.targets == [n]
+                        and self.is_allocation(parent.value)):
+                    return False
+            elif n in nest or self.is_returned(n):
+                continue
+            else:
+                # out of the nest, the array is only accessed element-wise
+                chain = n
+                while isinstance(parent, ast.Subscript):
+                    chain, parent = parent, self.ancestors[parent][-1]
+                if chain is n:
+                    return False
+                if not (isinstance(chain.ctx, ast.Store)
+                        or isinstance(parent, ast.Index)
+                        or isinstance(parent, self.consumers)):
+                    return False
+        return True
+
+    def is_returned(self, node):
+        parent = self.ancestors[node][-1]
+        if isinstance(parent, ast.Tuple):
+            parent = self.ancestors[parent][-1]
+        return isinstance(parent, ast.Return)
+
+    def is_allocation(self, node):
+        if isinstance(node, ast.ListComp):
+            return (len(node.generators) == 1
+                    and (isinstance(node.elt, ast.Num)
+                         or self.is_allocation(node.elt)))
+        return (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'numpy'
+                and node.func.attr in self.allocators)
+
+    def favours_interchange(self, node):
+        '''
+        Checks whether the outer index varies along a deeper dimension than
+        the inner index in most array accesses of the nest.
+        '''
+        outer_index, inner_index = node.target.id, node.body[0].target.id
+        score = 0
+        for chain in self.accesses(node.body[0]):
+            _, indices = self.access(chain)
+            depends = [(outer_index in self.names(i),
+                        inner_index in self.names(i)) for i in indices]
+            outer_dims = [k for k, (o, _) in enumerate(depends) if o]
+            inner_dims = [k for k, (_, i) in enumerate(depends) if i]
+            if outer_dims and inner_dims:
+                if max(outer_dims) > max(inner_dims):
+                    score += 1
+                elif max(outer_dims) < max(inner_dims):
+                    score -= 1
+        return score > 0
+
+
+##
+class LoopTiling(LoopInterchange):
+    '''
+    Blocks perfectly nested loops so that their working set fits in cache
+
+    A pair of ``range`` loops that walks arrays both along their rows and
+    along their columns, or that runs an inner loop for each of its
+    iterations, is split into a pair of loops over tiles and a pair of loops
+    within a tile. The legality conditions are those of loop interchange. A
+    third ``range`` loop nested in the pair, such as the ``k`` loop of a
+    matrix product, is tiled as well when its bounds do not depend on the
+    pair: the elements written by the nest depend on both indices of the
+    pair, so that each of them is still updated in the order of the third
+    loop. An OpenMP ``for`` directive on the outer loop is moved to the outer
+    tile loop, so that tiles are distributed among threads, provided that the
+    other indices of the nest are not used out of it and thus stay private.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(a, n):                                        \\n\
+    b = numpy.zeros((n, n))                           \\n\
+    for i in __builtin__.xrange(n):                   \\n\
+        for j in __builtin__.xrange(n):               \\n\
+            b[i, j] = a[j, i]                         \\n\
+    return b""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(LoopTiling, node)
+    >>> print pm.dump(backend.Python, node) # doctest: +NORMALIZE_WHITESPACE
+    def foo(a, n):
+        b = numpy.zeros((n, n))
+        for i_tile in __builtin__.xrange(0, n, 128):
+            for j_tile in __builtin__.xrange(0, n, 128):
+                for i in __builtin__.xrange(i_tile,
+                                            __builtin__.min((i_tile + 128),
+                                                            n)):
+                    for j in __builtin__.xrange(j_tile,
+                                                __builtin__.min((j_tile + 128),
+                                                                n)):
+                        b[(i, j)] = a[(j, i)]
+        return b
+    '''
+
+    # size in bytes of the array elements assumed to choose the tile size
+    itemsize = 8
+    # OpenMP clauses whose meaning depends on the iteration order
+    ordered_clauses = ('ordered', 'lastprivate', 'collapse')
+
+    def __init__(self):
+        Transformation.__init__(self, PureExpressions, Ancestors, Identifiers)
+        self.tile_size = cfg.getint('tiling', 'tile_size')
+        self.cache_size = cfg.getint('tiling', 'cache_size')
+
+    def visit_For(self, node):
+        # tile the outermost pair of loops only
+        if not (self.is_interchangeable(node) and self.favours_tiling(node)):
+            return self.generic_visit(node)
+        inner = node.body[0]
+        loops = [node, inner]
+        if self.is_band(node, inner.body):
+            loops.append(inner.body[0])
+        if not self.keeps_private(node, loops):
+            return self.generic_visit(node)
+        size = self.choose_tile_size(inner)
+
+        def is_short(loop):
+            lower, upper = self.bounds(loop.iter)
+            return (isinstance(lower, ast.Num) and isinstance(upper, ast.Num)
+                    and upper.n - lower.n <= size)
+
+        # tiling a dimension shorter than a tile is useless
+        if any(is_short(loop) for loop in loops[:2]):
+            return node
+        loops = [loop for loop in loops if not is_short(loop)]
+
+        def tile_range(loop, tile, upper):
+            bound = ast.Call(
+                ast.Attribute(ast.Name('__builtin__', ast.Load()), 'min',
+                              ast.Load()),
+                [ast.BinOp(ast.Name(tile, ast.Load()), ast.Add(),
+                           ast.Num(size)),
+                 deepcopy(upper)],
+                [], None, None)
+            return self.range_call(loop.iter, [ast.Name(tile, ast.Load()),
+                                               bound])
+
+        # loops over tiles, outermost first, around the loops within a tile
+        outer_tiles = tiles = None
+        for loop in loops:
+            lower, upper = self.bounds(loop.iter)
+            tile = self.tile_name(loop.target.id)
+            loop.iter = tile_range(loop, tile, upper)
+            tile_loop = ast.For(ast.Name(tile, ast.Store()),
+                                self.range_call(loop.iter,
+                                                [lower, deepcopy(upper),
+                                                 ast.Num(size)]),
+                                [], [])
+            if tiles:
+                tiles.body = [tile_loop]
+            else:
+                outer_tiles = tile_loop
+            tiles = tile_loop
+        tiles.body = [node]
+
+        # distribute tiles rather than rows among threads
+        for directive in metadata.get(node, OMPDirective):
+            metadata.add(outer_tiles, directive)
+        if hasattr(node, 'metadata'):
+            node.metadata.data = [data for data in node.metadata
+                                  if not isinstance(data, OMPDirective)]
+        return outer_tiles
+
+    def accepts_directives(self, node):
+        return all(directive.s.startswith(('omp for', 'omp parallel for'))
+                   and not any(clause in directive.s
+                               for clause in self.ordered_clauses)
+                   for directive in metadata.get(node, OMPDirective))
+
+    def is_band(self, node, body):
+        '''
+        Checks whether `body' is a single range loop that can be tiled along
+        with the interchangeable pair `node'
+        '''
+        if not (len(body) == 1 and isinstance(body[0], ast.For)):
+            return False
+        loop = body[0]
+        return (isinstance(loop.target, ast.Name) and not loop.orelse
+                and self.is_range(loop.iter)
+                and not self.names(loop.iter) & {node.target.id,
+                                                 node.body[0].target.id}
+                and is_rebound(self.function, self.ancestors,
+                               loop.target.id, set(ast.walk(node))))
+
+    def keeps_private(self, node, loops):
+        '''
+        Checks whether the indices of a nest under an OpenMP directive stay
+        private once the directive is moved to the outer tile loop. They no
+        longer are implicitly, so they must be declared within that loop,
+        which only happens when they are not used out of the nest.
+        '''
+        if not metadata.get(node, OMPDirective):
+            return True
+        indices = {loop.target.id for loop in loops}
+        nest = set(ast.walk(node))
+        return not any(isinstance(n, ast.Name) and n.id in indices
+                       for n in ast.walk(self.function) if n not in nest)
+
+    @staticmethod
+    def bounds(node):
+        '''Returns the lower and upper bounds of a range call'''
+        if len(node.args) == 1:
+            return ast.Num(0), node.args[0]
+        return node.args[0], node.args[1]
+
+    @staticmethod
+    def range_call(model, args):
+        return ast.Call(deepcopy(model.func), args, [], None, None)
+
+    def is_range(self, node):
+        # a step would make tiles of uneven sizes
+        return (super(LoopTiling, self).is_range(node)
+                and len(node.args) <= 2)
+
+    def tile_name(self, index):
+        name = index + '_tile'
+        while name in self.identifiers:
+            name += '_'
+        self.identifiers.add(name)
+        return name
+
+    def favours_tiling(self, node):
+        '''
+        Checks whether the nest walks some array along a dimension that does
+        not match the loop order, or reuses data in an inner loop.
+        '''
+        inner = node.body[0]
+        if any(isinstance(stmt, ast.For) for stmt in inner.body):
+            return True
+        outer_index, inner_index = node.target.id, inner.target.id
+        orders = set()
+        for chain in self.accesses(inner):
+            _, indices = self.access(chain)
+            outer_dims = [k for k, i in enumerate(indices)
+                          if outer_index in self.names(i)]
+            inner_dims = [k for k, i in enumerate(indices)
+                          if inner_index in self.names(i)]
+            if outer_dims and inner_dims:
+                orders.add(max(outer_dims) < max(inner_dims))
+        return len(orders) == 2
+
+    def choose_tile_size(self, node):
+        '''
+        Uses the configured tile size, or the biggest power of two such that
+        a tile of each array accessed in the nest fits in the cache.
+        '''
+        if self.tile_size:
+            return self.tile_size
+        arrays = {self.access(chain)[0] for chain in self.accesses(node)}
+        size = 8
+        while (len(arrays) * (2 * size) ** 2 * self.itemsize
+               <= self.cache_size * 1024):
+            size *= 2
+        return size
+
+
+##
+class LoopVersioning(LoopInterchange):
+    '''
+    Flags loops whose arrays cannot alias each other, checking it if needed
+
+    A ``range`` loop that only accesses arrays at its index, writes to at
+    least one of them and contains no other loop is flagged with the arrays
+    it accesses, so that the backend hands them to the loop as
+    restrict-qualified pointers and the compiler can vectorize it. An array
+    allocated in the function cannot alias another one. For other pairs made
+    of a written array and another array, the loop is versioned: the flagged
+    loop runs when ``__alias__.disjoint`` tells their storages do not
+    overlap, and the original loop runs otherwise.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(x, y, n):                                     \\n\
+    z = numpy.zeros(n)                                \\n\
+    for i in __builtin__.range(n):                    \\n\
+        y[i] += 2 * x[i]                              \\n\
+        z[i] = y[i]                                   \\n\
+    return z""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(LoopVersioning, node)
+    >>> print pm.dump(backend.Python, node)
+    import __alias__
+    def foo(x, y, n):
+        z = numpy.zeros(n)
+        if __alias__.disjoint(y, x):
+            for i in __builtin__.range(n):
+                y[i] += (2 * x[i])
+                z[i] = y[i]
+        else:
+            for i in __builtin__.range(n):
+                y[i] += (2 * x[i])
+                z[i] = y[i]
+        return z
+    >>> [flag.arrays for loop in ast.walk(node)
+    ...  for flag in metadata.get(loop, metadata.Restrict)]
+    [['x', 'y', 'z'], []]
+    '''
+
+    # statements allowed in a flagged loop
+    statements = (ast.Assign, ast.AugAssign, ast.If, ast.Pass)
+
+    def __init__(self):
+        Transformation.__init__(self, PureExpressions, Ancestors,
+                                GlobalDeclarations)
+
+    def visit_Module(self, node):
+        self.used = False
+        self.generic_visit(node)
+        if self.used and '__alias__' not in self.global_declarations:
+            node.body.insert(0, ast.Import([ast.alias('__alias__', None)]))
+        return node
+
+    def visit_FunctionDef(self, node):
+        # the variables of a generator live in its state
+        if any(isinstance(n, ast.Yield) for n in ast.walk(node)):
+            return node
+        return super(LoopVersioning, self).visit_FunctionDef(node)
+
+    def visit_For(self, node):
+        arrays = self.flat_arrays(node)
+        if not arrays:
+            return self.generic_visit(node)
+        names, written = arrays
+        nest = set(ast.walk(node))
+        fresh = {name for name in names if self.is_fresh(name, nest)}
+        checks = list()
+        for array in sorted(written - fresh):
+            checks.extend((array, other) for other in names
+                          if other not in fresh and other != array
+                          and (other, array) not in checks)
+        fallback = deepcopy(node)
+        metadata.add(node, metadata.Restrict(names))
+        if not checks:
+            return node
+
+        # the original loop runs when some arrays may overlap
+        self.used = True
+        metadata.add(fallback, metadata.Restrict([]))
+        tests = [ast.Call(ast.Attribute(ast.Name('__alias__', ast.Load()),
+                                        'disjoint', ast.Load()),
+                          [ast.Name(array, ast.Load()),
+                           ast.Name(other, ast.Load())],
+                          [], None, None)
+                 for array, other in checks]
+        test = tests[0] if len(tests) == 1 else ast.BoolOp(ast.And(), tests)
+        return ast.If(test, [node], [fallback])
+
+    def flat_arrays(self, node):
+        '''
+        Returns the sorted names of the arrays accessed by loop `node' and the
+        set of those written, if they are only accessed at the loop index.
+        '''
+        if not (isinstance(node.target, ast.Name) and not node.orelse
+                and self.is_range(node.iter)
+                and not metadata.get(node, OMPDirective)
+                and not metadata.get(node, metadata.Restrict)):
+            return None
+        index = node.target.id
+        body = [n for stmt in node.body for n in ast.walk(stmt)]
+        stmts = [n for n in body if isinstance(n, ast.stmt)]
+        if not all(isinstance(n, self.statements)
+                   and not metadata.get(n, OMPDirective) for n in stmts):
+            return None
+        if not all(n in self.pure_expressions for n in body
+                   if isinstance(n, ast.Call)):
+            return None
+        if any(isinstance(n, ast.Name) and n.id == index
+               and not isinstance(n.ctx, ast.Load) for n in body):
+            return None
+
+        chains = [(chain, self.access(chain))
+                  for stmt in node.body for chain in self.accesses(stmt)]
+        if not all(access and len(access[1]) == 1
+                   and isinstance(access[1][0], ast.Name)
+                   and access[1][0].id == index
+                   for _, access in chains):
+            return None
+        names = {access[0] for _, access in chains}
+        if index in names or names & set(self.global_declarations):
+            return None
+        # arrays are not used otherwise
+        uses = [n for n in body if isinstance(n, ast.Name) and n.id in names]
+        if len(uses) != len(chains):
+            return None
+        written = {access[0] for chain, access in chains
+                   if not isinstance(chain.ctx, ast.Load)}
+        return written and (sorted(names), written)
+
+
+##
+class BlasRecognition(LoopInterchange):
+    '''
+    Turns loop nests computing matrix and vector products into BLAS calls
+
+    ``c[i, j] += a[i, k] * b[k, j]`` in a nest of three ``range`` loops, in
+    any order, becomes ``__blas__.gemm(a, b, c, n, m, p)``, where ``n``,
+    ``m`` and ``p`` are the bounds of ``i``, ``j`` and ``k``. Likewise
+    ``y[i] += a[i, j] * x[j]`` in two loops becomes a ``__blas__.gemv`` and
+    ``s += x[i] * y[i]`` in a single loop adds a ``__blas__.dot``.
+    The updated array must be allocated in the function and only accessed
+    element-wise out of the nest, so that it cannot alias the operands.
+
+    Operands must be arrays of numbers subscripted by as many indices as
+    they have dimensions: arrays allocated in the function, or parameters
+    only accessed this way, as the BLAS functions only take the parameters
+    that turn out to be contiguous arrays and loop over the other ones. The
+    target of a dot product must be a number, so that the rows are not
+    vectors.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(a, b, x, y, n):                               \\n\
+    c = numpy.zeros((n, n))                           \\n\
+    m = numpy.ones((n, n))                            \\n\
+    s = 0                                             \\n\
+    for i in __builtin__.range(n):                    \\n\
+        for j in __builtin__.range(n):                \\n\
+            for k in __builtin__.range(n):            \\n\
+                c[i, j] += a[i, k] * b[k, j]          \\n\
+    for i in __builtin__.range(n):                    \\n\
+        s += x[i] * y[i]                              \\n\
+    for i in __builtin__.range(n):                    \\n\
+        s += x[i] * m[i]                              \\n\
+    return c, s""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(BlasRecognition, node)
+    >>> print pm.dump(backend.Python, node)
+    import __blas__
+    def foo(a, b, x, y, n):
+        c = numpy.zeros((n, n))
+        m = numpy.ones((n, n))
+        s = 0
+        __blas__.gemm(a, b, c, n, n, n)
+        s += __blas__.dot(x, y, n)
+        for i in __builtin__.range(n):
+            s += (x[i] * m[i])
+        return (c, s)
+    '''
+
+    def __init__(self):
+        Transformation.__init__(self, PureExpressions, Ancestors,
+                                GlobalDeclarations)
+
+    def visit_Module(self, node):
+        self.used = False
+        self.generic_visit(node)
+        if self.used and '__blas__' not in self.global_declarations:
+            node.body.insert(0, ast.Import([ast.alias('__blas__', None)]))
+        return node
+
+    def visit_For(self, node):
+        loops = [node]
+        while len(loops[-1].body) == 1 and isinstance(loops[-1].body[0],
+                                                      ast.For):
+            loops.append(loops[-1].body[0])
+        stmt = loops[-1].body
+        kernel = (len(stmt) == 1 and len(loops) <= 3
+                  and self.kernel(loops, stmt[0]))
+        if kernel:
+            self.used = True
+            return kernel
+        return self.generic_visit(node)
+
+    def blas(self, name, args):
+        return ast.Call(
+            ast.Attribute(ast.Name('__blas__', ast.Load()), name, ast.Load()),
+            args, [], None, None)
+
+    def kernel(self, loops, stmt):
+        '''Returns the BLAS call computing `loops', or None'''
+        indices = [loop.target.id for loop in loops
+                   if isinstance(loop.target, ast.Name)]
+        if not (len(set(indices)) == len(loops)
+                and all(not loop.orelse and self.is_range(loop.iter)
+                        and len(loop.iter.args) == 1
+                        and not self.names(loop.iter) & set(indices)
+                        and not metadata.get(loop, OMPDirective)
+                        for loop in loops)):
+            return None
+        nest = set(ast.walk(loops[0]))
+        if not all(is_rebound(self.function, self.ancestors, index, nest)
+                   for index in indices):
+            return None
+        if not (isinstance(stmt, ast.AugAssign)
+                and isinstance(stmt.op, ast.Add)
+                and isinstance(stmt.value, ast.BinOp)
+                and isinstance(stmt.value.op, ast.Mult)):
+            return None
+        bounds = {loop.target.id: loop.iter.args[0] for loop in loops}
+        operands = [self.operand(n, indices)
+                    for n in (stmt.value.left, stmt.value.right)]
+        if not all(operands) or not all(self.is_dense(name, len(ids))
+                                        for name, ids in operands):
+            return None
+        if isinstance(stmt.target, ast.Name):
+            return self.dot(stmt.target, operands, bounds)
+        output = self.operand(stmt.target, indices)
+        if not output:
+            return None
+        name, _ = output
+        if not (name not in {op for op, _ in operands}
+                and all(name not in self.names(bound)
+                        for bound in bounds.values())
+                and self.is_fresh(name, nest)):
+            return None
+        if len(loops) == 3:
+            return self.gemm(output, operands, bounds)
+        elif len(loops) == 2:
+            return self.gemv(output, operands, bounds)
+        return None
+
+    def operand(self, node, indices):
+        '''
+        Returns the name and indices of an array subscripted by distinct loop
+        indices, or None
+        '''
+        access = self.access(node)
+        if not access:
+            return None
+        name, subscript = access
+        if not all(isinstance(i, ast.Name) and i.id in indices
+                   for i in subscript):
+            return None
+        ids = [i.id for i in subscript]
+        if name in indices or len(set(ids)) != len(ids):
+            return None
+        return name, ids
+
+    def rank(self, node):
+        '''
+        Number of dimensions of the row-major array allocated by `node', or
+        None if it does not allocate one.
+        '''
+        if not (isinstance(node, ast.Call) and node.args
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'numpy'):
+            return None
+        shape = node.args[-1]
+        if node.func.attr in ('zeros', 'ones', 'empty'):
+            shape = node.args[0]
+        elif node.func.attr == 'arange':
+            return 1
+        elif not (node.func.attr == 'reshape' and len(node.args) == 2
+                  and self.rank(node.args[0])):
+            return None
+        return len(shape.elts) if isinstance(shape, ast.Tuple) else 1
+
+    def is_dense(self, name, rank):
+        '''
+        Checks whether `name' holds an array of numbers of `rank' dimensions,
+        either allocated in the function or a parameter always subscripted
+        by `rank' indices, whose layout is checked by the BLAS functions.
+        '''
+        for n in ast.walk(self.function):
+            if not (isinstance(n, ast.Name) and n.id == name):
+                continue
+            parent = self.ancestors[n][-1]
+            if isinstance(n.ctx, ast.Param):
+                continue
+            elif not isinstance(n.ctx, ast.Load):
+                if not (isinstance(parent, ast.Assign)
+                        and parent.targets == [n]
+                        and self.rank(parent.value) == rank):
+                    return False
+            elif isinstance(parent, ast.Subscript) and parent.value is n:
+                chain = parent
+                while isinstance(self.ancestors[chain][-1], ast.Subscript):
+                    chain = self.ancestors[chain][-1]
+                access = self.access(chain)
+                if not access or len(access[1]) != rank:
+                    return False
+        return True
+
+    def is_number(self, name):
+        '''Checks whether the local `name' is only bound to numbers'''
+        for n in ast.walk(self.function):
+            if (isinstance(n, ast.Name) and n.id == name
+                    and not isinstance(n.ctx, ast.Load)):
+                parent = self.ancestors[n][-1]
+                if isinstance(parent, ast.AugAssign):
+                    continue
+                if not (isinstance(parent, ast.Assign)
+                        and parent.targets == [n]
+                        and isinstance(parent.value, ast.Num)):
+                    return False
+        return True
+
+    @staticmethod
+    def arg(name):
+        return ast.Name(name, ast.Load())
+
+    def dot(self, target, operands, bounds):
+        (x, xi), (y, yi) = operands
+        if not (len(bounds) == 1 and xi == yi and self.is_number(target.id)
+                and target.id not in {x, y} | set(bounds)
+                and target.id not in self.names(bounds[xi[0]])):
+            return None
+        return ast.AugAssign(target, ast.Add(),
+                             self.blas('dot', [self.arg(x), self.arg(y),
+                                               bounds[xi[0]]]))
+
+    def gemv(self, output, operands, bounds):
+        y, yi = output
+        if len(yi) != 1:
+            return None
+        i, = yi
+        for (a, ai), (x, xi) in (operands, operands[::-1]):
+            if len(ai) == 2 and ai[0] == i and xi == ai[1:]:
+                return ast.Expr(self.blas('gemv', [self.arg(a), self.arg(x),
+                                                   self.arg(y), bounds[i],
+                                                   bounds[ai[1]]]))
+        return None
+
+    def gemm(self, output, operands, bounds):
+        c, ci = output
+        if len(ci) != 2:
+            return None
+        i, j = ci
+        for (a, ai), (b, bi) in (operands, operands[::-1]):
+            if (len(ai) == 2 and len(bi) == 2 and ai[0] == i and bi[1] == j
+                    and ai[1] == bi[0] and ai[1] not in ci):
+                return ast.Expr(self.blas('gemm', [self.arg(a), self.arg(b),
+                                                   self.arg(c), bounds[i],
+                                                   bounds[j],
+                                                   bounds[ai[1]]]))
+        return None
+
+
+##
+class ListToTuple(Transformation):
+    '''
+    Turns small lists that never escape their function into tuples
+
+    A tuple of numbers of the same type is stored as a fixed-size array on the
+    stack, without the heap allocation and reference counting of a list.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                         \\n\
+def foo(a):                                          \\n\
+    l = [1., 2., 3.]                                 \\n\
+    for i in __builtin__.xrange(3): a += l[i]        \\n\
+    return a""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(ListToTuple, node)
+    >>> print pm.dump(backend.Python, node)
+    def foo(a):
+        l = (1.0, 2.0, 3.0)
+        for i in __builtin__.xrange(3):
+            a += l[i]
+        return a
+    '''
+
+    def __init__(self):
+        Transformation.__init__(self, NonEscapingLists)
+
+    def visit_List(self, node):
+        self.generic_visit(node)
+        if node in self.non_escaping_lists:
+            return ast.Tuple(node.elts, ast.Load())
+        return node
+
+
 class _LazyRemover(Transformation):
     """
         Helper removing D node and replacing U node by D node assigned value.
@@ -473,6 +2126,7 @@ class ForwardSubstitution(Transformation):
         super(ForwardSubstitution, self).__init__(LazynessAnalysis,
                                                   UsedDefChain,
                                                   Literals)
+        self.modified = False
 
     def visit_FunctionDef(self, node):
         for name, udgraph in self.used_def_chain.iteritems():
@@ -495,6 +2149,7 @@ class ForwardSubstitution(Transformation):
                 if (len(D) == 1 and len(get("UD")) == 0 and
                         not isinstance(D[0].ctx, ast.Param)):
                     node = _LazyRemover(self.ctx, U, D[0]).visit(node)
+                    self.modified = True
         return node
 
 
@@ -503,6 +2158,7 @@ class DeadCodeElimination(Transformation):
         Remove useless statement like:
             - assignment to unused variables
             - remove alone pure statement
+            - branches that are never taken
 
         >>> import ast, passmanager, backend
         >>> pm = passmanager.PassManager("test")
@@ -531,10 +2187,30 @@ class DeadCodeElimination(Transformation):
         def foo(a):
             pass
             return 1
+        >>> node = ast.parse("def foo(a):\\n if 0: a = 1\\n return a")
+        >>> node = pm.apply(DeadCodeElimination, node)
+        >>> print pm.dump(backend.Python, node)
+        def foo(a):
+            pass
+            return a
     """
     def __init__(self):
         super(DeadCodeElimination, self).__init__(PureExpressions,
                                                   UsedDefChain)
+        self.modified = False
+
+    @staticmethod
+    def literal_value(node):
+        """Returns (True, value) if `node' is a literal, (False, None) else"""
+        if isinstance(node, ast.Num):
+            return True, node.n
+        elif (isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == '__builtin__'
+                and node.attr in ('True', 'False', 'None')):
+            values = {'True': True, 'False': False, 'None': None}
+            return True, values[node.attr]
+        return False, None
 
     def used_target(self, node):
         if isinstance(node, ast.Name):
@@ -545,7 +2221,11 @@ class DeadCodeElimination(Transformation):
         return True
 
     def visit_Assign(self, node):
-        node.targets = filter(self.used_target, node.targets)
+        targets = filter(self.used_target, node.targets)
+        if len(targets) == len(node.targets):
+            return node
+        self.modified = True
+        node.targets = targets
         if node.targets:
             return node
         elif node.value in self.pure_expressions:
@@ -556,5 +2236,493 @@ class DeadCodeElimination(Transformation):
     def visit_Expr(self, node):
         if (node in self.pure_expressions and
                 not isinstance(node.value, ast.Yield)):
+            self.modified = True
             return ast.Pass()
         return node
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        is_literal, value = self.literal_value(node.test)
+        if is_literal:
+            self.modified = True
+            return (node.body if value else node.orelse) or ast.Pass()
+        return node
+
+
+class InPlaceUpdate(Transformation):
+    """
+        Turn rebinding updates like `a = a + b' into `a += b'
+
+        The update is only rewritten when `a' is an array whose former value
+        cannot be reached through another name, so that the runtime is free to
+        reuse its storage instead of allocating a new one. This holds when `a'
+        is neither a parameter nor a global, is bound by a numpy function and
+        otherwise only to freshly computed values, and is only read by
+        expressions that neither keep a reference to it nor return a view of
+        it. Lists, strings and tuples lack some of the in-place operators,
+        hence the numpy binding. `b' must be made of numbers, so that the
+        update does not change the shape of `a'.
+
+        >>> import ast, passmanager, backend
+        >>> pm = passmanager.PassManager("test")
+        >>> node = ast.parse('''
+        ... import numpy
+        ... def foo(n, b):
+        ...     a = numpy.zeros(n)
+        ...     for i in __builtin__.xrange(n):
+        ...         a = a + i
+        ...         b = b * a
+        ...     return a, b''')
+        >>> node = pm.apply(InPlaceUpdate, node)
+        >>> print pm.dump(backend.Python, node)
+        import numpy
+        def foo(n, b):
+            a = numpy.zeros(n)
+            for i in __builtin__.xrange(n):
+                a += i
+                b = (b * a)
+            return (a, b)
+    """
+
+    # operators that have an in-place counterpart on arrays
+    operators = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+    # nodes that read a value without keeping a reference to it
+    consumers = (ast.BinOp, ast.UnaryOp, ast.Compare, ast.Index,
+                 ast.AugAssign, ast.Return, ast.Print)
+    # builtins that read their arguments without keeping a reference to them
+    readers = ('abs', 'bool', 'float', 'int', 'len', 'max', 'min', 'round',
+               'str', 'sum')
+    # numpy functions whose result never shares the storage of an argument
+    copiers = ('all', 'any', 'argmax', 'argmin', 'array', 'copy', 'cumprod',
+               'cumsum', 'dot', 'inner', 'max', 'mean', 'median', 'min',
+               'prod', 'sort', 'std', 'sum', 'unique', 'var')
+    # array attributes that do not give access to its storage
+    properties = ('dtype', 'itemsize', 'nbytes', 'ndim', 'shape', 'size',
+                  'strides')
+    # builtins that always return a number
+    numbers = ('float', 'int', 'len', 'long')
+    # numpy functions that do not return an array or a scalar
+    non_arrays = ('array2string', 'array_str', 'base_repr', 'binary_repr')
+
+    def __init__(self):
+        super(InPlaceUpdate, self).__init__(UsedDefChain, Ancestors)
+
+    def visit_FunctionDef(self, node):
+        # a generator may still hold a reference to a yielded value
+        if any(isinstance(n, ast.Yield) for n in ast.walk(node)):
+            return node
+        self.scalars = {name for name, udgraph
+                        in self.used_def_chain.iteritems()
+                        if self.is_scalar_name(udgraph)}
+        self.unshared = {name for name, udgraph
+                         in self.used_def_chain.iteritems()
+                         if self.is_unshared(udgraph)}
+        return self.generic_visit(node)
+
+    @staticmethod
+    def is_module_call(node, module, names):
+        return (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == module
+                and node.func.attr in names)
+
+    def is_reader(self, call):
+        return (self.is_module_call(call, 'numpy', self.copiers)
+                or self.is_module_call(call, '__builtin__', self.readers))
+
+    def is_allocation(self, node):
+        return (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'numpy'
+                and node.func.attr not in self.non_arrays)
+
+    def is_fresh(self, node):
+        return (isinstance(node, (ast.BinOp, ast.UnaryOp))
+                or self.is_allocation(node))
+
+    def is_scalar(self, node):
+        '''Checks whether `node' computes a number from numbers'''
+        if isinstance(node, ast.Num):
+            return True
+        elif isinstance(node, ast.Name):
+            return node.id in self.scalars
+        elif isinstance(node, ast.BinOp):
+            return self.is_scalar(node.left) and self.is_scalar(node.right)
+        elif isinstance(node, ast.UnaryOp):
+            return self.is_scalar(node.operand)
+        return self.is_module_call(node, '__builtin__', self.numbers)
+
+    def is_scalar_name(self, udgraph):
+        '''
+        Checks whether a name is only bound to numbers, either as the index
+        of a range loop or by assignment of a literal
+        '''
+        for n in udgraph.nodes():
+            if udgraph.node[n]['action'] == "U":
+                continue
+            name = udgraph.node[n]['name']
+            parent = self.ancestors[name][-1]
+            if isinstance(parent, ast.For) and parent.target is name:
+                if not self.is_module_call(parent.iter, '__builtin__',
+                                           ('range', 'xrange')):
+                    return False
+            elif not (isinstance(parent, ast.Assign)
+                      and parent.targets == [name]
+                      and isinstance(parent.value, ast.Num)):
+                return False
+        return True
+
+    def is_read(self, node):
+        '''
+        Checks whether the value of `node' is only read, neither kept nor
+        turned into a view that could be kept, as slices, elements of a
+        multidimensional array, `.T' or reshape would be.
+        '''
+        parent = self.ancestors[node][-1]
+        if isinstance(parent, ast.Subscript):
+            return self.is_read(parent)
+        if isinstance(parent, ast.Attribute):
+            return parent.attr in self.properties or self.is_read(parent)
+        if isinstance(parent, ast.Call):
+            return node in parent.args and self.is_reader(parent)
+        # returning several values at once is fine too
+        if (isinstance(parent, ast.Tuple) and
+                isinstance(self.ancestors[parent][-1], ast.Return)):
+            return True
+        return isinstance(parent, self.consumers)
+
+    def is_unshared(self, udgraph):
+        allocated = False
+        for n in udgraph.nodes():
+            name = udgraph.node[n]['name']
+            parent = self.ancestors[name][-1]
+            if udgraph.node[n]['action'] == "U":
+                if not self.is_read(name):
+                    return False
+            elif isinstance(name.ctx, ast.Param):
+                return False
+            elif isinstance(parent, ast.Assign):
+                if parent.targets != [name] or not self.is_fresh(parent.value):
+                    return False
+                allocated |= self.is_allocation(parent.value)
+            elif not isinstance(parent, ast.AugAssign):
+                return False
+        return allocated
+
+    def visit_Assign(self, node):
+        if len(node.targets) != 1:
+            return node
+        target, value = node.targets[0], node.value
+        if not (isinstance(target, ast.Name)
+                and target.id in self.unshared
+                and isinstance(value, ast.BinOp)
+                and type(value.op) in self.operators
+                and isinstance(value.left, ast.Name)
+                and value.left.id == target.id):
+            return node
+        if metadata.get(node, OMPDirective):
+            return node
+        # a number cannot change the shape of the array, nor read it
+        if not self.is_scalar(value.right):
+            return node
+        return ast.AugAssign(target, value.op, value.right)
+
+
+class _ParameterBinder(ast.NodeTransformer):
+    """Helper replacing each read of a parameter by its constant value."""
+    def __init__(self, values):
+        super(_ParameterBinder, self).__init__()
+        self.values = values
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load) and node.id in self.values:
+            return deepcopy(self.values[node.id])
+        return node
+
+
+class FunctionSpecialization(Transformation):
+    '''
+    Clone user functions for call sites that pass constant arguments
+
+    In each clone, the constant parameters are dropped and replaced by their
+    value, so that ConstantFolding, LoopFullUnrolling and DeadCodeElimination,
+    which run afterward, can simplify its body. The number of clones is
+    bounded by the ``[specialization]`` section of the configuration file.
+
+    >>> import ast, passmanager, backend
+    >>> node = ast.parse("""                          \\n\
+def foo(a, n, b):                                     \\n\
+    if b: return a * n                                \\n\
+    else: return a                                    \\n\
+def bar(x):                                           \\n\
+    return foo(x, 3, __builtin__.True) + foo(x, 3, __builtin__.True)""")
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(FunctionSpecialization, node)
+    >>> print pm.dump(backend.Python, node)
+    def foo(a, n, b):
+        if b:
+            return (a * n)
+        else:
+            return a
+    def foo_0(a):
+        if __builtin__.True:
+            return (a * 3)
+        else:
+            return a
+    def bar(x):
+        return (foo_0(x) + foo_0(x))
+    '''
+
+    # constant arguments made only of these nodes are cheap to duplicate
+    Inlinable = (ast.Num, ast.Str, ast.Name, ast.Attribute, ast.Tuple,
+                 ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp)
+
+    def __init__(self):
+        Transformation.__init__(self, ConstantExpressions, Identifiers)
+        self.max_clones = cfg.getint('specialization', 'max_clones')
+
+    def visit_Module(self, node):
+        self.functions = {n.name: n for n in node.body
+                          if isinstance(n, ast.FunctionDef)}
+        self.local_names = set()
+        self.clones = dict()
+        self.generic_visit(node)
+        # each clone goes right after the function it comes from
+        body = []
+        for stmt in node.body:
+            body.append(stmt)
+            body.extend(clone for _, clone, origin
+                        in sorted(self.clones.itervalues())
+                        if origin is stmt)
+        node.body = body
+        return node
+
+    def visit_FunctionDef(self, node):
+        self.local_names = self.bound_names(node)
+        return self.generic_visit(node)
+
+    @staticmethod
+    def bound_names(node):
+        return {n.id for n in ast.walk(node)
+                if isinstance(n, ast.Name) and not isinstance(n.ctx, ast.Load)}
+
+    def is_specializable(self, node):
+        args = node.args
+        if args.vararg or args.kwarg:
+            return False
+        # OpenMP clauses refer to parameters by name
+        return not any(metadata.get(n, OMPDirective) for n in ast.walk(node))
+
+    def is_inlinable(self, node):
+        return (node in self.constant_expressions
+                and all(isinstance(n, self.Inlinable)
+                        for n in ast.walk(node) if isinstance(n, ast.expr)))
+
+    def specialize(self, function, constants):
+        clone = deepcopy(function)
+        index = 0
+        while "{0}_{1}".format(function.name, index) in self.identifiers:
+            index += 1
+        clone.name = "{0}_{1}".format(function.name, index)
+        self.identifiers.add(clone.name)
+        params = clone.args.args
+        values = {params[i].id: value for i, value in constants.iteritems()}
+        clone.args.args = [p for i, p in enumerate(params)
+                           if i not in constants]
+        clone.args.defaults = []
+        clone.body = [_ParameterBinder(values).visit(n) for n in clone.body]
+        return clone
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        func = node.func
+        if not (isinstance(func, ast.Name)
+                and func.id in self.functions
+                and func.id not in self.local_names):
+            return node
+        function = self.functions[func.id]
+        params = function.args.args
+        if (node.keywords or node.starargs or node.kwargs
+                or len(node.args) != len(params)
+                or not self.is_specializable(function)):
+            return node
+        # parameters rebound by the function cannot be replaced by a value
+        rebound = {n.id for n in ast.walk(function)
+                   if isinstance(n, ast.Name)
+                   and not isinstance(n.ctx, (ast.Load, ast.Param))}
+        constants = {i: arg for i, arg in enumerate(node.args)
+                     if params[i].id not in rebound
+                     and self.is_inlinable(arg)}
+        if not constants:
+            return node
+        key = (function.name,) + tuple((i, ast.dump(constants[i]))
+                                       for i in sorted(constants))
+        if key not in self.clones:
+            if len(self.clones) >= self.max_clones:
+                return node
+            self.clones[key] = (len(self.clones),
+                                self.specialize(function, constants),
+                                function)
+        _, clone, _ = self.clones[key]
+        return ast.Call(ast.Name(clone.name, ast.Load()),
+                        [arg for i, arg in enumerate(node.args)
+                         if i not in constants],
+                        [], None, None)
+
+
+class ShapeSpecialization(Transformation):
+    '''
+    Replace the shape of arrays fixed by the export spec by constants
+
+    Functions exported with fixed extents, e.g. ``float[:,3]``, carry
+    FixedShape metadata. As the module wrapper checks these extents, their
+    ``len``, ``shape``, ``size`` and ``ndim`` can be folded in the body of
+    the function, so that loops over them can be fully unrolled, unless the
+    function is also called from pythran code.
+
+    >>> import ast, passmanager, backend, metadata
+    >>> node = ast.parse("""                          \\n\
+def foo(a, n):                                        \\n\
+    for i in __builtin__.range(__builtin__.len(a)):   \\n\
+        n += __builtin__.getattr(a, 'SHAPE')[-1]      \\n\
+    return n""")
+    >>> metadata.add(node.body[0], metadata.FixedShape('a', (None, 3)))
+    >>> pm = passmanager.PassManager("test")
+    >>> node = pm.apply(ShapeSpecialization, node)
+    >>> print pm.dump(backend.Python, node)
+    def foo(a, n):
+        for i in __builtin__.range(__builtin__.len(a)):
+            n += 3
+        return n
+    '''
+
+    def __init__(self):
+        super(ShapeSpecialization, self).__init__()
+        self.modified = False
+        self.extents = dict()
+
+    @staticmethod
+    def is_call(node, module, name, nargs):
+        return (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == module
+                and node.func.attr == name
+                and len(node.args) == nargs
+                and not (node.keywords or node.starargs or node.kwargs))
+
+    def visit_Module(self, node):
+        # functions called from pythran code may get arrays of any shape
+        self.called = {n.id for n in ast.walk(node)
+                       if isinstance(n, ast.Name)
+                       and isinstance(n.ctx, ast.Load)}
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        if node.name in self.called:
+            return node
+        self.extents = {md.arg: md.extents
+                        for md in metadata.get(node, metadata.FixedShape)}
+        # names only bound as targets of loops over ranges are integers
+        ranges = {loop.target for loop in ast.walk(node)
+                  if isinstance(loop, ast.For)
+                  and any(self.is_call(loop.iter, '__builtin__', r, nargs)
+                          for r in ('range', 'xrange')
+                          for nargs in (1, 2, 3))}
+        self.integers = {n.id for n in ranges if isinstance(n, ast.Name)}
+        for n in ast.walk(node):
+            if isinstance(n, ast.Name) and not isinstance(n.ctx, ast.Load):
+                if not isinstance(n.ctx, ast.Param):
+                    self.extents.pop(n.id, None)
+                if n not in ranges:
+                    self.integers.discard(n.id)
+        if self.extents:
+            self.generic_visit(node)
+        return node
+
+    def is_integer(self, node):
+        if isinstance(node, ast.Name):
+            return node.id in self.integers
+        return isinstance(node, ast.Num) and isinstance(node.n, (int, long))
+
+    def extents_of(self, node):
+        '''Extents of array `node', or None if they are not known'''
+        if isinstance(node, ast.Name):
+            return self.extents.get(node.id)
+        if not isinstance(node, ast.Subscript):
+            return None
+        extents = self.extents_of(node.value)
+        if not extents:
+            return None
+        # only literal integers and slices are known to drop or keep an axis:
+        # an index held by a name may be a tuple, or an array of indices
+        if isinstance(node.slice, ast.Index):
+            index = node.slice.value
+            dims = index.elts if isinstance(index, ast.Tuple) else [index]
+        elif isinstance(node.slice, ast.ExtSlice):
+            dims = [dim.value if isinstance(dim, ast.Index) else dim
+                    for dim in node.slice.dims]
+        else:
+            dims = [node.slice]
+        if len(dims) > len(extents):
+            return None
+        inner = list()
+        for dim, extent in zip(dims, extents):
+            if self.is_integer(dim):
+                continue
+            elif not isinstance(dim, ast.Slice):
+                return None
+            elif dim.lower or dim.upper or dim.step:
+                inner.append(None)
+            else:
+                inner.append(extent)
+        # an element of an array has its inner extents
+        inner.extend(extents[len(dims):])
+        return tuple(inner) or None
+
+    def constant(self, value):
+        self.modified = True
+        if isinstance(value, tuple):
+            return ast.Tuple(map(self.constant, value), ast.Load())
+        return ast.Num(value)
+
+    def shape_of(self, node):
+        '''Attribute read by `node' on an array and extents of this array'''
+        if (self.is_call(node, '__builtin__', 'getattr', 2)
+                and isinstance(node.args[1], ast.Str)):
+            return node.args[1].s, self.extents_of(node.args[0])
+        return None, None
+
+    def visit_Subscript(self, node):
+        attr, extents = self.shape_of(node.value)
+        index = node.slice.value if isinstance(node.slice, ast.Index) else None
+        if attr == 'SHAPE' and extents and isinstance(index, ast.Num):
+            axis = index.n + len(extents) if index.n < 0 else index.n
+            if 0 <= axis < len(extents) and extents[axis] is not None:
+                return self.constant(extents[axis])
+        return self.generic_visit(node)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if self.is_call(node, '__builtin__', 'len', 1):
+            extents = self.extents_of(node.args[0])
+            if extents and extents[0] is not None:
+                return self.constant(extents[0])
+            return node
+        if self.is_call(node, 'numpy', 'shape', 1):
+            attr, extents = 'SHAPE', self.extents_of(node.args[0])
+        else:
+            attr, extents = self.shape_of(node)
+        if not extents:
+            return node
+        if attr == 'NDIM':
+            return self.constant(len(extents))
+        if None in extents:
+            return node
+        if attr == 'SHAPE':
+            return self.constant(extents)
+        if attr == 'SIZE':
+            return self.constant(reduce(int.__mul__, extents, 1))
+        return node
@@ -8,6 +8,8 @@ There are two kinds of passes: transformations and analysis.
     * dump is used to dump (!) the AST using the given backend.
     * Transformation is to be sub-classed by any pass that updates the AST.
     * apply is used to apply (sic) a transformation on an AST node.
+    * update is used to apply a transformation and tell whether it changed
+      the AST.
 '''
 
 import ast
@@ -25,10 +27,14 @@ class AnalysisContext(object):
     Class that stores the hierarchy of node visited:
         * parent module
         * parent function
+    and the module analyses required by the function analyses run in this
+    context, so that they are not computed again for each function as long
+    as the module is not modified.
     '''
     def __init__(self):
         self.module = None
         self.function = None
+        self.module_analyses = dict()
 
 
 class ContextManager(object):
@@ -46,6 +52,10 @@ class ContextManager(object):
             self.ctx.module = node
         elif isinstance(node, ast.FunctionDef):
             self.ctx.function = node
+            # a transformation may have changed the module since the module
+            # analyses were computed, unless it tells otherwise
+            if getattr(self, 'modified', False) is not False:
+                self.ctx.module_analyses.clear()
             for D in self.deps:
                 if issubclass(D, FunctionAnalysis):
                     d = D()
@@ -63,6 +73,15 @@ class ContextManager(object):
         for D in self.deps:
             if issubclass(D, ModuleAnalysis):
                 rnode = node if isinstance(node, ast.Module) else ctx.module
+                if isinstance(self, FunctionAnalysis) and ctx:
+                    key = D, rnode
+                    if key not in ctx.module_analyses:
+                        d = D()
+                        d.passmanager = self.passmanager
+                        ctx.module_analyses[key] = d.run(rnode, ctx)
+                    setattr(self, uncamel(D.__name__),
+                            ctx.module_analyses[key])
+                    continue
             elif issubclass(D, FunctionAnalysis):
                 if ctx and ctx.function:
                     rnode = ctx.function
@@ -127,6 +146,13 @@ class Backend(ModuleAnalysis):
 class Transformation(ContextManager, ast.NodeTransformer):
     '''A pass that updates its content.'''
 
+    def __init__(self, *dependencies):
+        '''`modified' is None as long as the pass does not tell whether it
+            changed the AST. Passes that track their changes set it to False
+            when initialized and to True as soon as they modify a node.'''
+        self.modified = None
+        ContextManager.__init__(self, *dependencies)
+
     def run(self, node, ctx):
         n = super(Transformation, self).run(node, ctx)
         ast.fix_missing_locations(n)
@@ -171,3 +197,21 @@ class PassManager(object):
         a = transformation()
         a.passmanager = self
         return a.apply(node, ctx)
+
+    def update(self, transformation, node, ctx=None):
+        '''
+        High-level function to call a `transformation' on a `node',
+        eventually using a `ctx'.
+        Returns a pair made of a flag telling whether the transformation
+        changed the node and of the transformed node. Transformations that
+        do not track their changes are checked by comparing the node before
+        and after the transformation.
+        '''
+        assert issubclass(transformation, Transformation)
+        a = transformation()
+        a.passmanager = self
+        before = ast.dump(node) if a.modified is None else None
+        node = a.apply(node, ctx)
+        if a.modified is None:
+            return ast.dump(node) != before, node
+        return a.modified, node
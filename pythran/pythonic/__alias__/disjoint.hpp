@@ -0,0 +1,32 @@
+#ifndef PYTHONIC_ALIAS_DISJOINT_HPP
+#define PYTHONIC_ALIAS_DISJOINT_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/restrict.hpp"
+
+#include <functional>
+
+namespace pythonic {
+
+    namespace __alias__ {
+
+        /* whether self and other are flat values whose storages do not
+         * overlap, false when it cannot be told
+         */
+        template<class T, class U>
+            bool disjoint(T const& self, U const& other)
+            {
+                if(not (utils::is_flat<T>::value and utils::is_flat<U>::value))
+                    return false;
+                auto s = utils::storage(self), o = utils::storage(other);
+                std::less_equal<char const*> le;
+                return le(s.second, o.first) or le(o.second, s.first);
+            }
+
+        PROXY(pythonic::__alias__, disjoint);
+
+    }
+
+}
+
+#endif
@@ -0,0 +1,44 @@
+#ifndef PYTHONIC_BLAS_DOT_HPP
+#define PYTHONIC_BLAS_DOT_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/blas.hpp"
+#include "pythonic/types/assignable.hpp"
+#include "pythonic/types/ndarray.hpp"
+
+namespace pythonic {
+
+    namespace __blas__ {
+
+        /* sum of x[i] * y[i] for i < n */
+        template<class X, class Y>
+            auto dot(X const& x, Y const& y, long n)
+            -> typename assignable<decltype(x[0] * y[0])>::type
+            {
+                typename assignable<decltype(x[0] * y[0])>::type res = 0;
+                for(long i = 0; i < n; ++i)
+                    res += x[i] * y[i];
+                return res;
+            }
+
+#ifdef PYTHRAN_BLAS
+        template<class T>
+            typename std::enable_if<utils::is_blas_type<T>::value, T>::type
+            dot(types::ndarray<T,1> const& x, types::ndarray<T,1> const& y, long n)
+            {
+                if(n <= x.shape[0] and n <= y.shape[0])
+                    return n > 0 ? utils::blas::dot(n, x.buffer, y.buffer) : T(0);
+                T res = 0;
+                for(long i = 0; i < n; ++i)
+                    res += x[i] * y[i];
+                return res;
+            }
+#endif
+
+        PROXY(pythonic::__blas__, dot);
+
+    }
+
+}
+
+#endif
@@ -0,0 +1,53 @@
+#ifndef PYTHONIC_BLAS_GEMM_HPP
+#define PYTHONIC_BLAS_GEMM_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/blas.hpp"
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
+
+namespace pythonic {
+
+    namespace __blas__ {
+
+        /* c[i][j] += a[i][k] * b[k][j] for i < n, j < m and k < p */
+        template<class A, class B, class C>
+            types::none_type _gemm(A const& a, B const& b, C& c, long n, long m, long p)
+            {
+                for(long i = 0; i < n; ++i)
+                    for(long k = 0; k < p; ++k) {
+                        auto const aik = a[i][k];
+                        for(long j = 0; j < m; ++j)
+                            c[i][j] += aik * b[k][j];
+                    }
+                return __builtin__::None;
+            }
+
+        template<class A, class B, class C>
+            types::none_type gemm(A const& a, B const& b, C c, long n, long m, long p)
+            {
+                return _gemm(a, b, c, n, m, p);
+            }
+
+#ifdef PYTHRAN_BLAS
+        template<class T>
+            typename std::enable_if<utils::is_blas_type<T>::value, types::none_type>::type
+            gemm(types::ndarray<T,2> const& a, types::ndarray<T,2> const& b, types::ndarray<T,2> c, long n, long m, long p)
+            {
+                if(n <= a.shape[0] and p <= a.shape[1] and p <= b.shape[0] and m <= b.shape[1] and n <= c.shape[0] and m <= c.shape[1]
+                   and not utils::overlap(a, c) and not utils::overlap(b, c)) {
+                    if(n > 0 and m > 0 and p > 0)
+                        utils::blas::gemm(n, m, p, a.buffer, a.shape[1], b.buffer, b.shape[1], c.buffer, c.shape[1]);
+                    return __builtin__::None;
+                }
+                return _gemm(a, b, c, n, m, p);
+            }
+#endif
+
+        PROXY(pythonic::__blas__, gemm);
+
+    }
+
+}
+
+#endif
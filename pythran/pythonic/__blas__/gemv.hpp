@@ -0,0 +1,50 @@
+#ifndef PYTHONIC_BLAS_GEMV_HPP
+#define PYTHONIC_BLAS_GEMV_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/blas.hpp"
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
+
+namespace pythonic {
+
+    namespace __blas__ {
+
+        /* y[i] += a[i][j] * x[j] for i < n and j < m */
+        template<class A, class X, class Y>
+            types::none_type _gemv(A const& a, X const& x, Y& y, long n, long m)
+            {
+                for(long i = 0; i < n; ++i)
+                    for(long j = 0; j < m; ++j)
+                        y[i] += a[i][j] * x[j];
+                return __builtin__::None;
+            }
+
+        template<class A, class X, class Y>
+            types::none_type gemv(A const& a, X const& x, Y y, long n, long m)
+            {
+                return _gemv(a, x, y, n, m);
+            }
+
+#ifdef PYTHRAN_BLAS
+        template<class T>
+            typename std::enable_if<utils::is_blas_type<T>::value, types::none_type>::type
+            gemv(types::ndarray<T,2> const& a, types::ndarray<T,1> const& x, types::ndarray<T,1> y, long n, long m)
+            {
+                if(n <= a.shape[0] and m <= a.shape[1] and m <= x.shape[0] and n <= y.shape[0]
+                   and not utils::overlap(a, y) and not utils::overlap(x, y)) {
+                    if(n > 0 and m > 0)
+                        utils::blas::gemv(n, m, a.buffer, a.shape[1], x.buffer, y.buffer);
+                    return __builtin__::None;
+                }
+                return _gemv(a, x, y, n, m);
+            }
+#endif
+
+        PROXY(pythonic::__blas__, gemv);
+
+    }
+
+}
+
+#endif
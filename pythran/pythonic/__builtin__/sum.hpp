@@ -4,12 +4,19 @@
 #include "pythonic/utils/proxy.hpp"
 #include "pythonic/types/assignable.hpp"
 #include "pythonic/utils/int_.hpp"
+#include "pythonic/utils/reduce.hpp"
 
 #include <utility>
 #include <algorithm>
+#include <type_traits>
 
 namespace pythonic {
 
+    namespace types {
+        template<class T, size_t N>
+            struct ndarray;
+    }
+
     namespace __builtin__ {
 
         template<class Iterable, class T>
@@ -18,6 +25,15 @@ namespace pythonic {
                 return std::accumulate(s.begin(), s.end(), static_cast<typename assignable<decltype(start+*s.begin())>::type>(start));
             }
 
+        /* contiguous arrays of numbers are summed without going through iterators */
+        template<class T, class F>
+            typename std::enable_if<std::is_arithmetic<T>::value and std::is_arithmetic<F>::value,
+                                    decltype(std::declval<F>() + std::declval<T>())>::type
+            sum(types::ndarray<T,1> const& s, F start)
+            {
+                return utils::flat_sum(s.fbegin(), s.fend(), static_cast<decltype(start + std::declval<T>())>(start));
+            }
+
         template<class Iterable>
             auto sum(Iterable s) -> decltype(sum(s, 0L))
             {
@@ -4,6 +4,7 @@
 #include "pythonic/types/none.hpp"
 #include "pythonic/types/list.hpp"
 #include "pythonic/itertools/common.hpp"
+#include "pythonic/__builtin__/next.hpp"
 
 #include <iterator>
 #include <type_traits>
@@ -89,6 +90,9 @@ namespace pythonic {
                 iterator const& begin() const { return *this; }
                 iterator const& end() const { return end_iter; }
 
+                /* lets lowered generators be consumed one value at a time */
+                value_type next() { return __builtin__::next(*this); }
+
             };
 
         template <typename List0>
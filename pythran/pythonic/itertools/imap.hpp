@@ -3,6 +3,7 @@
 
 #include "pythonic/types/none.hpp"
 #include "pythonic/itertools/common.hpp"
+#include "pythonic/__builtin__/next.hpp"
 
 #include <iterator>
 #include <type_traits>
@@ -206,6 +207,9 @@ namespace pythonic {
                 iterator const& end() const { return end_iter; }
                 long size() const { return end() - begin(); }
 
+                /* lets lowered generators be consumed one value at a time */
+                value_type next() { return __builtin__::next(*this); }
+
             };
 
         template <typename... Iter>
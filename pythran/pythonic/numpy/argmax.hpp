@@ -5,24 +5,43 @@
 #include "pythonic/types/ndarray.hpp"
 #include "pythonic/numpy/asarray.hpp"
 #include "pythonic/__builtin__/ValueError.hpp"
+#include "pythonic/utils/array_reduce.hpp"
 
 namespace pythonic {
 
     namespace numpy {
         template<class E>
-            long argmax(E&& expr) {
+            long argmax(E const& expr) {
                 auto arr = asarray(expr);
-                long sz = arr.size();
-                if(not sz) 
-                    throw types::ValueError("empty sequence");
-                return std::max_element(arr.fbegin(), arr.fend()) - arr.fbegin();
+                return utils::flat_arg_reduce<utils::max_op>(arr.buffer, arr.size());
+            }
+
+        template<class E>
+            typename std::enable_if<types::numpy_expr_to_ndarray<E>::N == 1, long>::type
+            argmax(E const& expr, long axis) {
+                if(axis != 0)
+                    throw types::ValueError("axis out of bounds");
+                return argmax(expr);
             }
-        PROXY(pythonic::numpy, argmax);
 
+        template<class E>
+            typename std::enable_if<types::numpy_expr_to_ndarray<E>::N != 1,
+                                    types::ndarray<long, types::numpy_expr_to_ndarray<E>::N - 1>
+                                   >::type
+            argmax(E const& expr, long axis) {
+                return utils::arg_reduce<utils::max_op>(asarray(expr), axis);
+            }
+
+        template<class T>
+            types::ndarray<long, 1>
+            argmax(types::numpy_texpr<types::ndarray<T,2>> const& expr, long axis) {
+                return utils::arg_reduce<utils::max_op>(expr, axis);
+            }
+
+        PROXY(pythonic::numpy, argmax);
 
     }
 
 }
 
 #endif
-
@@ -0,0 +1,43 @@
+#ifndef PYTHONIC_NUMPY_ARGPARTITION_HPP
+#define PYTHONIC_NUMPY_ARGPARTITION_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/sort.hpp"
+#include "pythonic/utils/array_reduce.hpp"
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/numpy/partition.hpp"
+#include "pythonic/__builtin__/None.hpp"
+
+namespace pythonic {
+
+    namespace numpy {
+        template<class T, size_t N, class K>
+            types::ndarray<long, N> argpartition(types::ndarray<T,N> const& a, K const& kth, long axis=-1) {
+                if(axis < 0)
+                    axis += N;
+                long outer, len, inner;
+                utils::reduced_shape(a.shape, axis, outer, len, inner);
+                std::vector<long> const ranks = _kth(kth, len);
+                types::ndarray<long, N> indices(a.shape, __builtin__::None);
+                utils::for_each_arg_lane(a.buffer, indices.buffer, outer, len, inner,
+                                         [len, &ranks](T const* values, long* lane, long) {
+                                             utils::select(lane, len, ranks, utils::index_less<T, utils::sort_less>{values, utils::sort_less()});
+                                         });
+                return indices;
+            }
+
+        template<class E, class K>
+            typename std::enable_if<types::is_array<E>::value, types::ndarray<long, types::numpy_expr_to_ndarray<E>::N>>::type
+            argpartition(E const& expr, K const& kth, long axis=-1)
+            {
+                return argpartition(typename types::numpy_expr_to_ndarray<E>::type(expr), kth, axis);
+            }
+
+        PROXY(pythonic::numpy, argpartition);
+
+    }
+
+}
+
+#endif
+
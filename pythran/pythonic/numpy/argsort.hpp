@@ -2,30 +2,28 @@
 #define PYTHONIC_NUMPY_ARGSORT_HPP
 
 #include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/numpy_conversion.hpp"
+#include "pythonic/utils/sort.hpp"
+#include "pythonic/utils/array_reduce.hpp"
 #include "pythonic/types/ndarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
 
 namespace pythonic {
 
     namespace numpy {
         template<class T, size_t N>
-            types::ndarray<long, N> argsort(types::ndarray<T,N> const& a) {
-                size_t last_axis = a.shape[N-1];
-                size_t n = a.size();
+            types::ndarray<long, N> argsort(types::ndarray<T,N> const& a, long axis=-1) {
+                if(axis < 0)
+                    axis += N;
+                long outer, len, inner;
+                utils::reduced_shape(a.shape, axis, outer, len, inner);
                 types::ndarray<long, N> indices(a.shape, __builtin__::None);
-                for(long j=0, * iter_indices = indices.buffer, *end_indices = indices.buffer + n;
-                        iter_indices != end_indices;
-                        iter_indices += last_axis, j+=last_axis)
-                {
-                    // fill with the original indices
-                    std::iota(iter_indices, iter_indices + last_axis, 0L);
-                    // sort the index using the value from a
-                    std::sort(iter_indices, iter_indices + last_axis,
-                            [&a,j](long i1, long i2) {return *(a.fbegin() + j + i1) < *(a.fbegin() + j + i2);});
-                }
+                utils::arg_sort_lanes(a.buffer, indices.buffer, outer, len, inner, utils::sort_less());
                 return indices;
             }
 
-        PROXY(pythonic::numpy, argsort);
+        NUMPY_EXPR_TO_NDARRAY0(argsort)
+            PROXY(pythonic::numpy, argsort);
 
     }
 
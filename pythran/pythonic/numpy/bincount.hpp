@@ -1,33 +1,78 @@
 #ifndef PYTHONIC_NUMPY_BINCOUNT_HPP
 #define PYTHONIC_NUMPY_BINCOUNT_HPP
 
-#include "pythonic/numpy/max.hpp"
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/numpy/asarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
+#include "pythonic/utils/reduce.hpp"
+#include "pythonic/__builtin__/ValueError.hpp"
+
+#include <vector>
 
 namespace pythonic {
 
     namespace numpy {
+
+        /* number of bins needed for the values of `data', which must be non-negative */
+        template<class T>
+            long _bincount_length(T const* data, long n, types::none<long> const& minlength)
+            {
+                long length = minlength ? (long)minlength : 0L;
+                if(not n)
+                    return length;
+                if(utils::flat_reduce<utils::min_op, T>(data, n) < 0)
+                    throw types::ValueError("The first argument of bincount must be non-negative");
+                return std::max(length, 1 + long(utils::flat_reduce<utils::max_op, T>(data, n)));
+            }
+
+        /* weights of bincount when none are given */
+        struct _unit_weight {
+            long operator[](long) const { return 1; }
+        };
+
+        /* adds weights[i] to the bin data[i] of `out' for each i. When OpenMP is
+         * enabled and there are many more values than bins, each thread fills
+         * bins of its own, that are then summed.
+         */
+        template<class T, class W, class F>
+            void _bincount(T const* data, long n, W const& weights, F* out, long length)
+            {
+#ifdef _OPENMP
+                if(n >= PYTHONIC_REDUCE_THRESHOLD and length * omp_get_max_threads() <= n and not omp_in_parallel()) {
+#pragma omp parallel
+                    {
+                        std::vector<F> bins(length);
+#pragma omp for nowait
+                        for(long i = 0; i < n; ++i)
+                            bins[data[i]] += weights[i];
+#pragma omp critical
+                        for(long b = 0; b < length; ++b)
+                            out[b] += bins[b];
+                    }
+                    return;
+                }
+#endif
+                for(long i = 0; i < n; ++i)
+                    out[data[i]] += weights[i];
+            }
+
         template<class T, size_t N>
             types::ndarray<long,1>
             bincount(types::ndarray<T,N> const & expr, types::none_type weights=__builtin__::None, types::none<long> minlength = __builtin__::None) {
-                long length = 0;
-                if(minlength) length = (long)minlength;
-                length = std::max(length, 1 + max(expr));
+                long const length = _bincount_length(expr.buffer, expr.size(), minlength);
                 types::ndarray<long, 1> out( types::make_tuple(length), 0L);
-                for(auto iter = expr.fbegin(), end = expr.fend(); iter != end; ++iter)
-                    ++out[ *iter ];
+                _bincount(expr.buffer, expr.size(), _unit_weight(), out.buffer, length);
                 return out;
             }
 
         template<class T, size_t N, class E>
             types::ndarray<decltype(std::declval<long>()*std::declval<typename E::dtype>()),1>
             bincount(types::ndarray<T,N> const & expr, E const& weights, types::none<long> minlength = __builtin__::None) {
-                long length = 0;
-                if(minlength) length = (long)minlength;
-                length = std::max(length, 1 + max(expr));
+                long const length = _bincount_length(expr.buffer, expr.size(), minlength);
                 types::ndarray<decltype(std::declval<long>()*std::declval<typename E::dtype>()), 1> out( types::make_tuple(length), 0L);
-                auto iweight = weights.fbegin();
-                for(auto iter = expr.fbegin(), end = expr.fend(); iter != end; ++iter, ++iweight)
-                    out[ *iter ] += *iweight;
+                auto w = asarray(weights);
+                _bincount(expr.buffer, expr.size(), w.buffer, out.buffer, length);
                 return out;
             }
 
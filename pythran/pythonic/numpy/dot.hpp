@@ -4,10 +4,78 @@
 #include "pythonic/numpy/asarray.hpp"
 #include "pythonic/numpy/sum.hpp"
 #include "pythonic/types/traits.hpp"
+#include "pythonic/utils/blas.hpp"
+#include "pythonic/__builtin__/ValueError.hpp"
+
+#include <algorithm>
 
 namespace pythonic {
 
     namespace numpy {
+
+        /* c += a.b for the row-major matrices a (n x p), b (p x m) and c (n x m),
+         * or c += a.transpose(b) for b (m x p) if `transb' is set, `lda', `ldb' and
+         * `ldc' being their row lengths
+         *
+         * Without BLAS, the product is computed tile by tile, so that the rows of
+         * b and c a tile goes through stay in the cache.
+         */
+        template<class T0, class T1, class T2>
+            void _gemm(long n, long m, long p, T0 const* a, long lda, T1 const* b, long ldb, T2* c, long ldc, bool transb)
+            {
+                static const long tile = 64;
+                for(long ii = 0; ii < n; ii += tile)
+                    for(long kk = 0; kk < p; kk += tile)
+                        for(long jj = 0; jj < m; jj += tile) {
+                            long const iend = std::min(n, ii + tile), kend = std::min(p, kk + tile), jend = std::min(m, jj + tile);
+                            for(long i = ii; i < iend; ++i) {
+                                T2* ci = c + i * ldc;
+                                if(transb)
+                                    for(long j = jj; j < jend; ++j) {
+                                        T1 const* bj = b + j * ldb;
+                                        T2 cij = 0;
+                                        for(long k = kk; k < kend; ++k)
+                                            cij += a[i * lda + k] * bj[k];
+                                        ci[j] += cij;
+                                    }
+                                else
+                                    for(long k = kk; k < kend; ++k) {
+                                        auto const aik = a[i * lda + k];
+                                        T1 const* bk = b + k * ldb;
+                                        for(long j = jj; j < jend; ++j)
+                                            ci[j] += aik * bk[j];
+                                    }
+                            }
+                        }
+            }
+        /* y += a.x for the row-major matrix a (n x m) */
+        template<class T0, class T1, class T2>
+            void _gemv(long n, long m, T0 const* a, long lda, T1 const* x, T2* y)
+            {
+                for(long i = 0; i < n; ++i) {
+                    T0 const* ai = a + i * lda;
+                    T2 yi = 0;
+                    for(long j = 0; j < m; ++j)
+                        yi += ai[j] * x[j];
+                    y[i] += yi;
+                }
+            }
+#ifdef PYTHRAN_BLAS
+        template<class T>
+            typename std::enable_if<utils::is_blas_type<T>::value>::type
+            _gemm(long n, long m, long p, T const* a, long lda, T const* b, long ldb, T* c, long ldc, bool transb)
+            {
+                if(n > 0 and m > 0 and p > 0)
+                    utils::blas::gemm(n, m, p, a, lda, b, ldb, c, ldc, transb);
+            }
+        template<class T>
+            typename std::enable_if<utils::is_blas_type<T>::value>::type
+            _gemv(long n, long m, T const* a, long lda, T const* x, T* y)
+            {
+                if(n > 0 and m > 0)
+                    utils::blas::gemv(n, m, a, lda, x, y);
+            }
+#endif
         template<class E, class F>
             typename std::enable_if<
             (std::is_scalar<E>::value or types::is_complex<E>::value) and (std::is_scalar<F>::value or types::is_complex<F>::value),
@@ -55,6 +123,54 @@ namespace pythonic {
                     return dot(asarray(e), f);
                 }
 
+        /* matrix products, evaluated on contiguous copies of the operands */
+        template<class E, class F>
+            using dot_type = decltype(std::declval<typename types::numpy_expr_to_ndarray<E>::T>() * std::declval<typename types::numpy_expr_to_ndarray<F>::T>());
+
+        template<class E, class F>
+            typename std::enable_if<types::is_numexpr_arg<E>::value and types::is_numexpr_arg<F>::value
+                                    and types::numpy_expr_to_ndarray<E>::N == 2 and types::numpy_expr_to_ndarray<F>::N == 2,
+                                    types::ndarray<dot_type<E, F>, 2>
+                                   >::type
+                dot(E const& e, F const& f) {
+                    auto const a = asarray(e);
+                    auto const b = asarray(f);
+                    if(a.shape[1] != b.shape[0])
+                        throw types::ValueError("objects are not aligned");
+                    types::ndarray<dot_type<E, F>, 2> c(types::array<long, 2>{{a.shape[0], b.shape[1]}}, dot_type<E, F>(0));
+                    _gemm(a.shape[0], b.shape[1], a.shape[1], a.buffer, a.shape[1], b.buffer, b.shape[1], c.buffer, c.shape[1], false);
+                    return c;
+                }
+        template<class E, class F>
+            typename std::enable_if<types::is_numexpr_arg<E>::value and types::is_numexpr_arg<F>::value
+                                    and types::numpy_expr_to_ndarray<E>::N == 2 and types::numpy_expr_to_ndarray<F>::N == 1,
+                                    types::ndarray<dot_type<E, F>, 1>
+                                   >::type
+                dot(E const& e, F const& f) {
+                    auto const a = asarray(e);
+                    auto const x = asarray(f);
+                    if(a.shape[1] != x.shape[0])
+                        throw types::ValueError("objects are not aligned");
+                    types::ndarray<dot_type<E, F>, 1> y(types::array<long, 1>{{a.shape[0]}}, dot_type<E, F>(0));
+                    _gemv(a.shape[0], a.shape[1], a.buffer, a.shape[1], x.buffer, y.buffer);
+                    return y;
+                }
+        /* x.b is computed as the product of the single-row matrix x by b */
+        template<class E, class F>
+            typename std::enable_if<types::is_numexpr_arg<E>::value and types::is_numexpr_arg<F>::value
+                                    and types::numpy_expr_to_ndarray<E>::N == 1 and types::numpy_expr_to_ndarray<F>::N == 2,
+                                    types::ndarray<dot_type<E, F>, 1>
+                                   >::type
+                dot(E const& e, F const& f) {
+                    auto const x = asarray(e);
+                    auto const b = asarray(f);
+                    if(x.shape[0] != b.shape[0])
+                        throw types::ValueError("objects are not aligned");
+                    types::ndarray<dot_type<E, F>, 1> y(types::array<long, 1>{{b.shape[1]}}, dot_type<E, F>(0));
+                    _gemm(1, b.shape[1], x.shape[0], x.buffer, x.shape[0], b.buffer, b.shape[1], y.buffer, y.shape[0], false);
+                    return y;
+                }
+
         PROXY(pythonic::numpy, dot);
 
     }
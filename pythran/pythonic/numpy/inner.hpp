@@ -7,11 +7,59 @@ namespace pythonic {
 
     namespace numpy {
 
-        FPROXY(pythonic::numpy, inner, dot);
+        template<class F, bool = types::is_numexpr_arg<F>::value>
+            struct _is_matrix {
+                static const bool value = false;
+            };
+        template<class F>
+            struct _is_matrix<F, true> {
+                static const bool value = types::numpy_expr_to_ndarray<F>::N == 2;
+            };
+
+        /* inner products along the last axis of both operands, which only differ
+         * from dot products when the second operand is a matrix
+         */
+        template<class E, class F>
+            auto inner(E const& e, F const& f)
+            -> typename std::enable_if<not _is_matrix<F>::value,
+                                       decltype(dot(e, f))
+                                      >::type
+            {
+                return dot(e, f);
+            }
+        template<class E, class F>
+            typename std::enable_if<types::is_numexpr_arg<E>::value and types::is_numexpr_arg<F>::value
+                                    and types::numpy_expr_to_ndarray<E>::N == 2 and types::numpy_expr_to_ndarray<F>::N == 2,
+                                    types::ndarray<dot_type<E, F>, 2>
+                                   >::type
+                inner(E const& e, F const& f) {
+                    auto const a = asarray(e);
+                    auto const b = asarray(f);
+                    if(a.shape[1] != b.shape[1])
+                        throw types::ValueError("matrices are not aligned");
+                    types::ndarray<dot_type<E, F>, 2> c(types::array<long, 2>{{a.shape[0], b.shape[0]}}, dot_type<E, F>(0));
+                    _gemm(a.shape[0], b.shape[0], a.shape[1], a.buffer, a.shape[1], b.buffer, b.shape[1], c.buffer, c.shape[1], true);
+                    return c;
+                }
+        template<class E, class F>
+            typename std::enable_if<types::is_numexpr_arg<E>::value and types::is_numexpr_arg<F>::value
+                                    and types::numpy_expr_to_ndarray<E>::N == 1 and types::numpy_expr_to_ndarray<F>::N == 2,
+                                    types::ndarray<dot_type<E, F>, 1>
+                                   >::type
+                inner(E const& e, F const& f) {
+                    auto const x = asarray(e);
+                    auto const b = asarray(f);
+                    if(x.shape[0] != b.shape[1])
+                        throw types::ValueError("matrices are not aligned");
+                    types::ndarray<dot_type<E, F>, 1> y(types::array<long, 1>{{b.shape[0]}}, dot_type<E, F>(0));
+                    _gemv(b.shape[0], b.shape[1], b.buffer, b.shape[1], x.buffer, y.buffer);
+                    return y;
+                }
+
+        PROXY(pythonic::numpy, inner);
 
     }
 
 }
 
 #endif
-
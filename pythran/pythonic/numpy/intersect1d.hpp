@@ -5,12 +5,14 @@
 #include "pythonic/types/ndarray.hpp"
 #include "pythonic/types/combined.hpp"
 #include "pythonic/numpy/asarray.hpp"
+#include "pythonic/numpy/unique.hpp"
 
 #include <algorithm>
 
 namespace pythonic {
 
     namespace numpy {
+        /* the distinct values of both arrays are merged, as they are sorted */
         template<class E, class F>
             types::ndarray<typename __combined<typename types::numpy_expr_to_ndarray<E>::T,
                                                typename types::numpy_expr_to_ndarray<F>::T
@@ -21,22 +23,21 @@ namespace pythonic {
                 typedef typename __combined<typename types::numpy_expr_to_ndarray<E>::T,
                                             typename types::numpy_expr_to_ndarray<F>::T
                                            >::type T;
-                auto ae = asarray(e);
-                auto af = asarray(f);
-                std::set<T> sae(ae.fbegin(), ae.fend());
-                std::set<T> found;
-                types::list<T> lout(0);
-                lout.reserve(sae.size());
-                for(auto iter = af.fbegin(), end = af.fend(); iter != end; ++iter)
-                {
-                    auto curr = *iter;
-                    if(sae.find(curr) != sae.end() and found.find(curr) == found.end()) {
-                        found.insert(curr);
-                        lout.push_back(curr);
+                auto ue = unique(e);
+                auto uf = unique(f);
+                types::ndarray<T, 1> out(types::make_tuple(long(std::min(ue.size(), uf.size()))), __builtin__::None);
+                long i = 0, j = 0, count = 0;
+                while(i < long(ue.size()) and j < long(uf.size())) {
+                    if(ue.buffer[i] < uf.buffer[j])
+                        ++i;
+                    else if(ue.buffer[i] == uf.buffer[j]) {
+                        out.buffer[count++] = ue.buffer[i];
+                        ++i, ++j;
                     }
+                    else
+                        ++j;
                 }
-                std::sort(lout.begin(), lout.end());
-                return types::ndarray<T, 1> (lout);
+                return _truncate(out, count);
             }
 
         PROXY(pythonic::numpy, intersect1d);
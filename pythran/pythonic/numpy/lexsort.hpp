@@ -2,21 +2,25 @@
 #define PYTHONIC_NUMPY_LEXSORT_HPP
 
 #include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/sort.hpp"
 #include "pythonic/types/ndarray.hpp"
 
 namespace pythonic {
 
     namespace numpy {
+        /* orders indices by their keys, the last key first, and equal keys by
+         * index so that the sort is stable
+         */
         template<class K>
             struct lexcmp {
                 K const& keys;
                 lexcmp(K const& keys) : keys(keys) {
                 }
-                bool operator()(long i0, long i1) {
+                bool operator()(long i0, long i1) const {
                     for(long i= keys.size() -1; i>=0; --i)
                         if(keys[i][i0] < keys[i][i1]) return true;
                         else if(keys[i][i0] > keys[i][i1]) return false;
-                    return false;
+                    return i0 < i1;
                 }
             };
 
@@ -27,7 +31,7 @@ namespace pythonic {
                 // fill with the original indices
                 std::iota(out.buffer, out.buffer + n, 0L);
                 // then sort using keys as the comparator
-                std::sort(out.buffer, out.buffer +n, lexcmp<types::array<T, N>>(keys));
+                utils::parallel_sort(out.buffer, n, lexcmp<types::array<T, N>>(keys));
                 return out;
             }
         PROXY(pythonic::numpy, lexsort)
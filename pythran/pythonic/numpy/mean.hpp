@@ -16,6 +16,23 @@ namespace pythonic {
                 return sum(expr)/typename types::numpy_type<dtype>::type(expr.size());
             }
 
+        template<class T, size_t N, class dtype=double>
+            auto
+            mean(types::ndarray<T,N> const& array, long axis, dtype d=dtype())
+            -> decltype(sum(array, axis)/typename types::numpy_type<dtype>::type(1))
+            {
+                auto const s = sum(array, axis);
+                return s/typename types::numpy_type<dtype>::type(array.shape[axis]);
+            }
+
+        template<class E, class dtype=double>
+            auto
+            mean(E const& expr, long axis, dtype d=dtype())
+            -> decltype(mean(typename types::numpy_expr_to_ndarray<E>::type(expr), axis, d))
+            {
+                return mean(typename types::numpy_expr_to_ndarray<E>::type(expr), axis, d);
+            }
+
         PROXY(pythonic::numpy, mean);
 
     }
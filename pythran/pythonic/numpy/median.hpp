@@ -2,21 +2,41 @@
 #define PYTHONIC_NUMPY_MEDIAN_HPP
 
 #include "pythonic/utils/proxy.hpp"
+#include "pythonic/numpy/percentile.hpp"
 #include "pythonic/types/ndarray.hpp"
-#include <algorithm>
+#include "pythonic/__builtin__/None.hpp"
 
 namespace pythonic {
 
     namespace numpy {
+
+        /* the median is the 50th percentile, found by selection rather than by sorting */
+        template<class T, size_t N>
+            percentile_type<T> median(types::ndarray<T,N> const& arr, types::none_type axis=__builtin__::None, types::none_type out=__builtin__::None, bool overwrite_input=false) {
+                return percentile(arr, 50., axis, out, overwrite_input);
+            }
+
         template<class T, size_t N>
-            decltype(std::declval<T>()+1.) median(types::ndarray<T,N> const& arr) {
-                size_t n = arr.size();
-                T* tmp = new T[n];
-                std::copy(arr.buffer, arr.buffer + n, tmp);
-                std::sort(tmp, tmp + n);
-                auto out = (tmp[n/2]+tmp[(n-1)/2])/double(2);
-                delete [] tmp;
-                return out;
+            auto median(types::ndarray<T,N> const& arr, long axis, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            -> decltype(percentile(arr, 50., axis, out, overwrite_input))
+            {
+                return percentile(arr, 50., axis, out, overwrite_input);
+            }
+
+        template<class E>
+            auto median(E const& expr, types::none_type axis=__builtin__::None, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            -> typename std::enable_if<types::is_array<E>::value,
+                                       decltype(percentile(expr, 50., axis, out, overwrite_input))>::type
+            {
+                return percentile(expr, 50., axis, out, overwrite_input);
+            }
+
+        template<class E>
+            auto median(E const& expr, long axis, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            -> typename std::enable_if<types::is_array<E>::value,
+                                       decltype(percentile(expr, 50., axis, out, overwrite_input))>::type
+            {
+                return percentile(expr, 50., axis, out, overwrite_input);
             }
 
         PROXY(pythonic::numpy, median);
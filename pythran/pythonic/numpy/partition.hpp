@@ -0,0 +1,81 @@
+#ifndef PYTHONIC_NUMPY_PARTITION_HPP
+#define PYTHONIC_NUMPY_PARTITION_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/sort.hpp"
+#include "pythonic/utils/array_reduce.hpp"
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
+#include "pythonic/__builtin__/ValueError.hpp"
+
+#include <algorithm>
+#include <type_traits>
+#include <vector>
+
+namespace pythonic {
+
+    namespace numpy {
+
+        /* ranks `kth' among `n' values, negative ranks counting from the end,
+         * as the sorted list of distinct ranks expected by utils::select
+         */
+        inline std::vector<long> _kth(long k, long n)
+        {
+            if(k < 0)
+                k += n;
+            if(k < 0 or k >= n)
+                throw types::ValueError("kth out of bounds");
+            return std::vector<long>(1, k);
+        }
+        template<class K>
+            typename std::enable_if<not std::is_arithmetic<K>::value, std::vector<long>>::type
+            _kth(K const& kth, long n)
+            {
+                std::vector<long> ranks;
+                for(long k : kth)
+                    ranks.push_back(_kth(k, n).front());
+                std::sort(ranks.begin(), ranks.end());
+                ranks.erase(std::unique(ranks.begin(), ranks.end()), ranks.end());
+                return ranks;
+            }
+
+        /* partitions the values of `array' in place along `axis' around the ranks `kth' */
+        template<class T, size_t N, class K>
+            void _partition(types::ndarray<T,N>& array, K const& kth, long axis)
+            {
+                if(axis < 0)
+                    axis += N;
+                long outer, len, inner;
+                utils::reduced_shape(array.shape, axis, outer, len, inner);
+                std::vector<long> const ranks = _kth(kth, len);
+                utils::for_each_lane(array.buffer, array.buffer, outer, len, inner,
+                                     [len, &ranks](T* lane, long) { utils::select(lane, len, ranks, utils::sort_less()); });
+            }
+
+        template<class T, size_t N, class K>
+            types::ndarray<T,N> partition(types::ndarray<T,N> const& expr, K const& kth, long axis=-1)
+            {
+                types::ndarray<T,N> out(expr.shape, __builtin__::None);
+                std::copy(expr.buffer, expr.buffer + expr.size(), out.buffer);
+                _partition(out, kth, axis);
+                return out;
+            }
+
+        /* expressions are evaluated once, then partitioned in place */
+        template<class E, class K>
+            typename std::enable_if<types::is_array<E>::value, typename types::numpy_expr_to_ndarray<E>::type>::type
+            partition(E const& expr, K const& kth, long axis=-1)
+            {
+                typename types::numpy_expr_to_ndarray<E>::type out(expr);
+                _partition(out, kth, axis);
+                return out;
+            }
+
+        PROXY(pythonic::numpy, partition);
+
+    }
+
+}
+
+#endif
+
@@ -0,0 +1,175 @@
+#ifndef PYTHONIC_NUMPY_PERCENTILE_HPP
+#define PYTHONIC_NUMPY_PERCENTILE_HPP
+
+#include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/sort.hpp"
+#include "pythonic/utils/array_reduce.hpp"
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
+#include "pythonic/__builtin__/ValueError.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <functional>
+#include <limits>
+#include <type_traits>
+#include <vector>
+
+namespace pythonic {
+
+    namespace numpy {
+
+        template<class T>
+            using percentile_type = decltype(std::declval<T>() + 1.);
+
+        /* percentiles `q', which must lie in [0, 100] */
+        inline std::vector<double> _percentiles(double q)
+        {
+            if(not (q >= 0. and q <= 100.))
+                throw types::ValueError("Percentiles must be in the range [0, 100]");
+            return std::vector<double>(1, q);
+        }
+        template<class Q>
+            typename std::enable_if<not std::is_arithmetic<Q>::value, std::vector<double>>::type
+            _percentiles(Q const& qs)
+            {
+                std::vector<double> out;
+                for(double q : qs)
+                    out.push_back(_percentiles(q).front());
+                return out;
+            }
+
+        /* positions of percentiles within the sorted values of a lane of `n'
+         * values: each lies between the ranks `below' and `above', with the weight
+         * `weight' given to the value of rank `above'. `kth' lists all the ranks
+         * involved.
+         */
+        struct _quantiles {
+            std::vector<long> below, above, kth;
+            std::vector<double> weight;
+
+            _quantiles(std::vector<double> const& qs, long n)
+            {
+                for(double q : qs) {
+                    double const index = q / 100. * (n - 1);
+                    long const lo = std::floor(index);
+                    below.push_back(lo);
+                    above.push_back(std::min(lo + 1, n - 1));
+                    weight.push_back(index - lo);
+                    kth.push_back(below.back());
+                    kth.push_back(above.back());
+                }
+                std::sort(kth.begin(), kth.end());
+                kth.erase(std::unique(kth.begin(), kth.end()), kth.end());
+            }
+        };
+
+        /* percentiles of the lanes of `data', seen as in utils::for_each_lane, by
+         * linear interpolation between the selected values of each lane. The
+         * percentile q[i] of lane l goes to out[i * outer * inner + l]. Lanes
+         * are partitioned in place if `overwrite_input' is set, through a per
+         * thread copy otherwise.
+         *
+         * Any NaN makes the percentiles of its lane NaN: lanes are scanned for them
+         * first, so that the others are partitioned with the plain ordering.
+         */
+        template<class T, class F>
+            void _percentile(T* data, long outer, long len, long inner, std::vector<double> const& qs, bool overwrite_input, F* out)
+            {
+                typedef typename std::conditional<std::is_floating_point<T>::value, std::less<T>, utils::sort_less>::type compare;
+                _quantiles const where(qs, len);
+                long const stride = outer * inner;
+                utils::for_each_lane(data, overwrite_input ? data : nullptr, outer, len, inner,
+                                     [len, stride, &where, out](T* lane, long l) {
+                                         if(not len or std::find_if(lane, lane + len, [](T const& v) { return v != v; }) != lane + len) {
+                                             for(size_t i = 0; i < where.weight.size(); ++i)
+                                                 out[i * stride + l] = F(std::numeric_limits<double>::quiet_NaN());
+                                             return;
+                                         }
+                                         utils::select(lane, len, where.kth, compare());
+                                         for(size_t i = 0; i < where.weight.size(); ++i) {
+                                             double const w = where.weight[i];
+                                             out[i * stride + l] = F(lane[where.below[i]]) * (1. - w) + F(lane[where.above[i]]) * w;
+                                         }
+                                     });
+            }
+
+        template<class T, size_t N, class Q>
+            typename std::enable_if<std::is_arithmetic<Q>::value, percentile_type<T>>::type
+            percentile(types::ndarray<T,N> const& a, Q q, types::none_type axis=__builtin__::None, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            {
+                percentile_type<T> result;
+                _percentile(a.buffer, 1, a.size(), 1, _percentiles(q), overwrite_input, &result);
+                return result;
+            }
+
+        template<class T, size_t N, class Q>
+            typename std::enable_if<not std::is_arithmetic<Q>::value, types::ndarray<percentile_type<T>, 1>>::type
+            percentile(types::ndarray<T,N> const& a, Q const& q, types::none_type axis=__builtin__::None, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            {
+                std::vector<double> const qs = _percentiles(q);
+                types::ndarray<percentile_type<T>, 1> result(types::make_tuple(long(qs.size())), __builtin__::None);
+                _percentile(a.buffer, 1, a.size(), 1, qs, overwrite_input, result.buffer);
+                return result;
+            }
+
+        template<class T, class Q>
+            typename std::enable_if<std::is_arithmetic<Q>::value, percentile_type<T>>::type
+            percentile(types::ndarray<T,1> const& a, Q q, long axis, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            {
+                if(axis != 0 and axis != -1)
+                    throw types::ValueError("axis out of bounds");
+                return percentile(a, q, __builtin__::None, out, overwrite_input);
+            }
+
+        template<class T, size_t N, class Q>
+            typename std::enable_if<std::is_arithmetic<Q>::value, types::ndarray<percentile_type<T>, N - 1>>::type
+            percentile(types::ndarray<T,N> const& a, Q q, long axis, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            {
+                long outer, len, inner;
+                types::ndarray<percentile_type<T>, N - 1> result(utils::reduced_shape(a.shape, axis < 0 ? axis + N : axis, outer, len, inner), __builtin__::None);
+                _percentile(a.buffer, outer, len, inner, _percentiles(q), overwrite_input, result.buffer);
+                return result;
+            }
+
+        /* with several percentiles, the result gets a leading axis for them */
+        template<class T, size_t N, class Q>
+            typename std::enable_if<not std::is_arithmetic<Q>::value, types::ndarray<percentile_type<T>, N>>::type
+            percentile(types::ndarray<T,N> const& a, Q const& q, long axis, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            {
+                std::vector<double> const qs = _percentiles(q);
+                long outer, len, inner;
+                auto const reduced = utils::reduced_shape(a.shape, axis < 0 ? axis + N : axis, outer, len, inner);
+                types::array<long, N> shape;
+                shape[0] = qs.size();
+                std::copy(reduced.begin(), reduced.end(), shape.begin() + 1);
+                types::ndarray<percentile_type<T>, N> result(shape, __builtin__::None);
+                _percentile(a.buffer, outer, len, inner, qs, overwrite_input, result.buffer);
+                return result;
+            }
+
+        /* expressions are evaluated once, then partitioned in place */
+        template<class E, class Q>
+            auto percentile(E const& expr, Q const& q, types::none_type axis=__builtin__::None, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            -> typename std::enable_if<types::is_array<E>::value,
+                                       decltype(percentile(typename types::numpy_expr_to_ndarray<E>::type(expr), q, axis, out, true))>::type
+            {
+                return percentile(typename types::numpy_expr_to_ndarray<E>::type(expr), q, axis, out, true);
+            }
+
+        template<class E, class Q>
+            auto percentile(E const& expr, Q const& q, long axis, types::none_type out=__builtin__::None, bool overwrite_input=false)
+            -> typename std::enable_if<types::is_array<E>::value,
+                                       decltype(percentile(typename types::numpy_expr_to_ndarray<E>::type(expr), q, axis, out, true))>::type
+            {
+                return percentile(typename types::numpy_expr_to_ndarray<E>::type(expr), q, axis, out, true);
+            }
+
+        PROXY(pythonic::numpy, percentile);
+
+    }
+
+}
+
+#endif
+
@@ -5,38 +5,24 @@
 #include "pythonic/types/ndarray.hpp"
 #include "pythonic/__builtin__/None.hpp"
 #include "pythonic/__builtin__/ValueError.hpp"
-#include "pythonic/numpy/add.hpp"
+#include "pythonic/utils/array_reduce.hpp"
 
-#include <algorithm>
+#include <type_traits>
 
 namespace pythonic {
 
     namespace numpy {
-        template<class E, class F>
-            void _sum(E begin, E end, F& sum, utils::int_<1>)
-            {
-                sum = std::accumulate(begin, end, sum, std::plus<F>());
-            }
-        template<class E, class F, size_t N>
-            void _sum(E begin, E end, F& sum, utils::int_<N>)
-            {
-                for(; begin != end; ++begin)
-                    _sum((*begin).begin(), (*begin).end(), sum, utils::int_<N - 1>());
-            }
-            
+
+        /* booleans are summed as integers */
+        template<class E>
+            using sum_type = typename std::conditional<std::is_same<typename types::numpy_expr_to_ndarray<E>::T, bool>::value,
+                                                       long,
+                                                       typename types::numpy_expr_to_ndarray<E>::T
+                                                      >::type;
+
         template<class E>
-            typename
-            std::conditional<std::is_same<typename E::dtype, bool>::value,
-                             long,
-                             typename E::dtype
-                            >::type
-            sum(E const& expr, types::none_type _ = types::none_type()) {
-                typename std::conditional<std::is_same<typename E::dtype, bool>::value,
-                                          long,
-                                          typename E::dtype
-                                         >::type p = 0;
-                _sum(expr.begin(), expr.end(), p, utils::int_<types::numpy_expr_to_ndarray<E>::N>());
-                return p;
+            sum_type<E> sum(E const& expr, types::none_type _ = types::none_type()) {
+                return utils::reduce<utils::sum_op, sum_type<E>>(expr);
             }
 
         template<class T>
@@ -49,28 +35,17 @@ namespace pythonic {
             }
 
         template<class T, size_t N>
-            types::ndarray<T,N-1>
+            types::ndarray<sum_type<types::ndarray<T,N>>,N-1>
             sum(types::ndarray<T,N> const& array, long axis)
             {
-                if(axis<0 || axis >=long(N))
-                    throw types::ValueError("axis out of bounds");
-                auto shape = array.shape;
-                if(axis==0)
-                {
-                    types::array<long, N> shp;
-                    shp[0] = 1;
-                    std::copy(shape.begin() + 1, shape.end(), shp.begin() + 1);
-                    types::ndarray<T,N> out(shp, 0);
-                    return std::accumulate(array.begin(), array.end(), *out.begin(), proxy::add());
-                }
-                else
-                {
-                    types::array<long, N-1> shp;
-                    std::copy(shape.begin(), shape.end() - 1, shp.begin());
-                    types::ndarray<T,N-1> sumy(shp, __builtin__::None);
-                    std::transform(array.begin(), array.end(), sumy.begin(), [=](types::ndarray<T,N-1> const& other) {return sum(other, axis-1);});
-                    return sumy;
-                }
+                return utils::reduce<utils::sum_op, sum_type<types::ndarray<T,N>>>(array, axis);
+            }
+
+        template<class T>
+            types::ndarray<sum_type<types::ndarray<T,2>>,1>
+            sum(types::numpy_texpr<types::ndarray<T,2>> const& expr, long axis)
+            {
+                return utils::reduce<utils::sum_op, sum_type<types::ndarray<T,2>>>(expr, axis);
             }
 
         template<class E>
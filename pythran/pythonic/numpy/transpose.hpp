@@ -67,6 +67,20 @@ namespace pythonic {
                 return _transpose(a, &t[0]);
             }
 
+        /* transposing a transposed matrix gives back the matrix */
+        template<class T>
+            types::ndarray<T, 2>
+            transpose(types::numpy_texpr<types::ndarray<T, 2>> const& arr) {
+                return arr.arg;
+            }
+
+        /* strided views are transposed without copy */
+        template<class T, size_t N>
+            types::strided_ndarray<T,N> transpose(types::strided_ndarray<T,N> const & a)
+            {
+                return a.transpose();
+            }
+
         NUMPY_EXPR_TO_NDARRAY0(transpose);
         PROXY(pythonic::numpy, transpose);
 
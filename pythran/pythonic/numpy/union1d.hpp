@@ -3,30 +3,24 @@
 
 #include "pythonic/utils/proxy.hpp"
 #include "pythonic/types/ndarray.hpp"
+#include "pythonic/numpy/asarray.hpp"
+#include "pythonic/numpy/unique.hpp"
 
 namespace pythonic {
 
     namespace numpy {
-        template<class I, class O>
-            void _union1d(I begin, I end, O& out, utils::int_<1>)
-            {
-                for(; begin != end; ++begin)
-                    out.insert(*begin);
-            }
-        template<class I, class O, size_t N>
-            void _union1d(I begin, I end, O& out, utils::int_<N>)
-            {
-                for(; begin != end; ++begin)
-                    _union1d((*begin).begin(), (*begin).end(), out, utils::int_<N - 1>());
-            }
+        /* distinct values of both arrays, deduplicated in the array that holds them all */
         template<class E, class F>
             types::ndarray<decltype(std::declval<typename types::numpy_expr_to_ndarray<E>::T>() + std::declval<typename types::numpy_expr_to_ndarray<F>::T>()), 1>
             union1d(E const& e, F const& f)
             {
-                std::set<decltype(std::declval<typename types::numpy_expr_to_ndarray<E>::T>() + std::declval<typename types::numpy_expr_to_ndarray<F>::T>())> res;
-                _union1d(e.begin(), e.end(), res, utils::int_<types::numpy_expr_to_ndarray<E>::N>());
-                _union1d(f.begin(), f.end(), res, utils::int_<types::numpy_expr_to_ndarray<F>::N>());
-                return res;
+                typedef decltype(std::declval<typename types::numpy_expr_to_ndarray<E>::T>() + std::declval<typename types::numpy_expr_to_ndarray<F>::T>()) T;
+                auto ae = asarray(e);
+                auto af = asarray(f);
+                types::ndarray<T, 1> all(types::make_tuple(long(ae.size() + af.size())), __builtin__::None);
+                std::copy(af.buffer, af.buffer + af.size(), std::copy(ae.buffer, ae.buffer + ae.size(), all.buffer));
+                long const count = utils::unique_values(all.buffer, all.size(), all.buffer, nullptr, nullptr);
+                return _truncate(all, count);
             }
 
         PROXY(pythonic::numpy, union1d)
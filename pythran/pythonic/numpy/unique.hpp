@@ -2,81 +2,50 @@
 #define PYTHONIC_NUMPY_UNIQUE_HPP
 
 #include "pythonic/utils/proxy.hpp"
+#include "pythonic/utils/unique.hpp"
 #include "pythonic/types/ndarray.hpp"
 #include "pythonic/types/tuple.hpp"
+#include "pythonic/numpy/asarray.hpp"
+#include "pythonic/__builtin__/None.hpp"
 
 namespace pythonic {
 
     namespace numpy {
-        template<class I, class O>
-            void _unique1(I begin, I end, O& out, utils::int_<1>)
-            {
-                    out.insert(begin, end);
-            }
-        template<class I, class O, size_t N>
-            void _unique1(I begin, I end, O& out, utils::int_<N>)
+
+        /* the first `count' values of `array', in an array of their own */
+        template<class T>
+            types::ndarray<T, 1> _truncate(types::ndarray<T, 1> const& array, long count)
             {
-                for(; begin != end; ++begin)
-                    _unique1((*begin).begin(), (*begin).end(), out, utils::int_<N - 1>());
+                types::ndarray<T, 1> out(types::make_tuple(count), __builtin__::None);
+                std::copy(array.buffer, array.buffer + count, out.buffer);
+                return out;
             }
 
         template<class E>
             types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1> unique(E const& expr) {
-                std::set<typename types::numpy_expr_to_ndarray<E>::T> res;
-                _unique1(expr.begin(), expr.end(), res, utils::int_<types::numpy_expr_to_ndarray<E>::N>());
-                return types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1>(res);
-            }
-
-        template<class I, class O0, class O1>
-            void _unique2(I begin, I end, O0& out0, O1& out1, long & i, utils::int_<1>)
-            {
-                for(; begin != end; ++begin, ++i) {
-                    auto pair = out0.insert(*begin);
-                    if(pair.second)
-                        out1.push_back(i);
-                }
-            }
-        template<class I, class O0, class O1, size_t N>
-            void _unique2(I begin, I end, O0& out0, O1& out1, long & i, utils::int_<N>)
-            {
-                for(; begin != end; ++begin)
-                    _unique2((*begin).begin(), (*begin).end(), out0, out1, i, utils::int_<N - 1>());
+                auto arr = asarray(expr);
+                types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1> values(types::make_tuple(long(arr.size())), __builtin__::None);
+                long const count = utils::unique_values(arr.buffer, arr.size(), values.buffer, nullptr, nullptr);
+                return _truncate(values, count);
             }
 
         template<class E>
             std::tuple<types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1>, types::ndarray<long, 1>> unique(E const& expr, bool return_index) {
-                std::set<typename types::numpy_expr_to_ndarray<E>::T> res;
-                std::vector<long> return_index_res;
-                long i = 0;
-                _unique2(expr.begin(), expr.end(), res, return_index_res, i, utils::int_<types::numpy_expr_to_ndarray<E>::N>());
-                return std::make_tuple(types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1>(res), types::ndarray<long, 1>(return_index_res));
+                auto arr = asarray(expr);
+                types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1> values(types::make_tuple(long(arr.size())), __builtin__::None);
+                types::ndarray<long, 1> index(types::make_tuple(long(arr.size())), __builtin__::None);
+                long const count = utils::unique_values(arr.buffer, arr.size(), values.buffer, index.buffer, nullptr);
+                return std::make_tuple(_truncate(values, count), _truncate(index, count));
             }
 
-
-        template<class I, class O0, class O1, class O2>
-            void _unique3(I begin, I end, O0& out0, O1& out1, O2& out2, long & i, utils::int_<1>)
-            {
-                for(; begin != end; ++begin, ++i) {
-                    auto pair = out0.insert(*begin);
-                    out2[i] = std::distance(out0.begin(), pair.first);
-                    if(pair.second)
-                        out1.push_back(i);
-                }
-            }
-        template<class I, class O0, class O1, class O2, size_t N>
-            void _unique3(I begin, I end, O0& out0, O1& out1, O2& out2, long & i, utils::int_<N>)
-            {
-                for(; begin != end; ++begin)
-                    _unique3((*begin).begin(), (*begin).end(), out0, out1, out2, i, utils::int_<N - 1>());
-            }
         template<class E>
             std::tuple<types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1>, types::ndarray<long, 1>, types::ndarray<long, 1>> unique(E const& expr, bool return_index, bool return_inverse) {
-                std::set<typename types::numpy_expr_to_ndarray<E>::T> res;
-                std::vector<long> return_index_res;
-                types::ndarray<long, 1> return_inverse_res(types::array<long,1>{{expr.size()}}, __builtin__::None);
-                long i = 0;
-                _unique3(expr.begin(), expr.end(), res, return_index_res, return_inverse_res, i, utils::int_<types::numpy_expr_to_ndarray<E>::N>());
-                return std::make_tuple(types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1>(res), types::ndarray<long, 1>(return_index_res), return_inverse_res);
+                auto arr = asarray(expr);
+                types::ndarray<typename types::numpy_expr_to_ndarray<E>::T, 1> values(types::make_tuple(long(arr.size())), __builtin__::None);
+                types::ndarray<long, 1> index(types::make_tuple(long(arr.size())), __builtin__::None);
+                types::ndarray<long, 1> inverse(types::make_tuple(long(arr.size())), __builtin__::None);
+                long const count = utils::unique_values(arr.buffer, arr.size(), values.buffer, index.buffer, inverse.buffer);
+                return std::make_tuple(_truncate(values, count), _truncate(index, count), inverse);
             }
 
         PROXY(pythonic::numpy, unique)
@@ -4,17 +4,20 @@
 #include "pythonic/types/assignable.hpp"
 #include "pythonic/types/empty_iterator.hpp"
 #include "pythonic/types/attr.hpp"
+#include "pythonic/types/exceptions.hpp"
 
 #include "pythonic/utils/nested_container.hpp"
 #include "pythonic/utils/shared_ref.hpp"
 #include "pythonic/utils/reserve.hpp"
 #include "pythonic/utils/int_.hpp"
 #include "pythonic/utils/broadcast_copy.hpp"
+#include "pythonic/utils/vectorize.hpp"
 
 #include "pythonic/types/slice.hpp"
 #include "pythonic/types/tuple.hpp"
 #include "pythonic/types/list.hpp"
 #include "pythonic/types/raw_array.hpp"
+#include "pythonic/types/vectorizable.hpp"
 
 #include "pythonic/types/numexpr_to_ndarray.hpp"
 #include "pythonic/types/numpy_fexpr.hpp"
@@ -23,6 +26,7 @@
 #include "pythonic/types/numpy_texpr.hpp"
 #include "pythonic/types/numpy_iexpr.hpp"
 #include "pythonic/types/numpy_gexpr.hpp"
+#include "pythonic/types/strided_ndarray.hpp"
 
 #include "pythonic/__builtin__/len.hpp"
 
@@ -75,6 +79,10 @@ namespace pythonic {
                 T fast(long ) const {
                     return __value;
                 }
+                template<class V>
+                    V load(long ) const {
+                        return utils::splat<V>(__value);
+                    }
                 long size() const { return 0; }
             };
 
@@ -250,9 +258,17 @@ namespace pythonic {
 
                 /* from a  numpy expression */
                 template<class E>
-                    void initialize_from_expr(E const & expr) {
+                    void initialize_from_expr(E const & expr, std::false_type) {
                         std::copy(expr.begin(), expr.end(), begin());
                     }
+                template<class E>
+                    void initialize_from_expr(E const & expr, std::true_type) {
+                        utils::vectorize(buffer, expr, size());
+                    }
+                template<class E>
+                    void initialize_from_expr(E const & expr) {
+                        initialize_from_expr(expr, std::integral_constant<bool, is_vectorizable<E>::value>());
+                    }
 
                 template<class Op, class Arg0, class Arg1>
                     ndarray(numpy_expr<Op, Arg0, Arg1> const & expr) :
@@ -272,6 +288,15 @@ namespace pythonic {
                     initialize_from_expr(expr);
                 }
 
+                template<class Tp>
+                    ndarray(numpy_texpr<ndarray<Tp, 2>> const & expr) :
+                        mem(expr.size()),
+                        buffer(mem->data),
+                        shape(expr.shape)
+                {
+                    transpose_copy(expr.arg.buffer, expr.arg.shape[0], expr.arg.shape[1], buffer);
+                }
+
                 template<class Op, class Arg>
                     ndarray(numpy_uexpr<Op, Arg> const & expr) :
                         mem(expr.size()),
@@ -308,6 +333,51 @@ namespace pythonic {
                     initialize_from_expr(expr);
                 }
 
+                ndarray(strided_ndarray<T, N> const & view) :
+                    mem(view.size()),
+                    buffer(mem->data),
+                    shape(view.shape)
+                {
+                    view.copy_to(buffer);
+                }
+
+                /* in-place update
+                 *
+                 * As in numpy, the result is evaluated into the existing
+                 * buffer, so that every array sharing it sees the update, and
+                 * an operand that would change the shape of the array fails.
+                 */
+                template<class E>
+                    bool keeps_shape(E const&, utils::int_<0>) const {
+                        return true;
+                    }
+                template<class E, size_t M>
+                    bool keeps_shape(E const& expr, utils::int_<M>) const {
+                        return M <= N and std::equal(expr.shape.begin(), expr.shape.end(), shape.begin() + (N - M));
+                    }
+                template<class E, class F>
+                    ndarray& update_from_expr(E const& expr, F const& result) {
+                        if(not keeps_shape(expr, utils::int_<utils::dim_of<E>::value>()))
+                            throw ValueError("non-broadcastable output operand");
+                        return utils::broadcast_copy(*this, result, utils::int_<0>());
+                    }
+                template<class E>
+                    ndarray& operator+=(E const& expr) {
+                        return update_from_expr(expr, *this + expr);
+                    }
+                template<class E>
+                    ndarray& operator-=(E const& expr) {
+                        return update_from_expr(expr, *this - expr);
+                    }
+                template<class E>
+                    ndarray& operator*=(E const& expr) {
+                        return update_from_expr(expr, *this * expr);
+                    }
+                template<class E>
+                    ndarray& operator/=(E const& expr) {
+                        return update_from_expr(expr, *this / expr);
+                    }
+
                 /* element indexing */
                 auto fast(long i) const -> decltype(type_helper<ndarray<T,N>>::get(*this, i))
                 {
@@ -319,6 +389,12 @@ namespace pythonic {
                     if(i<0) i += shape[0];
                     return fast(i);
                 }
+                /* flat indexing, one value or one SIMD pack at a time */
+                template<class V>
+                    V load(long i) const
+                    {
+                        return utils::load<V>(buffer + i);
+                    }
                 auto operator()(long i) const -> decltype((*this)[i])
                 {
                     return (*this)[i];
@@ -458,6 +534,10 @@ namespace pythonic {
             struct is_array<numpy_texpr<A>> {
                 static constexpr bool value = true;
             };
+        template<class T, size_t N>
+            struct is_array<strided_ndarray<T,N>> {
+                static constexpr bool value = true;
+            };
         template<class O, class A0, class A1>
             struct is_array<numpy_expr<O,A0,A1>> {
                 static constexpr bool value = true;
@@ -547,6 +627,18 @@ namespace pythonic {
                     return t.shape[0];
                 }
             };
+        template <class Arg, class I>
+            struct _len<types::numpy_texpr<Arg>, I, true> {
+                long operator()(types::numpy_texpr<Arg> const &t) {
+                    return t.shape[0];
+                }
+            };
+        template <class T, size_t N, class I>
+            struct _len<types::strided_ndarray<T,N>, I, true> {
+                long operator()(types::strided_ndarray<T,N> const &t) {
+                    return t.shape[0];
+                }
+            };
 
     }
 
@@ -583,6 +675,14 @@ namespace std {
         struct tuple_element<I, pythonic::types::numpy_iexpr<E> > {
             typedef decltype(std::declval<pythonic::types::numpy_iexpr<E>>()[0]) type;
         };
+    template <size_t I, class Arg>
+        struct tuple_element<I, pythonic::types::numpy_texpr<Arg> > {
+            typedef typename pythonic::types::numpy_texpr<Arg>::value_type type;
+        };
+    template <size_t I, class T, size_t N>
+        struct tuple_element<I, pythonic::types::strided_ndarray<T,N> > {
+            typedef typename pythonic::types::strided_ndarray<T,N>::value_type type;
+        };
 
 }
 
@@ -628,6 +728,14 @@ namespace pythonic {
             template<class E> struct getattr<attr::T, E> {
                 auto operator()(E const& a) -> decltype(numpy::transpose(a)) { return numpy::transpose(a); }
             };
+            template<class T, size_t N> struct getattr<attr::STRIDES, strided_ndarray<T,N>> {
+                array<long, N> operator()(strided_ndarray<T,N> const& a) {
+                    array<long, N> strides;
+                    std::transform(a.strides.begin(), a.strides.end(), strides.begin(),
+                                   [](long stride) { return stride * long(sizeof(T)); });
+                    return strides;
+                }
+            };
         }
     }
     namespace __builtin__ {
@@ -679,6 +787,13 @@ namespace pythonic {
                 return types::__ndarray::getattr<I,types::numpy_uexpr<O,A>>()(f);
             }
 
+        template<int I, class T, size_t N>
+            auto getattr(types::strided_ndarray<T,N> const& f)
+            -> decltype(types::__ndarray::getattr<I,types::strided_ndarray<T,N>>()(f))
+            {
+                return types::__ndarray::getattr<I,types::strided_ndarray<T,N>>()(f);
+            }
+
     }
 }
 
@@ -801,14 +916,107 @@ namespace pythonic {
             }
             //reinterpret_cast needed to fit BOOST Python API. Check is done by template and PyArray_Check
             static void* convertible(PyObject* obj_ptr){
-                if(!PyArray_Check(obj_ptr) or PyArray_TYPE(reinterpret_cast<PyArrayObject*>(obj_ptr)) != c_type_to_numpy_type<T>::value )
+                if(!PyArray_Check(obj_ptr) or PyArray_TYPE(reinterpret_cast<PyArrayObject*>(obj_ptr)) != c_type_to_numpy_type<T>::value
+                   or PyArray_NDIM(reinterpret_cast<PyArrayObject*>(obj_ptr)) != N)
                     return 0;
                 return obj_ptr;
             }
 
+            /* contiguous arrays are shared, other ones are copied into contiguous storage */
             static void construct(PyObject* obj_ptr, boost::python::converter::rvalue_from_python_stage1_data* data){
                 void* storage=((boost::python::converter::rvalue_from_python_storage<types::ndarray<T,N>>*)(data))->storage.bytes;
-                new (storage) types::ndarray< T, N>((T*)PyArray_BYTES(reinterpret_cast<PyArrayObject*>(obj_ptr)), PyArray_DIMS(reinterpret_cast<PyArrayObject*>(obj_ptr)), types::foreign());
+                PyArrayObject* arr = reinterpret_cast<PyArrayObject*>(obj_ptr);
+                if(PyArray_IS_C_CONTIGUOUS(arr)) {
+                    new (storage) types::ndarray< T, N>((T*)PyArray_BYTES(arr), PyArray_DIMS(arr), types::foreign());
+                    Py_INCREF(obj_ptr);
+                }
+                else {
+                    types::array<long, N> shape;
+                    std::copy(PyArray_DIMS(arr), PyArray_DIMS(arr) + N, shape.begin());
+                    types::ndarray< T, N>* copy = new (storage) types::ndarray< T, N>(shape, types::none_type());
+                    PyObject* dest = PyArray_SimpleNewFromData(N, copy->shape.data(), c_type_to_numpy_type<T>::value, copy->buffer);
+                    PyArray_CopyInto(reinterpret_cast<PyArrayObject*>(dest), arr);
+                    Py_DECREF(dest);
+                }
+                data->convertible=storage;
+            }
+        };
+
+    /* matrices in Fortran order are the transposes of matrices in C order: they
+     * are shared as such, other matrices are copied into Fortran order
+     */
+    template<typename T>
+        struct python_to_pythran< types::numpy_texpr<types::ndarray<T, 2>> >{
+            python_to_pythran(){
+                static bool registered=false;
+                python_to_pythran<T>();
+                if(not registered) {
+                    registered=true;
+                    boost::python::converter::registry::push_back(&convertible,&construct,boost::python::type_id< types::numpy_texpr<types::ndarray<T, 2>> >());
+                }
+            }
+            static void* convertible(PyObject* obj_ptr){
+                if(!PyArray_Check(obj_ptr) or PyArray_TYPE(reinterpret_cast<PyArrayObject*>(obj_ptr)) != c_type_to_numpy_type<T>::value
+                   or PyArray_NDIM(reinterpret_cast<PyArrayObject*>(obj_ptr)) != 2)
+                    return 0;
+                return obj_ptr;
+            }
+
+            static void construct(PyObject* obj_ptr, boost::python::converter::rvalue_from_python_stage1_data* data){
+                void* storage=((boost::python::converter::rvalue_from_python_storage<types::numpy_texpr<types::ndarray<T,2>>>*)(data))->storage.bytes;
+                PyArrayObject* arr = reinterpret_cast<PyArrayObject*>(obj_ptr);
+                long shape[2] = {PyArray_DIMS(arr)[1], PyArray_DIMS(arr)[0]};
+                if(PyArray_IS_F_CONTIGUOUS(arr)) {
+                    new (storage) types::numpy_texpr<types::ndarray<T,2>>(types::ndarray<T,2>((T*)PyArray_BYTES(arr), shape, types::foreign()));
+                    Py_INCREF(obj_ptr);
+                }
+                else {
+                    types::ndarray<T,2> copy(types::array<long, 2>{{shape[0], shape[1]}}, types::none_type());
+                    PyObject* dest = PyArray_SimpleNewFromData(2, copy.shape.data(), c_type_to_numpy_type<T>::value, copy.buffer);
+                    PyObject* dest_t = PyArray_Transpose(reinterpret_cast<PyArrayObject*>(dest), nullptr);
+                    PyArray_CopyInto(reinterpret_cast<PyArrayObject*>(dest_t), arr);
+                    Py_DECREF(dest_t);
+                    Py_DECREF(dest);
+                    new (storage) types::numpy_texpr<types::ndarray<T,2>>(copy);
+                }
+                data->convertible=storage;
+            }
+        };
+
+    /* NumPy arrays of any layout are viewed without copy, provided their
+     * strides are multiples of the size of their values
+     */
+    template<typename T, size_t N>
+        struct python_to_pythran< types::strided_ndarray<T, N> >{
+            python_to_pythran(){
+                static bool registered=false;
+                python_to_pythran<T>();
+                if(not registered) {
+                    registered=true;
+                    boost::python::converter::registry::push_back(&convertible,&construct,boost::python::type_id< types::strided_ndarray<T, N> >());
+                }
+            }
+            static void* convertible(PyObject* obj_ptr){
+                if(!PyArray_Check(obj_ptr))
+                    return 0;
+                PyArrayObject* arr = reinterpret_cast<PyArrayObject*>(obj_ptr);
+                if(PyArray_TYPE(arr) != c_type_to_numpy_type<T>::value or PyArray_NDIM(arr) != N or not PyArray_ISALIGNED(arr))
+                    return 0;
+                for(size_t i = 0; i < N; ++i)
+                    if(PyArray_STRIDES(arr)[i] % long(sizeof(T)))
+                        return 0;
+                return obj_ptr;
+            }
+
+            static void construct(PyObject* obj_ptr, boost::python::converter::rvalue_from_python_stage1_data* data){
+                void* storage=((boost::python::converter::rvalue_from_python_storage<types::strided_ndarray<T,N>>*)(data))->storage.bytes;
+                PyArrayObject* arr = reinterpret_cast<PyArrayObject*>(obj_ptr);
+                types::array<long, N> shape, strides;
+                for(size_t i = 0; i < N; ++i) {
+                    shape[i] = PyArray_DIMS(arr)[i];
+                    strides[i] = PyArray_STRIDES(arr)[i] / long(sizeof(T));
+                }
+                new (storage) types::strided_ndarray< T, N>((T*)PyArray_BYTES(arr), shape, strides);
                 Py_INCREF(obj_ptr);
                 data->convertible=storage;
             }
@@ -863,6 +1071,30 @@ namespace pythonic {
                 register_once< types::numpy_gexpr<Arg, S...>, custom_expr_to_ndarray<types::numpy_gexpr<Arg, S...>> >();
             }
         };
+    /* transposed matrices are returned without copy, in Fortran order */
+    template<class T>
+        struct custom_texpr_to_ndarray {
+            static PyObject* convert( types::numpy_texpr<types::ndarray<T,2>> n) {
+                PyObject* result = custom_array_to_ndarray<T,2>::convert(n.arg);
+                if (!result)
+                    return nullptr;
+                PyObject* transposed = PyArray_Transpose(reinterpret_cast<PyArrayObject*>(result), nullptr);
+                Py_DECREF(result);
+                return transposed;
+            }
+        };
+    template<class T>
+        struct pythran_to_python< types::numpy_texpr<types::ndarray<T,2>> > {
+            pythran_to_python() {
+                register_once< types::numpy_texpr<types::ndarray<T,2>>, custom_texpr_to_ndarray<T> >();
+            }
+        };
+    template<class T, size_t N>
+        struct pythran_to_python< types::strided_ndarray<T,N> > {
+            pythran_to_python() {
+                register_once< types::strided_ndarray<T,N>, custom_expr_to_ndarray<types::strided_ndarray<T,N>> >();
+            }
+        };
 }
 
 #endif
@@ -56,6 +56,11 @@ namespace pythonic {
                     if(i<0) i += shape[0];
                     return fast(i);
                 }
+                /* flat indexing, only valid if is_vectorizable<numpy_expr> */
+                template<class V>
+                    auto load(long i) const -> decltype(Op()(arg0.template load<V>(i), arg1.template load<V>(i))) {
+                        return Op()(arg0.template load<V>(i), arg1.template load<V>(i));
+                    }
 
                 template<class... S>
                 numpy_expr<Op, numpy_gexpr<Arg0, contiguous_slice, S...>, numpy_gexpr<Arg1, contiguous_slice, S...>>
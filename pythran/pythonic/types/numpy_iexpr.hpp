@@ -3,6 +3,7 @@
 
 #include "pythonic/types/nditerator.hpp"
 #include "pythonic/types/tuple.hpp"
+#include "pythonic/utils/vectorize.hpp"
 
 namespace pythonic {
 
@@ -110,6 +111,11 @@ namespace pythonic {
                     if(i<0) i += shape[0];
                     return fast(i);
                 }
+                /* flat indexing, one value or one SIMD pack at a time */
+                template<class V>
+                    V load(long i) const {
+                        return utils::load<V>(buffer + i);
+                    }
                 auto operator()(long i) const -> decltype((*this)[i]) {
                     return (*this)[i];
                 }
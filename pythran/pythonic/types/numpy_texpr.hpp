@@ -5,6 +5,24 @@ namespace pythonic {
     namespace types {
         template<class T, size_t N>
             struct ndarray;
+
+        /* copy of the `rows' x `cols' row-major matrix `src' into `dst' as a
+         * `cols' x `rows' row-major matrix, by square tiles so that both sides
+         * are walked through cache lines rather than strides
+         */
+        static const long transpose_tile = 32;
+        template<class T, class F>
+            void transpose_copy(T const* src, long rows, long cols, F* dst)
+            {
+                for(long i0 = 0; i0 < rows; i0 += transpose_tile)
+                    for(long j0 = 0; j0 < cols; j0 += transpose_tile) {
+                        long const i1 = std::min(rows, i0 + transpose_tile), j1 = std::min(cols, j0 + transpose_tile);
+                        for(long j = j0; j < j1; ++j)
+                            for(long i = i0; i < i1; ++i)
+                                dst[j * rows + i] = src[i * cols + j];
+                    }
+            }
+
         template<class Arg, class... S>
             struct numpy_gexpr;
         template<class Arg, class F>
@@ -75,6 +93,25 @@ namespace pythonic {
                     return (*this)[i];
                 }
 
+                /* element indexing, through the transposed indices */
+                T const& operator[](array<long, 2> const& indices) const {
+                    return arg[array<long, 2>{{indices[1], indices[0]}}];
+                }
+                T& operator[](array<long, 2> const& indices) {
+                    return arg[array<long, 2>{{indices[1], indices[0]}}];
+                }
+
+                /* a row or a column of the matrix, possibly sliced */
+                template<class S>
+                    auto operator()(long i, S const& s) const -> decltype(this->fast(i)[s]) {
+                        if(i<0) i += shape[0];
+                        return fast(i)[s];
+                    }
+                template<class S>
+                    auto operator()(S const& s, long j) const -> decltype(this->arg[j][s]) {
+                        return arg[j][s];
+                    }
+
                 long size() const {
                     return arg.size();
                 }
@@ -96,5 +133,37 @@ namespace pythonic {
 
 }
 
+/* type inference stuff  {*/
+#include "pythonic/types/combined.hpp"
+template<class Arg>
+struct __combined<pythonic::types::numpy_texpr<Arg>, pythonic::types::numpy_texpr<Arg>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+template<class Arg, class K>
+struct __combined<pythonic::types::numpy_texpr<Arg>, indexable<K>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+template<class Arg, class K>
+struct __combined<indexable<K>, pythonic::types::numpy_texpr<Arg>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+template<class Arg, class V>
+struct __combined<pythonic::types::numpy_texpr<Arg>, container<V>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+template<class Arg, class V>
+struct __combined<container<V>, pythonic::types::numpy_texpr<Arg>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+template<class Arg, class K, class V>
+struct __combined<pythonic::types::numpy_texpr<Arg>, indexable_container<K,V>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+template<class Arg, class K, class V>
+struct __combined<indexable_container<K,V>, pythonic::types::numpy_texpr<Arg>> {
+    typedef pythonic::types::numpy_texpr<Arg> type;
+};
+/* } */
+
 #endif
 
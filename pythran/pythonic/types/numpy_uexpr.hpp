@@ -32,6 +32,11 @@ namespace pythonic {
                     if(i<0) i += shape[0];
                     return fast(i);
                 }
+                /* flat indexing, only valid if is_vectorizable<numpy_uexpr> */
+                template<class V>
+                    auto load(long i) const -> decltype(Op()(arg.template load<V>(i))) {
+                        return Op()(arg.template load<V>(i));
+                    }
                 template<class F>
                     typename std::enable_if<is_numexpr_arg<F>::value, numpy_fexpr<numpy_uexpr, F>>::type
                     operator[](F const& filter) const {
@@ -1,29 +1,52 @@
 #ifndef PYTHONIC_TYPES_RAW_ARRAY_HPP
 #define PYTHONIC_TYPES_RAW_ARRAY_HPP
 
+#include "pythonic/utils/allocator.hpp"
+
+#include <new>
+#include <type_traits>
+
 namespace pythonic {
 
     namespace types {
         /* Wrapper class to store an array pointer
          *
          * for internal use only, meant to be stored in a shared_ptr
+         *
+         * Arrays of a given size get their memory from `Allocator', while a
+         * pointer given to the constructor is owned as memory allocated with new[]
          */
-        template<class T>
+        template<class T, class Allocator = utils::default_allocator<T>>
             class raw_array {
-                raw_array(raw_array<T> const& ) = delete;
+                raw_array(raw_array const& ) = delete;
+
+                size_t n;       // number of values allocated by Allocator
+                bool adopted;   // whether data comes from new[] rather than Allocator
 
                 public:
                 typedef T* pointer_type;
 
                 T* data;
-                raw_array() : data(nullptr) {}
-                raw_array(size_t n) : data(new T[n]) {}
-                raw_array(T* d) : data(d) {}
-                raw_array(raw_array<T>&& d) : data(d.data) { d.data = nullptr; }
+                raw_array() : n(0), adopted(true), data(nullptr) {}
+                raw_array(size_t n) : n(n), adopted(false), data(Allocator().allocate(n)) {
+                    if(not std::is_pod<T>::value)
+                        for(size_t i = 0; i < n; ++i)
+                            new (data + i) T();
+                }
+                raw_array(T* d) : n(0), adopted(true), data(d) {}
+                raw_array(raw_array&& d) : n(d.n), adopted(d.adopted), data(d.data) { d.data = nullptr; }
 
                 ~raw_array() {
-                    if(data)
+                    if(not data)
+                        return;
+                    if(adopted)
                         delete [] data;
+                    else {
+                        if(not std::is_pod<T>::value)
+                            for(size_t i = 0; i < n; ++i)
+                                data[i].~T();
+                        Allocator().deallocate(data, n);
+                    }
                 }
             };
 
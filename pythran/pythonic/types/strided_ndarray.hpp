@@ -0,0 +1,309 @@
+#ifndef PYTHONIC_TYPES_STRIDED_NDARRAY_HPP
+#define PYTHONIC_TYPES_STRIDED_NDARRAY_HPP
+
+namespace pythonic {
+
+    namespace types {
+
+        template<class T, size_t N>
+            struct ndarray;
+        template<class T, size_t N>
+            struct strided_ndarray;
+
+        /* Helper for dimension-specific part of strided_ndarray */
+        template<class T, size_t N>
+            struct strided_helper {
+                typedef strided_ndarray<T, N - 1> type;
+                static type get(strided_ndarray<T, N> const& self, long i) {
+                    type other;
+                    other.buffer = self.buffer + i * self.strides[0];
+                    std::copy(self.shape.begin() + 1, self.shape.end(), other.shape.begin());
+                    std::copy(self.strides.begin() + 1, self.strides.end(), other.strides.begin());
+                    return other;
+                }
+            };
+        template<class T>
+            struct strided_helper<T, 1> {
+                typedef T type;
+                static T& get(strided_ndarray<T, 1> const& self, long i) {
+                    return self.buffer[i * self.strides[0]];
+                }
+            };
+
+        /* View over values laid out with any stride along each dimension
+         *
+         * Such views come from NumPy arrays that were sliced or transposed, and
+         * are used in place of them without copy. Strides are counted in values,
+         * and may be negative. The view does not own its values.
+         */
+        template<class T, size_t N>
+            struct strided_ndarray {
+
+                /* types */
+                static constexpr size_t value = N;
+                typedef T dtype;
+                typedef typename strided_helper<T, N>::type value_type;
+
+                typedef nditerator<strided_ndarray> iterator;
+                typedef const_nditerator<strided_ndarray> const_iterator;
+
+                /* members */
+                T* buffer;                  // first value of the view
+                array<long, N> shape;       // number of values along each dimension
+                array<long, N> strides;     // distance between two consecutive values along each dimension
+
+                /* constructors */
+                strided_ndarray() : buffer(nullptr), shape(), strides() {}
+                strided_ndarray(strided_ndarray const&) = default;
+                strided_ndarray(strided_ndarray &&) = default;
+
+                strided_ndarray(T* buffer, array<long, N> const& shape, array<long, N> const& strides) :
+                    buffer(buffer), shape(shape), strides(strides)
+                {
+                }
+
+                /* view over all the values of a contiguous array */
+                strided_ndarray(ndarray<T, N> const& array) : buffer(array.buffer), shape(array.shape)
+                {
+                    long stride = 1;
+                    for(long i = N - 1; i >= 0; --i) {
+                        strides[i] = stride;
+                        stride *= shape[i];
+                    }
+                }
+
+                /* assignment */
+                template<class E>
+                    strided_ndarray& operator=(E const& expr) {
+                        return utils::broadcast_copy(*this, expr, utils::int_<value - utils::dim_of<E>::value>());
+                    }
+                strided_ndarray& operator=(strided_ndarray const& expr) {
+                    return utils::broadcast_copy(*this, expr, utils::int_<0>());
+                }
+                template<class E>
+                    strided_ndarray& operator+=(E const& expr) {
+                        return (*this) = (*this) + expr;
+                    }
+                template<class E>
+                    strided_ndarray& operator-=(E const& expr) {
+                        return (*this) = (*this) - expr;
+                    }
+                template<class E>
+                    strided_ndarray& operator*=(E const& expr) {
+                        return (*this) = (*this) * expr;
+                    }
+                template<class E>
+                    strided_ndarray& operator/=(E const& expr) {
+                        return (*this) = (*this) / expr;
+                    }
+
+                /* element indexing */
+                auto fast(long i) const -> decltype(strided_helper<T, N>::get(*this, i))
+                {
+                    return strided_helper<T, N>::get(*this, i);
+                }
+                auto operator[](long i) const -> decltype(this->fast(i))
+                {
+                    if(i < 0) i += shape[0];
+                    return fast(i);
+                }
+                auto operator()(long i) const -> decltype((*this)[i])
+                {
+                    return (*this)[i];
+                }
+                T& operator[](array<long, N> const& indices) const
+                {
+                    long offset = 0;
+                    for(size_t i = 0; i < N; ++i)
+                        offset += (indices[i] < 0 ? indices[i] + shape[i] : indices[i]) * strides[i];
+                    return buffer[offset];
+                }
+
+                /* slice indexing, which yields another view */
+                strided_ndarray operator[](slice const& s) const
+                {
+                    strided_ndarray other(*this);
+                    other.slice_axis(0, s.normalize(shape[0]));
+                    return other;
+                }
+                strided_ndarray operator[](contiguous_slice const& s) const
+                {
+                    strided_ndarray other(*this);
+                    other.slice_axis(0, s.normalize(shape[0]));
+                    return other;
+                }
+
+                /* extended slice indexing */
+                template<class... S>
+                    strided_ndarray<T, N - count_long<S...>::value> operator()(slice const& s0, S const&... s) const
+                    {
+                        return (*this)[s0].template select<1>(s...);
+                    }
+                template<class... S>
+                    strided_ndarray<T, N - count_long<S...>::value> operator()(contiguous_slice const& s0, S const&... s) const
+                    {
+                        return (*this)[s0].template select<1>(s...);
+                    }
+                template<class... S>
+                    auto operator()(long s0, S const&... s) const -> decltype((*this)[s0](s...))
+                    {
+                        return (*this)[s0](s...);
+                    }
+
+                /* view restricted to the slice or index `s' along the axis I */
+                template<size_t I>
+                    strided_ndarray slice_or_index(slice const& s) const
+                    {
+                        strided_ndarray other(*this);
+                        other.slice_axis(I, s.normalize(shape[I]));
+                        return other;
+                    }
+                template<size_t I>
+                    strided_ndarray slice_or_index(contiguous_slice const& s) const
+                    {
+                        strided_ndarray other(*this);
+                        other.slice_axis(I, s.normalize(shape[I]));
+                        return other;
+                    }
+                template<size_t I>
+                    strided_ndarray<T, N - 1> slice_or_index(long i) const
+                    {
+                        strided_ndarray<T, N - 1> other;
+                        other.buffer = buffer + (i < 0 ? i + shape[I] : i) * strides[I];
+                        for(size_t j = 0, k = 0; j < N; ++j)
+                            if(j != I) {
+                                other.shape[k] = shape[j];
+                                other.strides[k++] = strides[j];
+                            }
+                        return other;
+                    }
+                template<class S>
+                    void slice_axis(size_t axis, S const& ns)
+                    {
+                        buffer += ns.lower * strides[axis];
+                        shape[axis] = ns.size();
+                        strides[axis] *= ns.step;
+                    }
+
+                /* view restricted to the slices or indices `s' along the axes from I */
+                template<size_t I>
+                    strided_ndarray select() const
+                    {
+                        return *this;
+                    }
+                template<size_t I, class S0, class... S>
+                    auto select(S0 const& s0, S const&... s) const
+                    -> decltype(this->template slice_or_index<I>(s0).template select<I + 1 - count_long<S0>::value>(s...))
+                    {
+                        return slice_or_index<I>(s0).template select<I + 1 - count_long<S0>::value>(s...);
+                    }
+
+                /* through iterators */
+                iterator begin() { return iterator(*this, 0); }
+                const_iterator begin() const { return const_iterator(*this, 0); }
+                iterator end() { return iterator(*this, shape[0]); }
+                const_iterator end() const { return const_iterator(*this, shape[0]); }
+
+                /* member functions */
+                long size() const { return std::accumulate(shape.begin(), shape.end(), 1L, std::multiplies<long>()); }
+
+                /* whether the values are laid out as in a contiguous array of the
+                 * same shape, extents of one allowing any stride as in NumPy
+                 */
+                bool is_contiguous() const
+                {
+                    long stride = 1;
+                    for(long i = N - 1; i >= 0; --i) {
+                        if(shape[i] != 1 and strides[i] != stride)
+                            return false;
+                        stride *= shape[i];
+                    }
+                    return true;
+                }
+
+                /* the viewed values as an array, without copy: only valid if is_contiguous() */
+                ndarray<T, N> contiguous() const
+                {
+                    array<long, N> extents = shape;
+                    ndarray<T, N> out(buffer, extents.data());
+                    out.mem.external(); // the values belong to the viewed array
+                    return out;
+                }
+
+                /* copy of the viewed values into the contiguous storage `out' */
+                void copy_to(T* out) const
+                {
+                    copy_to(out, utils::int_<N>());
+                }
+                void copy_to(T* out, utils::int_<1>) const
+                {
+                    long const stride = strides[0];
+                    for(long i = 0; i < shape[0]; ++i)
+                        out[i] = buffer[i * stride];
+                }
+                template<size_t M>
+                    void copy_to(T* out, utils::int_<M>) const
+                    {
+                        long const inner = size() / std::max(shape[0], 1L);
+                        for(long i = 0; i < shape[0]; ++i)
+                            fast(i).copy_to(out + i * inner);
+                    }
+
+                /* view with reversed axes */
+                strided_ndarray transpose() const
+                {
+                    strided_ndarray other;
+                    other.buffer = buffer;
+                    std::reverse_copy(shape.begin(), shape.end(), other.shape.begin());
+                    std::reverse_copy(strides.begin(), strides.end(), other.strides.begin());
+                    return other;
+                }
+            };
+    }
+
+    template<class T, size_t N>
+        struct assignable<types::strided_ndarray<T, N>>
+        {
+            typedef types::strided_ndarray<T, N> type;
+        };
+    template<class T, size_t N>
+        struct lazy<types::strided_ndarray<T, N>>
+        {
+            typedef types::strided_ndarray<T, N> type;
+        };
+
+}
+
+/* type inference stuff  {*/
+#include "pythonic/types/combined.hpp"
+template<class T, size_t N>
+struct __combined<pythonic::types::strided_ndarray<T,N>, pythonic::types::strided_ndarray<T,N>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+template<class T, size_t N, class K>
+struct __combined<pythonic::types::strided_ndarray<T,N>, indexable<K>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+template<class T, size_t N, class K>
+struct __combined<indexable<K>, pythonic::types::strided_ndarray<T,N>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+template<class T, size_t N, class V>
+struct __combined<pythonic::types::strided_ndarray<T,N>, container<V>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+template<class T, size_t N, class V>
+struct __combined<container<V>, pythonic::types::strided_ndarray<T,N>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+template<class T, size_t N, class K, class V>
+struct __combined<pythonic::types::strided_ndarray<T,N>, indexable_container<K,V>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+template<class T, size_t N, class K, class V>
+struct __combined<indexable_container<K,V>, pythonic::types::strided_ndarray<T,N>> {
+    typedef pythonic::types::strided_ndarray<T,N> type;
+};
+/* } */
+
+#endif
@@ -0,0 +1,93 @@
+#ifndef PYTHONIC_TYPES_VECTORIZABLE_HPP
+#define PYTHONIC_TYPES_VECTORIZABLE_HPP
+
+#include <type_traits>
+
+namespace pythonic {
+
+    namespace types {
+
+        template<class T, size_t N>
+            struct ndarray;
+        template<class T>
+            struct broadcast;
+        template<class Arg>
+            struct numpy_iexpr;
+        template<class Op, class Arg0, class Arg1>
+            struct numpy_expr;
+        template<class Op, class Arg>
+            struct numpy_uexpr;
+
+        /* Tells whether values of type T can be loaded into SIMD packs
+         */
+        template<class T>
+            struct is_vectorizable_dtype {
+                static const bool value = std::is_arithmetic<T>::value and not std::is_same<T, bool>::value;
+            };
+
+        /* Tells whether an expression can be evaluated along the flat buffer of its result,
+         * one value or one SIMD pack at a time, through its `load' method.
+         *
+         * This holds for contiguous arrays of numbers, for broadcast scalars, and for
+         * numpy expressions whose arrays hold values of the same type as their result and have
+         * as many dimensions as their result: only scalars are broadcast, so that all the arrays
+         * share the same shape and the same flat indices.
+         */
+        template<class E>
+            struct is_vectorizable {
+                static const bool value = false;
+            };
+        template<class E>
+            struct is_vectorizable<E const> : is_vectorizable<E> {
+            };
+        template<class E>
+            struct is_vectorizable<E &> : is_vectorizable<E> {
+            };
+
+        template<class T, size_t N>
+            struct is_vectorizable<ndarray<T, N>> {
+                static const bool value = is_vectorizable_dtype<T>::value;
+            };
+        template<class T>
+            struct is_vectorizable<broadcast<T>> {
+                static const bool value = is_vectorizable_dtype<T>::value;
+            };
+        template<class Arg>
+            struct is_vectorizable<numpy_iexpr<Arg>> {
+                static const bool value = is_vectorizable_dtype<typename numpy_iexpr<Arg>::dtype>::value;
+            };
+
+        /* operand E of an expression of dtype T with N dimensions */
+        template<bool vectorizable, class E, class T, size_t N>
+            struct is_vectorizable_operand_helper {
+                static const bool value = false;
+            };
+        template<class E, class T, size_t N>
+            struct is_vectorizable_operand_helper<true, E, T, N> {
+                static const bool value = E::value == 0 or (E::value == N and std::is_same<typename E::dtype, T>::value);
+            };
+        template<class E, class T, size_t N>
+            struct is_vectorizable_operand {
+                typedef typename std::remove_cv<typename std::remove_reference<E>::type>::type type;
+                static const bool value = is_vectorizable_operand_helper<is_vectorizable<type>::value, type, T, N>::value;
+            };
+
+        template<class Op, class Arg0, class Arg1>
+            struct is_vectorizable<numpy_expr<Op, Arg0, Arg1>> {
+                typedef numpy_expr<Op, Arg0, Arg1> type;
+                static const bool value = is_vectorizable_dtype<typename type::dtype>::value
+                    and is_vectorizable_operand<Arg0, typename type::dtype, type::value>::value
+                    and is_vectorizable_operand<Arg1, typename type::dtype, type::value>::value;
+            };
+        template<class Op, class Arg>
+            struct is_vectorizable<numpy_uexpr<Op, Arg>> {
+                typedef numpy_uexpr<Op, Arg> type;
+                static const bool value = is_vectorizable_dtype<typename type::dtype>::value
+                    and is_vectorizable_operand<Arg, typename type::dtype, type::value>::value;
+            };
+
+    }
+
+}
+
+#endif
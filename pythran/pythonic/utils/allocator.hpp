@@ -0,0 +1,209 @@
+#ifndef PYTHONIC_UTILS_ALLOCATOR_HPP
+#define PYTHONIC_UTILS_ALLOCATOR_HPP
+
+#include "pythonic/utils/shared_ref.hpp"
+
+#include <cstdint>
+#include <cstdlib>
+#include <new>
+
+#ifndef PYTHONIC_ALLOCATOR
+#define PYTHONIC_ALLOCATOR pool_allocator
+#endif
+
+#ifndef PYTHONIC_POOL_SIZE
+#define PYTHONIC_POOL_SIZE (256L << 20)
+#endif
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* Counters describing the memory handed out by the allocators below,
+         * for all threads
+         */
+        struct allocation_stats {
+            size_t allocations;     // number of buffers requested
+            size_t reuses;          // number of requests served by a pool
+            size_t deallocations;   // number of buffers given back
+            size_t bytes_in_use;    // bytes held by live buffers
+            size_t bytes_pooled;    // bytes held by the pools, ready for reuse
+        };
+
+        struct allocation_counters {
+            atomic_size_t allocations, reuses, deallocations, bytes_in_use, bytes_pooled;
+            allocation_counters() : allocations(0), reuses(0), deallocations(0), bytes_in_use(0), bytes_pooled(0) {}
+        };
+
+        inline allocation_counters& allocation_counters_instance() {
+            static allocation_counters counters;
+            return counters;
+        }
+
+        /* Snapshot of the allocation counters */
+        inline allocation_stats allocator_stats() {
+            allocation_counters const& counters = allocation_counters_instance();
+            return allocation_stats{counters.allocations, counters.reuses, counters.deallocations,
+                                    counters.bytes_in_use, counters.bytes_pooled};
+        }
+
+        /* Memory blocks aligned on `buffer_alignment' bytes, so that SIMD packs can be
+         * loaded from the start of the buffers and that buffers do not share cache lines.
+         *
+         * The size of the block and its offset from the pointer returned by
+         * malloc are stored right before the aligned pointer.
+         */
+        static const size_t buffer_alignment = 64;
+
+        inline void* aligned_malloc(size_t bytes) {
+            char* raw = static_cast<char*>(std::malloc(bytes + buffer_alignment + 2 * sizeof(size_t)));
+            if(not raw)
+                throw std::bad_alloc();
+            uintptr_t const start = reinterpret_cast<uintptr_t>(raw) + 2 * sizeof(size_t);
+            char* aligned = raw + ((start + buffer_alignment - 1) & ~(buffer_alignment - 1)) - reinterpret_cast<uintptr_t>(raw);
+            reinterpret_cast<size_t*>(aligned)[-1] = aligned - raw;
+            reinterpret_cast<size_t*>(aligned)[-2] = bytes;
+            return aligned;
+        }
+        inline size_t aligned_capacity(void* ptr) {
+            return reinterpret_cast<size_t*>(ptr)[-2];
+        }
+        inline void aligned_free(void* ptr) {
+            std::free(static_cast<char*>(ptr) - reinterpret_cast<size_t*>(ptr)[-1]);
+        }
+
+        /* Allocator of aligned buffers, every buffer is requested from the system */
+        template<class T>
+            struct aligned_allocator {
+                typedef T value_type;
+
+                T* allocate(size_t n) {
+                    allocation_counters& counters = allocation_counters_instance();
+                    size_t const bytes = n * sizeof(T);
+                    ++counters.allocations;
+                    counters.bytes_in_use += bytes;
+                    return static_cast<T*>(aligned_malloc(bytes));
+                }
+                void deallocate(T* ptr, size_t n) {
+                    allocation_counters& counters = allocation_counters_instance();
+                    ++counters.deallocations;
+                    counters.bytes_in_use -= n * sizeof(T);
+                    aligned_free(ptr);
+                }
+            };
+
+        /* Buffers recently released by a thread, sorted by size class: class k
+         * holds buffers of 2^k to 2^(k+1) - 1 bytes. At most `depth' buffers
+         * are kept per class, and at most PYTHONIC_POOL_SIZE bytes overall.
+         */
+        class buffer_pool {
+            static const size_t classes = 8 * sizeof(size_t);
+            static const size_t depth = 4;
+
+            void* buffers[classes][depth];
+            size_t counts[classes];
+            size_t bytes;
+
+            static size_t size_class(size_t bytes) {
+                size_t k = 0;
+                while(bytes >>= 1)
+                    ++k;
+                return k;
+            }
+
+            public:
+            buffer_pool() : counts(), bytes(0) {}
+            buffer_pool(buffer_pool const&) = delete;
+
+            ~buffer_pool() {
+                for(size_t k = 0; k < classes; ++k)
+                    for(size_t i = 0; i < counts[k]; ++i) {
+                        allocation_counters_instance().bytes_pooled -= aligned_capacity(buffers[k][i]);
+                        aligned_free(buffers[k][i]);
+                    }
+            }
+
+            /* Most recently released buffer of at least `size' bytes, or nullptr */
+            void* take(size_t size) {
+                size_t const k = size_class(size);
+                for(size_t i = counts[k]; i-- > 0;) {
+                    void* ptr = buffers[k][i];
+                    size_t const capacity = aligned_capacity(ptr);
+                    if(capacity >= size) {
+                        buffers[k][i] = buffers[k][--counts[k]];
+                        bytes -= capacity;
+                        allocation_counters_instance().bytes_pooled -= capacity;
+                        return ptr;
+                    }
+                }
+                return nullptr;
+            }
+
+            /* Keeps `ptr' for a later reuse, returns false if the pool is full */
+            bool give(void* ptr) {
+                size_t const capacity = aligned_capacity(ptr);
+                size_t const k = size_class(capacity);
+                if(counts[k] == depth or bytes + capacity > size_t(PYTHONIC_POOL_SIZE))
+                    return false;
+                buffers[k][counts[k]++] = ptr;
+                bytes += capacity;
+                allocation_counters_instance().bytes_pooled += capacity;
+                return true;
+            }
+
+            /* Pool of the calling thread, or nullptr once it has been destroyed */
+            static buffer_pool* local() {
+                static thread_local bool destroyed = false;
+                struct owner {
+                    buffer_pool pool;
+                    ~owner() { destroyed = true; }
+                };
+                if(destroyed)
+                    return nullptr;
+                static thread_local owner instance;
+                return &instance.pool;
+            }
+        };
+
+        /* Allocator of aligned buffers that recycles the buffers released by the
+         * calling thread, so that the temporaries of a loop do not go through the
+         * system allocator at each iteration
+         */
+        template<class T>
+            struct pool_allocator {
+                typedef T value_type;
+
+                T* allocate(size_t n) {
+                    allocation_counters& counters = allocation_counters_instance();
+                    size_t const bytes = n * sizeof(T);
+                    ++counters.allocations;
+                    counters.bytes_in_use += bytes;
+                    if(buffer_pool* pool = buffer_pool::local())
+                        if(void* ptr = pool->take(bytes)) {
+                            ++counters.reuses;
+                            return static_cast<T*>(ptr);
+                        }
+                    return static_cast<T*>(aligned_malloc(bytes));
+                }
+                void deallocate(T* ptr, size_t n) {
+                    allocation_counters& counters = allocation_counters_instance();
+                    ++counters.deallocations;
+                    counters.bytes_in_use -= n * sizeof(T);
+                    buffer_pool* pool = buffer_pool::local();
+                    if(not pool or not pool->give(ptr))
+                        aligned_free(ptr);
+                }
+            };
+
+        /* Allocator used for the storage of arrays, set PYTHONIC_ALLOCATOR to
+         * aligned_allocator to disable the pools, or to any class template
+         * providing the allocate and deallocate methods of std::allocator
+         */
+        template<class T>
+            using default_allocator = PYTHONIC_ALLOCATOR<T>;
+
+    }
+
+}
+
+#endif
@@ -0,0 +1,120 @@
+#ifndef PYTHONIC_UTILS_ARRAY_REDUCE_HPP
+#define PYTHONIC_UTILS_ARRAY_REDUCE_HPP
+
+#include "pythonic/types/ndarray.hpp"
+#include "pythonic/types/vectorizable.hpp"
+#include "pythonic/utils/int_.hpp"
+#include "pythonic/utils/reduce.hpp"
+#include "pythonic/__builtin__/None.hpp"
+#include "pythonic/__builtin__/ValueError.hpp"
+
+#include <type_traits>
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* flat indexing of a vectorizable expression, see types::is_vectorizable */
+        template<class E>
+            struct flat_expr {
+                E const& expr;
+                typename E::dtype operator[](long i) const {
+                    return expr.template load<typename E::dtype>(i);
+                }
+            };
+
+        /* element-wise reduction of any other expression, through its iterators */
+        template<class Op, class I, class F>
+            void iter_reduce(I begin, I end, F& r, utils::int_<1>)
+            {
+                for(; begin != end; ++begin)
+                    r = Op::combine(r, *begin);
+            }
+        template<class Op, class I, class F, size_t N>
+            void iter_reduce(I begin, I end, F& r, utils::int_<N>)
+            {
+                for(; begin != end; ++begin)
+                    iter_reduce<Op>((*begin).begin(), (*begin).end(), r, utils::int_<N - 1>());
+            }
+
+        /* reduction of all the values of an array or of an expression into a `F' */
+        template<class Op, class F, class T, size_t N>
+            F reduce(types::ndarray<T, N> const& array)
+            {
+                return flat_reduce<Op, F>(array.buffer, array.size());
+            }
+        /* the values of a transposed matrix are the ones of the matrix */
+        template<class Op, class F, class T>
+            F reduce(types::numpy_texpr<types::ndarray<T, 2>> const& expr)
+            {
+                return flat_reduce<Op, F>(expr.arg.buffer, expr.arg.size());
+            }
+        template<class Op, class F, class E>
+            typename std::enable_if<types::is_vectorizable<E>::value, F>::type
+            reduce(E const& expr)
+            {
+                return flat_reduce<Op, F>(flat_expr<E>{expr}, expr.size());
+            }
+        template<class Op, class F, class E>
+            typename std::enable_if<not types::is_vectorizable<E>::value, F>::type
+            reduce(E const& expr)
+            {
+                F r = Op::template init<F>();
+                iter_reduce<Op>(expr.begin(), expr.end(), r, utils::int_<types::numpy_expr_to_ndarray<E>::N>());
+                return r;
+            }
+
+        /* shape of an array without its axis `axis', along with the sizes of the
+         * (outer, len, inner) view of its values used by axis_reduce
+         */
+        template<size_t N>
+            types::array<long, N - 1> reduced_shape(types::array<long, N> const& shape, long axis, long& outer, long& len, long& inner)
+            {
+                if(axis < 0 or axis >= long(N))
+                    throw types::ValueError("axis out of bounds");
+                types::array<long, N - 1> out;
+                outer = 1, inner = 1, len = shape[axis];
+                for(long i = 0; i < axis; ++i)
+                    outer *= (out[i] = shape[i]);
+                for(long i = axis + 1; i < long(N); ++i)
+                    inner *= (out[i - 1] = shape[i]);
+                return out;
+            }
+
+        /* reduction of an array along `axis', into an array of `F' */
+        template<class Op, class F, class T, size_t N>
+            types::ndarray<F, N - 1> reduce(types::ndarray<T, N> const& array, long axis)
+            {
+                long outer, len, inner;
+                types::ndarray<F, N - 1> out(reduced_shape(array.shape, axis, outer, len, inner), __builtin__::None);
+                axis_reduce<Op>(array.buffer, outer, len, inner, out.buffer);
+                return out;
+            }
+        template<class Op, class T, size_t N>
+            types::ndarray<long, N - 1> arg_reduce(types::ndarray<T, N> const& array, long axis)
+            {
+                long outer, len, inner;
+                types::ndarray<long, N - 1> out(reduced_shape(array.shape, axis, outer, len, inner), __builtin__::None);
+                axis_arg_reduce<Op>(array.buffer, outer, len, inner, out.buffer);
+                return out;
+            }
+
+        /* a transposed matrix is reduced along the other axis of the matrix,
+         * which maps invalid axes to invalid axes
+         */
+        template<class Op, class F, class T>
+            types::ndarray<F, 1> reduce(types::numpy_texpr<types::ndarray<T, 2>> const& expr, long axis)
+            {
+                return reduce<Op, F>(expr.arg, 1 - axis);
+            }
+        template<class Op, class T>
+            types::ndarray<long, 1> arg_reduce(types::numpy_texpr<types::ndarray<T, 2>> const& expr, long axis)
+            {
+                return arg_reduce<Op>(expr.arg, 1 - axis);
+            }
+
+    }
+
+}
+
+#endif
@@ -0,0 +1,106 @@
+#ifndef PYTHONIC_UTILS_BLAS_HPP
+#define PYTHONIC_UTILS_BLAS_HPP
+
+#include "pythonic/types/ndarray.hpp"
+
+#include <complex>
+#include <type_traits>
+#ifdef PYTHRAN_BLAS
+#include <cblas.h>
+#endif
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* element types BLAS routines operate on */
+        template<class T>
+            struct is_blas_type : std::false_type {};
+        template<>
+            struct is_blas_type<float> : std::true_type {};
+        template<>
+            struct is_blas_type<double> : std::true_type {};
+        template<>
+            struct is_blas_type<std::complex<float>> : std::true_type {};
+        template<>
+            struct is_blas_type<std::complex<double>> : std::true_type {};
+
+        /* checks whether two arrays share part of their storage */
+        template<class T, size_t N, size_t M>
+            bool overlap(types::ndarray<T,N> const& self, types::ndarray<T,M> const& other)
+            {
+                return self.buffer < other.fend() and other.buffer < self.fend();
+            }
+
+#ifdef PYTHRAN_BLAS
+        /* row-major wrappers around the CBLAS routines of the configured
+         * library: c += a.b, or c += a.transpose(b) if `transb' is set,
+         * y += a.x and x.y
+         */
+        namespace blas {
+
+            inline void gemm(long n, long m, long p, float const* a, long lda, float const* b, long ldb, float* c, long ldc, bool transb = false)
+            {
+                cblas_sgemm(CblasRowMajor, CblasNoTrans, transb ? CblasTrans : CblasNoTrans, n, m, p, 1.f, a, lda, b, ldb, 1.f, c, ldc);
+            }
+            inline void gemm(long n, long m, long p, double const* a, long lda, double const* b, long ldb, double* c, long ldc, bool transb = false)
+            {
+                cblas_dgemm(CblasRowMajor, CblasNoTrans, transb ? CblasTrans : CblasNoTrans, n, m, p, 1., a, lda, b, ldb, 1., c, ldc);
+            }
+            inline void gemm(long n, long m, long p, std::complex<float> const* a, long lda, std::complex<float> const* b, long ldb, std::complex<float>* c, long ldc, bool transb = false)
+            {
+                std::complex<float> const one(1);
+                cblas_cgemm(CblasRowMajor, CblasNoTrans, transb ? CblasTrans : CblasNoTrans, n, m, p, &one, a, lda, b, ldb, &one, c, ldc);
+            }
+            inline void gemm(long n, long m, long p, std::complex<double> const* a, long lda, std::complex<double> const* b, long ldb, std::complex<double>* c, long ldc, bool transb = false)
+            {
+                std::complex<double> const one(1);
+                cblas_zgemm(CblasRowMajor, CblasNoTrans, transb ? CblasTrans : CblasNoTrans, n, m, p, &one, a, lda, b, ldb, &one, c, ldc);
+            }
+
+            inline void gemv(long n, long m, float const* a, long lda, float const* x, float* y)
+            {
+                cblas_sgemv(CblasRowMajor, CblasNoTrans, n, m, 1.f, a, lda, x, 1, 1.f, y, 1);
+            }
+            inline void gemv(long n, long m, double const* a, long lda, double const* x, double* y)
+            {
+                cblas_dgemv(CblasRowMajor, CblasNoTrans, n, m, 1., a, lda, x, 1, 1., y, 1);
+            }
+            inline void gemv(long n, long m, std::complex<float> const* a, long lda, std::complex<float> const* x, std::complex<float>* y)
+            {
+                std::complex<float> const one(1);
+                cblas_cgemv(CblasRowMajor, CblasNoTrans, n, m, &one, a, lda, x, 1, &one, y, 1);
+            }
+            inline void gemv(long n, long m, std::complex<double> const* a, long lda, std::complex<double> const* x, std::complex<double>* y)
+            {
+                std::complex<double> const one(1);
+                cblas_zgemv(CblasRowMajor, CblasNoTrans, n, m, &one, a, lda, x, 1, &one, y, 1);
+            }
+
+            inline float dot(long n, float const* x, float const* y)
+            {
+                return cblas_sdot(n, x, 1, y, 1);
+            }
+            inline double dot(long n, double const* x, double const* y)
+            {
+                return cblas_ddot(n, x, 1, y, 1);
+            }
+            inline std::complex<float> dot(long n, std::complex<float> const* x, std::complex<float> const* y)
+            {
+                std::complex<float> res;
+                cblas_cdotu_sub(n, x, 1, y, 1, &res);
+                return res;
+            }
+            inline std::complex<double> dot(long n, std::complex<double> const* x, std::complex<double> const* y)
+            {
+                std::complex<double> res;
+                cblas_zdotu_sub(n, x, 1, y, 1, &res);
+                return res;
+            }
+        }
+#endif
+    }
+
+}
+
+#endif
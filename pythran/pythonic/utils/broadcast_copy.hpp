@@ -2,6 +2,8 @@
 #define PYTHONIC_UTILS_BROADCAST_COPY_HPP
 
 #include "pythonic/types/tuple.hpp"
+#include "pythonic/types/vectorizable.hpp"
+#include "pythonic/utils/vectorize.hpp"
 
 namespace pythonic {
 
@@ -40,10 +42,23 @@ namespace pythonic {
          * implements array broadcasting in addition to regular copy
          */
         template<class E, class F>
-            E& broadcast_copy(E& self, F const& other, utils::int_<0>) {
+            E& broadcast_copy(E& self, F const& other, utils::int_<0>, std::false_type) {
                 std::copy(other.begin(), other.end(), self.begin());
                 return self;
             }
+        /* contiguous destination and expression of the same type: copy along the flat buffer */
+        template<class E, class F>
+            E& broadcast_copy(E& self, F const& other, utils::int_<0>, std::true_type) {
+                vectorize(self.buffer, other, self.size());
+                return self;
+            }
+        template<class E, class F>
+            E& broadcast_copy(E& self, F const& other, utils::int_<0>) {
+                return broadcast_copy(self, other, utils::int_<0>(),
+                                      std::integral_constant<bool,
+                                                             types::is_vectorizable<E>::value and types::is_vectorizable<F>::value
+                                                             and std::is_same<typename E::dtype, typename F::dtype>::value>());
+            }
         template<class E, class F, size_t N>
             E& broadcast_copy(E& self, F const& other, utils::int_<N>) {
                 std::fill(self.begin(), self.end(), other);
@@ -0,0 +1,74 @@
+#ifndef PYTHONIC_UTILS_MEMOIZE_HPP
+#define PYTHONIC_UTILS_MEMOIZE_HPP
+
+#include "pythonic/types/tuple.hpp"
+
+#include <list>
+#include <unordered_map>
+#include <utility>
+#ifdef _OPENMP
+#include <mutex>
+#endif
+
+namespace pythonic {
+
+    namespace utils {
+
+        /** Bounded cache used by functions flagged with #pythran memoize
+         *
+         *  Results are indexed by the tuple of argument values. When the cache
+         *  is full, the least recently used result is evicted.
+         *  The lock is not held while the result is computed, so that
+         *  recursive memoized functions do not dead lock: two threads may
+         *  compute the same result, only one of them is stored.
+         */
+        template <class Key, class Value>
+            class lru_cache
+            {
+                typedef std::list<std::pair<Key, Value>> entries_type;
+
+                entries_type entries; // most recently used first
+                std::unordered_map<Key, typename entries_type::iterator> index;
+                size_t const max_size;
+#ifdef _OPENMP
+                std::mutex lock;
+#endif
+
+                public:
+                lru_cache(size_t max_size) : max_size(max_size) {}
+
+                template<class F>
+                    Value operator()(Key const& key, F const& compute)
+                    {
+                        {
+#ifdef _OPENMP
+                            std::lock_guard<std::mutex> guard(lock);
+#endif
+                            auto where = index.find(key);
+                            if(where != index.end()) {
+                                entries.splice(entries.begin(), entries, where->second);
+                                return where->second->second;
+                            }
+                        }
+                        Value value = compute();
+                        {
+#ifdef _OPENMP
+                            std::lock_guard<std::mutex> guard(lock);
+#endif
+                            if(max_size and index.find(key) == index.end()) {
+                                if(index.size() == max_size) {
+                                    index.erase(entries.back().first);
+                                    entries.pop_back();
+                                }
+                                entries.emplace_front(key, value);
+                                index[key] = entries.begin();
+                            }
+                        }
+                        return value;
+                    }
+            };
+    }
+
+}
+
+#endif
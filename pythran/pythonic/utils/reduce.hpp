@@ -0,0 +1,239 @@
+#ifndef PYTHONIC_UTILS_REDUCE_HPP
+#define PYTHONIC_UTILS_REDUCE_HPP
+
+#include "pythonic/__builtin__/ValueError.hpp"
+
+#include <algorithm>
+#include <cstddef>
+#include <limits>
+#include <vector>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#ifndef PYTHONIC_REDUCE_THRESHOLD
+#define PYTHONIC_REDUCE_THRESHOLD 65536
+#endif
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* Reduction operators: `init' is the neutral value and `combine' merges a
+         * value into a partial result. As in numpy, NaN values win comparisons.
+         */
+        struct sum_op {
+            template<class F>
+                static F init() { return F(0); }
+            template<class F, class T>
+                static F combine(F a, T b) { return a + b; }
+        };
+        struct prod_op {
+            template<class F>
+                static F init() { return F(1); }
+            template<class F, class T>
+                static F combine(F a, T b) { return a * b; }
+        };
+        struct max_op {
+            template<class F>
+                static F init() { return std::numeric_limits<F>::lowest(); }
+            template<class F, class T>
+                static F combine(F a, T b) { return (b > a or b != b) ? F(b) : a; }
+        };
+        struct min_op {
+            template<class F>
+                static F init() { return std::numeric_limits<F>::max(); }
+            template<class F, class T>
+                static F combine(F a, T b) { return (b < a or b != b) ? F(b) : a; }
+        };
+
+        /* Reduction of the `n' values of `src', that is either a pointer or an
+         * expression providing flat indexing through operator[].
+         *
+         * Four independent partial results are kept so that the compiler can
+         * vectorize the loop, and ranges of more than reduce_block values are split in
+         * halves that are reduced separately: this pairwise summation bounds the
+         * rounding error by O(log n) instead of O(n). As for the vectorized loop,
+         * the order of the operations differs from a sequential accumulation.
+         */
+        static const long reduce_block = 128;
+
+        template<class Op, class F, class S>
+            F sequential_reduce(S const& src, long first, long last)
+            {
+                if(last - first > reduce_block) {
+                    long const middle = first + ((last - first) / 2 + 7) / 8 * 8;
+                    return Op::combine(sequential_reduce<Op, F>(src, first, middle),
+                                       sequential_reduce<Op, F>(src, middle, last));
+                }
+                F r0 = Op::template init<F>(), r1 = r0, r2 = r0, r3 = r0;
+                long i = first;
+                for(; i + 4 <= last; i += 4) {
+                    r0 = Op::combine(r0, src[i]);
+                    r1 = Op::combine(r1, src[i + 1]);
+                    r2 = Op::combine(r2, src[i + 2]);
+                    r3 = Op::combine(r3, src[i + 3]);
+                }
+                for(; i < last; ++i)
+                    r0 = Op::combine(r0, src[i]);
+                return Op::combine(Op::combine(r0, r1), Op::combine(r2, r3));
+            }
+
+        /* Same as above, large ranges being split among threads when OpenMP is
+         * enabled and no parallel region is already running. The partial results
+         * of the threads are combined in order.
+         */
+        template<class Op, class F, class S>
+            F flat_reduce(S const& src, long n)
+            {
+#ifdef _OPENMP
+                if(n >= PYTHONIC_REDUCE_THRESHOLD and not omp_in_parallel()) {
+                    std::vector<F> partials(omp_get_max_threads(), Op::template init<F>());
+#pragma omp parallel
+                    {
+                        long const nthreads = omp_get_num_threads();
+                        long const slice = (n + nthreads - 1) / nthreads;
+                        long const first = std::min(n, omp_get_thread_num() * slice);
+                        partials[omp_get_thread_num()] = sequential_reduce<Op, F>(src, first, std::min(n, first + slice));
+                    }
+                    F r = Op::template init<F>();
+                    for(F const& partial : partials)
+                        r = Op::combine(r, partial);
+                    return r;
+                }
+#endif
+                return sequential_reduce<Op, F>(src, 0, n);
+            }
+
+        /** Sum of a contiguous range of values, starting from init */
+        template<class T, class F>
+            F flat_sum(T const* begin, T const* end, F init)
+            {
+                return init + flat_reduce<sum_op, F>(begin, end - begin);
+            }
+
+        /* Index of the first greatest (resp. smallest) value of a contiguous range,
+         * or of its first NaN
+         */
+        template<class Op, class T>
+            long flat_arg_reduce(T const* data, long n)
+            {
+                if(not n)
+                    throw types::ValueError("empty sequence");
+                T const best = flat_reduce<Op, T>(data, n);
+                for(long i = 0; i < n; ++i)
+                    if(data[i] == best)
+                        return i;
+                for(long i = 0; i < n; ++i)
+                    if(data[i] != data[i])
+                        return i;
+                return 0;
+            }
+
+        /* Element-wise combination of `w' values of `row' into `block'. Chunks of
+         * constant width between restrict-qualified pointers are vectorized by
+         * the compiler even with its cheapest cost model, used at -O2.
+         */
+        template<class Op, long w, class F, class T>
+            void combine_row(F* __restrict block, T const* __restrict row)
+            {
+                for(long j = 0; j < w; ++j)
+                    block[j] = Op::combine(block[j], row[j]);
+            }
+        template<class Op, class F, class T>
+            void combine_row(F* block, T const* row, long w)
+            {
+                static const long chunk = 32;
+                long j = 0;
+                for(; j + chunk <= w; j += chunk)
+                    combine_row<Op, chunk>(block + j, row + j);
+                for(; j < w; ++j)
+                    block[j] = Op::combine(block[j], row[j]);
+            }
+
+        /* Reduction along the middle axis of the contiguous values `data', seen as
+         * an array of shape (outer, len, inner), into the `outer' x `inner' values of
+         * `out'. When inner is 1, each output is a flat reduction; otherwise a
+         * column block of `inner' is reduced a row at a time, so that the inner loop
+         * runs over contiguous values, and rows are accumulated by blocks of
+         * reduce_block to limit the rounding error. The blocks of columns are split
+         * among threads for large arrays, no intermediate array is allocated.
+         */
+        template<class Op, class F, class T>
+            void axis_reduce(T const* data, long outer, long len, long inner, F* out)
+            {
+                static const long width = 256;
+                long const columns = (inner + width - 1) / width;
+#ifdef _OPENMP
+                bool const parallel = outer * len * inner >= PYTHONIC_REDUCE_THRESHOLD and not omp_in_parallel();
+#endif
+                if(inner == 1) {
+#ifdef _OPENMP
+#pragma omp parallel for if(parallel)
+#endif
+                    for(long o = 0; o < outer; ++o)
+                        out[o] = sequential_reduce<Op, F>(data + o * len, 0, len);
+                    return;
+                }
+#ifdef _OPENMP
+#pragma omp parallel for if(parallel)
+#endif
+                for(long tile = 0; tile < outer * columns; ++tile) {
+                    long const o = tile / columns, j0 = tile % columns * width;
+                    long const w = std::min(width, inner - j0);
+                    T const* src = data + o * len * inner + j0;
+                    F* dst = out + o * inner + j0;
+                    F block[width];
+                    std::fill(dst, dst + w, Op::template init<F>());
+                    for(long k0 = 0; k0 < len; k0 += reduce_block) {
+                        std::fill(block, block + w, Op::template init<F>());
+                        for(long k = k0, kend = std::min(len, k0 + reduce_block); k < kend; ++k)
+                            combine_row<Op>(block, src + k * inner, w);
+                        for(long j = 0; j < w; ++j)
+                            dst[j] = Op::combine(dst[j], block[j]);
+                    }
+                }
+            }
+
+        /* Index along the middle axis of the first greatest (resp. smallest) value
+         * of the contiguous values `data', seen as an array of shape (outer, len, inner)
+         */
+        template<class Op, class T>
+            void axis_arg_reduce(T const* data, long outer, long len, long inner, long* out)
+            {
+                if(not len)
+                    throw types::ValueError("empty sequence");
+                static const long width = 256;
+                long const columns = (inner + width - 1) / width;
+                if(inner == 1) {
+                    for(long o = 0; o < outer; ++o)
+                        out[o] = flat_arg_reduce<Op>(data + o * len, len);
+                    return;
+                }
+#ifdef _OPENMP
+#pragma omp parallel for if(outer * len * inner >= PYTHONIC_REDUCE_THRESHOLD and not omp_in_parallel())
+#endif
+                for(long tile = 0; tile < outer * columns; ++tile) {
+                    long const o = tile / columns, j0 = tile % columns * width;
+                    long const w = std::min(width, inner - j0);
+                    T const* src = data + o * len * inner + j0;
+                    long* dst = out + o * inner + j0;
+                    T best[width];
+                    std::copy(src, src + w, best);
+                    std::fill(dst, dst + w, 0L);
+                    for(long k = 1; k < len; ++k) {
+                        T const* row = src + k * inner;
+                        for(long j = 0; j < w; ++j)
+                            if(best[j] == best[j] and not (Op::combine(best[j], row[j]) == best[j])) {
+                                best[j] = row[j];
+                                dst[j] = k;
+                            }
+                    }
+                }
+            }
+
+    }
+
+}
+
+#endif
@@ -0,0 +1,42 @@
+#ifndef PYTHONIC_UTILS_RELEASE_HPP
+#define PYTHONIC_UTILS_RELEASE_HPP
+
+#include <cstddef>
+
+namespace pythonic {
+
+    namespace types {
+        template<class T, size_t N>
+            struct ndarray;
+        template<class T>
+            class list;
+    }
+
+    namespace utils {
+
+        /** Drops the storage held by a variable that is no longer used
+         *
+         *  Arrays and lists are reset to an empty value, so that their
+         *  storage is freed as soon as no other variable references it,
+         *  instead of at the end of the enclosing scope. Other values are
+         *  left untouched.
+         */
+        template<class T>
+            void release(T&) {}
+
+        template<class T, size_t N>
+            void release(types::ndarray<T,N>& self)
+            {
+                self = types::ndarray<T,N>();
+            }
+
+        template<class T>
+            void release(types::list<T>& self)
+            {
+                self = types::list<T>();
+            }
+    }
+
+}
+
+#endif
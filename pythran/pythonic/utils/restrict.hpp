@@ -0,0 +1,124 @@
+#ifndef PYTHONIC_UTILS_RESTRICT_HPP
+#define PYTHONIC_UTILS_RESTRICT_HPP
+
+#include "pythonic/types/traits.hpp"
+#include "pythonic/types/list.hpp"
+
+#include <complex>
+#include <functional>
+#include <type_traits>
+#include <utility>
+
+namespace pythonic {
+
+    /* forward declaration, so that loops over lists do not pull in the
+     * numpy operators, which would take over the list ones */
+    namespace types {
+        template<class T, size_t N>
+            struct ndarray;
+    }
+
+    namespace utils {
+
+        /* element types stored contiguously by lists */
+        template<class T>
+            struct is_number {
+                static const bool value = (std::is_arithmetic<T>::value
+                                           and not std::is_same<T, bool>::value)
+                                          or types::is_complex<T>::value;
+            };
+
+        /* values whose elements are stored in a single contiguous buffer */
+        template<class T>
+            struct is_flat : std::false_type {};
+        template<class T>
+            struct is_flat<types::ndarray<T,1>> : std::true_type {};
+        template<class T>
+            struct is_flat<types::list<T>> : std::integral_constant<bool, is_number<T>::value> {};
+
+        /** Type of a variable as seen from a loop where it cannot be aliased
+         *
+         *  Flat values are seen as restrict-qualified pointers to their
+         *  first element, other values are references to themselves.
+         */
+        template<class T>
+            struct restrict_type {
+                typedef T& type;
+            };
+        template<class T>
+            struct restrict_type<types::ndarray<T,1>> {
+                typedef T* __restrict type;
+            };
+        template<class T>
+            struct restrict_type<types::ndarray<T,1> const> {
+                typedef T const* __restrict type;
+            };
+        template<class T>
+            struct restrict_type<types::list<T>> {
+                typedef typename std::conditional<is_number<T>::value,
+                                                  T* __restrict,
+                                                  types::list<T>&>::type type;
+            };
+        template<class T>
+            struct restrict_type<types::list<T> const> {
+                typedef typename std::conditional<is_number<T>::value,
+                                                  T const* __restrict,
+                                                  types::list<T> const&>::type type;
+            };
+
+        /* value bound to a restrict_type */
+        template<class T>
+            T& restrict_ptr(T& self)
+            {
+                return self;
+            }
+        template<class T>
+            T* restrict_ptr(types::ndarray<T,1>& self)
+            {
+                return self.buffer;
+            }
+        template<class T>
+            T const* restrict_ptr(types::ndarray<T,1> const& self)
+            {
+                return self.buffer;
+            }
+        template<class T>
+            typename std::enable_if<is_number<T>::value, T*>::type
+            restrict_ptr(types::list<T>& self)
+            {
+                return self.size() ? &*self.begin() : nullptr;
+            }
+        template<class T>
+            typename std::enable_if<is_number<T>::value, T const*>::type
+            restrict_ptr(types::list<T> const& self)
+            {
+                return self.size() ? &*self.begin() : nullptr;
+            }
+
+        /* first and past-the-end bytes of the storage of a flat value */
+        template<class T>
+            std::pair<char const*, char const*> storage(T const&)
+            {
+                return std::pair<char const*, char const*>(nullptr, nullptr);
+            }
+        template<class T>
+            std::pair<char const*, char const*> storage(types::ndarray<T,1> const& self)
+            {
+                return std::pair<char const*, char const*>(
+                        reinterpret_cast<char const*>(self.fbegin()),
+                        reinterpret_cast<char const*>(self.fend()));
+            }
+        template<class T>
+            typename std::enable_if<is_number<T>::value, std::pair<char const*, char const*>>::type
+            storage(types::list<T> const& self)
+            {
+                T const* first = restrict_ptr(self);
+                return std::pair<char const*, char const*>(
+                        reinterpret_cast<char const*>(first),
+                        reinterpret_cast<char const*>(first + self.size()));
+            }
+    }
+
+}
+
+#endif
@@ -0,0 +1,260 @@
+#ifndef PYTHONIC_UTILS_SORT_HPP
+#define PYTHONIC_UTILS_SORT_HPP
+
+#include <algorithm>
+#include <complex>
+#include <numeric>
+#include <vector>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#ifndef PYTHONIC_SORT_THRESHOLD
+#define PYTHONIC_SORT_THRESHOLD 65536
+#endif
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* Ordering used by numpy: NaN values are greater than any other value,
+         * and complex values are ordered by real part, then by imaginary part
+         */
+        struct sort_less {
+            template<class T>
+                bool operator()(T const& a, T const& b) const {
+                    return a < b or (b != b and a == a);
+                }
+            template<class T>
+                bool operator()(std::complex<T> const& a, std::complex<T> const& b) const {
+                    return (*this)(a.real(), b.real()) or (a.real() == b.real() and (*this)(a.imag(), b.imag()));
+                }
+        };
+
+        /* Ordering of the indices of `values' by value, ties being broken by
+         * index so that the result of an unstable sort is the one of a stable sort
+         */
+        template<class T, class Compare>
+            struct index_less {
+                T const* values;
+                Compare comp;
+                bool operator()(long i, long j) const {
+                    return comp(values[i], values[j]) or (not comp(values[j], values[i]) and i < j);
+                }
+            };
+
+        /* Number of values taken from `a' among the first `diag' values of the
+         * merge of the sorted ranges `a' and `b', the values of `a' coming first
+         * on ties as in std::merge
+         */
+        template<class T, class Compare>
+            long merge_path(T const* a, long na, T const* b, long nb, long diag, Compare comp)
+            {
+                long lo = std::max(0L, diag - nb), hi = std::min(diag, na);
+                while(lo < hi) {
+                    long const mid = (lo + hi) / 2;
+                    if(comp(b[diag - mid - 1], a[mid]))
+                        hi = mid;
+                    else
+                        lo = mid + 1;
+                }
+                return lo;
+            }
+
+        /* Sort of the `n' contiguous values of `data'
+         *
+         * When OpenMP is enabled, large ranges are cut into one chunk per thread,
+         * the chunks are sorted concurrently then merged pairwise through a single
+         * scratch buffer. Each merge is itself split among the threads along its
+         * merge path, so that the last rounds do not run on a single thread.
+         */
+        template<class T, class Compare>
+            void parallel_sort(T* data, long n, Compare comp)
+            {
+#ifdef _OPENMP
+                long const nthreads = omp_get_max_threads();
+                if(n >= PYTHONIC_SORT_THRESHOLD and nthreads > 1 and not omp_in_parallel()) {
+                    std::vector<long> bounds(nthreads + 1);
+                    for(long c = 0; c <= nthreads; ++c)
+                        bounds[c] = n * c / nthreads;
+#pragma omp parallel for
+                    for(long c = 0; c < nthreads; ++c)
+                        std::sort(data + bounds[c], data + bounds[c + 1], comp);
+                    std::vector<T> scratch(n);
+                    T* src = data;
+                    T* dst = scratch.data();
+                    for(long width = 1; width < nthreads; width *= 2) {
+                        long const merges = (nthreads + 2 * width - 1) / (2 * width);
+                        long const parts = std::max(1L, nthreads / merges);
+#pragma omp parallel for
+                        for(long task = 0; task < merges * parts; ++task) {
+                            long const c = task / parts * 2 * width, part = task % parts;
+                            long const lo = bounds[c],
+                                       mid = bounds[std::min(c + width, nthreads)],
+                                       hi = bounds[std::min(c + 2 * width, nthreads)];
+                            long const d0 = (hi - lo) * part / parts, d1 = (hi - lo) * (part + 1) / parts;
+                            long const i0 = merge_path(src + lo, mid - lo, src + mid, hi - mid, d0, comp),
+                                       i1 = merge_path(src + lo, mid - lo, src + mid, hi - mid, d1, comp);
+                            std::merge(src + lo + i0, src + lo + i1,
+                                       src + mid + (d0 - i0), src + mid + (d1 - i1),
+                                       dst + lo + d0, comp);
+                        }
+                        std::swap(src, dst);
+                    }
+                    if(src != data)
+                        std::copy(src, src + n, data);
+                    return;
+                }
+#endif
+                std::sort(data, data + n, comp);
+            }
+
+        /* Number of strided lanes gathered at once by for_each_lane and
+         * for_each_arg_lane, so that they are read and written a row at a time
+         */
+        static const long sort_block = 16;
+
+        /* Calls op(lane, l) for each lane l of the contiguous values `src', seen as
+         * an array of shape (outer, len, inner): lanes run along its middle axis and
+         * are numbered o * inner + j. `lane' points to the `len' values of the lane,
+         * contiguous and writable.
+         *
+         * When `dst' is not null, lanes are stored back into it after op. If it is
+         * `src' itself, contiguous lanes (inner == 1) are handed where they are.
+         * Other lanes are copied by blocks of sort_block neighbouring lanes into a
+         * scratch buffer allocated once per thread. Lanes are distributed among
+         * threads for large arrays.
+         */
+        template<class T, class Op>
+            void for_each_lane(T const* src, T* dst, long outer, long len, long inner, Op const& op)
+            {
+                bool const in_place = inner == 1 and dst == src;
+                long const columns = (inner + sort_block - 1) / sort_block;
+#ifdef _OPENMP
+#pragma omp parallel if(outer * len * inner >= PYTHONIC_SORT_THRESHOLD and not omp_in_parallel())
+#endif
+                {
+                    std::vector<T> scratch(in_place ? 0 : len * std::min(sort_block, inner));
+#ifdef _OPENMP
+#pragma omp for
+#endif
+                    for(long tile = 0; tile < outer * columns; ++tile) {
+                        long const o = tile / columns, j0 = tile % columns * sort_block;
+                        long const w = std::min(sort_block, inner - j0);
+                        T const* from = src + o * len * inner + j0;
+                        if(in_place) {
+                            op(dst + o * len, o);
+                            continue;
+                        }
+                        for(long k = 0; k < len; ++k)
+                            for(long j = 0; j < w; ++j)
+                                scratch[j * len + k] = from[k * inner + j];
+                        for(long j = 0; j < w; ++j)
+                            op(scratch.data() + j * len, o * inner + j0 + j);
+                        if(dst) {
+                            T* to = dst + o * len * inner + j0;
+                            for(long k = 0; k < len; ++k)
+                                for(long j = 0; j < w; ++j)
+                                    to[k * inner + j] = scratch[j * len + k];
+                        }
+                    }
+                }
+            }
+
+        /* Calls op(values, indices, l) for each lane l of `data', seen as in
+         * for_each_lane, `values' pointing to the contiguous values of the lane and
+         * `indices' to the numbers 0 to len - 1, which are then stored into the
+         * lane l of `out'
+         */
+        template<class T, class Op>
+            void for_each_arg_lane(T const* data, long* out, long outer, long len, long inner, Op const& op)
+            {
+                long const columns = (inner + sort_block - 1) / sort_block;
+#ifdef _OPENMP
+#pragma omp parallel if(outer * len * inner >= PYTHONIC_SORT_THRESHOLD and not omp_in_parallel())
+#endif
+                {
+                    std::vector<T> values(inner == 1 ? 0 : len * std::min(sort_block, inner));
+                    std::vector<long> indices(inner == 1 ? 0 : len * std::min(sort_block, inner));
+#ifdef _OPENMP
+#pragma omp for
+#endif
+                    for(long tile = 0; tile < outer * columns; ++tile) {
+                        long const o = tile / columns, j0 = tile % columns * sort_block;
+                        long const w = std::min(sort_block, inner - j0);
+                        T const* from = data + o * len * inner + j0;
+                        long* to = out + o * len * inner + j0;
+                        if(inner == 1) {
+                            std::iota(to, to + len, 0L);
+                            op(from, to, o);
+                            continue;
+                        }
+                        for(long k = 0; k < len; ++k)
+                            for(long j = 0; j < w; ++j)
+                                values[j * len + k] = from[k * inner + j];
+                        for(long j = 0; j < w; ++j) {
+                            long* lane = indices.data() + j * len;
+                            std::iota(lane, lane + len, 0L);
+                            op(values.data() + j * len, lane, o * inner + j0 + j);
+                        }
+                        for(long k = 0; k < len; ++k)
+                            for(long j = 0; j < w; ++j)
+                                to[k * inner + j] = indices[j * len + k];
+                    }
+                }
+            }
+
+        /* In-place sort of the lanes of `data', seen as in for_each_lane. A single
+         * lane is sorted by parallel_sort.
+         */
+        template<class T, class Compare>
+            void sort_lanes(T* data, long outer, long len, long inner, Compare comp)
+            {
+                if(outer * inner == 1)
+                    return parallel_sort(data, len, comp);
+                for_each_lane(data, data, outer, len, inner,
+                              [len, comp](T* lane, long) { std::sort(lane, lane + len, comp); });
+            }
+
+        /* Indices that sort the lanes of `data', seen as in for_each_lane, stored
+         * at the same positions in `out'. Equal values keep their order.
+         */
+        template<class T, class Compare>
+            void arg_sort_lanes(T const* data, long* out, long outer, long len, long inner, Compare comp)
+            {
+                if(outer * inner == 1) {
+                    std::iota(out, out + len, 0L);
+                    return parallel_sort(out, len, index_less<T, Compare>{data, comp});
+                }
+                for_each_arg_lane(data, out, outer, len, inner,
+                                  [len, comp](T const* values, long* indices, long) {
+                                      std::sort(indices, indices + len, index_less<T, Compare>{values, comp});
+                                  });
+            }
+
+        /* Partial sort of the `n' values of `first' that puts the values of ranks
+         * kth[0] < kth[1] < ... at these positions, smaller values before them and
+         * greater values after them, in linear time for each rank. Each rank is
+         * selected among the values left after the previous one, which reduces to
+         * a single scan for the first or the last of them.
+         */
+        template<class I, class Compare>
+            void select(I first, long n, std::vector<long> const& kth, Compare comp)
+            {
+                long start = 0;
+                for(long k : kth) {
+                    if(k == start)
+                        std::iter_swap(first + k, std::min_element(first + start, first + n, comp));
+                    else if(k == n - 1)
+                        std::iter_swap(first + k, std::max_element(first + start, first + n, comp));
+                    else
+                        std::nth_element(first + start, first + k, first + n, comp);
+                    start = k + 1;
+                }
+            }
+
+    }
+
+}
+
+#endif
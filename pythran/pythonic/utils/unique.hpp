@@ -0,0 +1,212 @@
+#ifndef PYTHONIC_UTILS_UNIQUE_HPP
+#define PYTHONIC_UTILS_UNIQUE_HPP
+
+#include "pythonic/utils/reduce.hpp"
+#include "pythonic/utils/sort.hpp"
+
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <numeric>
+#include <type_traits>
+#include <vector>
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* Inputs smaller than this are deduplicated by sorting them, larger ones
+         * through a hash table
+         */
+        static const long unique_hash_threshold = 4096;
+
+        /* Deduplication of integers through a table indexed by value, used when
+         * their range [lo, lo + range) is small compared to their number
+         */
+        template<class T>
+            long unique_direct(T const* data, long n, T lo, unsigned long range, T* values, long* index, long* inverse)
+            {
+                long count = 0;
+                if(not index and not inverse) {
+                    std::vector<char> seen(range);
+                    for(long i = 0; i < n; ++i)
+                        seen[data[i] - lo] = 1;
+                    for(unsigned long v = 0; v < range; ++v)
+                        if(seen[v])
+                            values[count++] = T(lo + v);
+                    return count;
+                }
+                // first index of each value, then its rank among the values found
+                std::vector<long> first(range, -1);
+                for(long i = 0; i < n; ++i) {
+                    long& f = first[data[i] - lo];
+                    if(f < 0)
+                        f = i;
+                }
+                for(unsigned long v = 0; v < range; ++v)
+                    if(first[v] >= 0) {
+                        values[count] = T(lo + v);
+                        if(index)
+                            index[count] = first[v];
+                        first[v] = count++;
+                    }
+                if(inverse)
+                    for(long i = 0; i < n; ++i)
+                        inverse[i] = first[data[i] - lo];
+                return count;
+            }
+
+        /* Fibonacci hashing of the bits of a value, -0. and 0. hashing alike */
+        template<class T>
+            uint64_t hash_bits(T value)
+            {
+                if(value == T(0))
+                    value = T(0);
+                uint64_t bits = 0;
+                std::memcpy(&bits, &value, std::min(sizeof(T), sizeof(bits)));
+                return bits * 0x9E3779B97F4A7C15ULL;
+            }
+
+        /* Deduplication through an open-addressing hash table with linear probing,
+         * grown so that it stays at most half full. Values are numbered by first
+         * occurrence, then sorted. NaN values never compare equal, so each of them
+         * is kept, as with the other strategies.
+         */
+        template<class T>
+            long unique_hash(T const* data, long n, T* values, long* index, long* inverse)
+            {
+                struct slot {
+                    T value;
+                    long id;
+                };
+                int bits = 10;
+                std::vector<slot> table(1L << bits, slot{T(), -1L});
+                long count = 0;
+                for(long i = 0; i < n; ++i) {
+                    T const value = data[i];
+                    long id = -1;
+                    if(value == value) {
+                        uint64_t const mask = (1UL << bits) - 1;
+                        uint64_t h = hash_bits(value) >> (64 - bits);
+                        while(table[h].id >= 0 and not (table[h].value == value))
+                            h = (h + 1) & mask;
+                        if(table[h].id < 0) {
+                            table[h] = slot{value, id = count};
+                            if(2 * (count + 1) > long(table.size())) {
+                                std::vector<slot> larger(table.size() * 2, slot{T(), -1L});
+                                ++bits;
+                                for(slot const& s : table)
+                                    if(s.id >= 0) {
+                                        uint64_t g = hash_bits(s.value) >> (64 - bits);
+                                        while(larger[g].id >= 0)
+                                            g = (g + 1) & ((1UL << bits) - 1);
+                                        larger[g] = s;
+                                    }
+                                table.swap(larger);
+                            }
+                        }
+                        else
+                            id = table[h].id;
+                    }
+                    else
+                        id = count;
+                    if(id == count) {
+                        if(index)
+                            index[count] = i;
+                        values[count++] = value;
+                    }
+                    if(inverse)
+                        inverse[i] = id;
+                }
+                // sort the values found, and turn their numbers into ranks
+                std::vector<long> order(count);
+                std::iota(order.begin(), order.end(), 0L);
+                parallel_sort(order.data(), count, index_less<T, sort_less>{values, sort_less()});
+                std::vector<T> found(values, values + count);
+                std::vector<long> first(index, index ? index + count : index);
+                std::vector<long> rank(inverse ? count : 0);
+                for(long r = 0; r < count; ++r) {
+                    values[r] = found[order[r]];
+                    if(index)
+                        index[r] = first[order[r]];
+                    if(inverse)
+                        rank[order[r]] = r;
+                }
+                if(inverse)
+                    for(long i = 0; i < n; ++i)
+                        inverse[i] = rank[inverse[i]];
+                return count;
+            }
+
+        /* Deduplication by sorting, of a copy of the values or of their indices */
+        template<class T>
+            long unique_sort(T const* data, long n, T* values, long* index, long* inverse)
+            {
+                if(not index and not inverse) {
+                    if(values != data)
+                        std::copy(data, data + n, values);
+                    parallel_sort(values, n, sort_less());
+                    return std::unique(values, values + n) - values;
+                }
+                std::vector<long> order(n);
+                std::iota(order.begin(), order.end(), 0L);
+                parallel_sort(order.data(), n, index_less<T, sort_less>{data, sort_less()});
+                long count = 0;
+                for(long r = 0; r < n; ++r) {
+                    long const i = order[r];
+                    if(r == 0 or not (data[i] == data[order[r - 1]])) {
+                        values[count] = data[i];
+                        if(index)
+                            index[count] = i;
+                        ++count;
+                    }
+                    if(inverse)
+                        inverse[i] = count - 1;
+                }
+                return count;
+            }
+
+        /* Sorted distinct values of the `n' values of `data', stored in `values'.
+         * When not null, `index' receives the index of the first occurrence of each
+         * distinct value and `inverse' the rank of each value of `data' among the
+         * distinct ones; otherwise `values' may be `data' itself. Returns the number
+         * of distinct values.
+         *
+         * Integers spanning a range of at most about twice their number are handled
+         * by a table indexed by value, other large arithmetic inputs by hashing, in
+         * linear time; the remaining inputs are sorted.
+         */
+        template<class T>
+            typename std::enable_if<std::is_integral<T>::value, long>::type
+            unique_values(T const* data, long n, T* values, long* index, long* inverse)
+            {
+                if(not n)
+                    return 0;
+                T const lo = flat_reduce<min_op, T>(data, n), hi = flat_reduce<max_op, T>(data, n);
+                unsigned long const range = static_cast<unsigned long>(hi) - static_cast<unsigned long>(lo) + 1;
+                if(range != 0 and range <= 2 * static_cast<unsigned long>(n) + 1024)
+                    return unique_direct(data, n, lo, range, values, index, inverse);
+                if(n >= unique_hash_threshold)
+                    return unique_hash(data, n, values, index, inverse);
+                return unique_sort(data, n, values, index, inverse);
+            }
+        template<class T>
+            typename std::enable_if<std::is_floating_point<T>::value, long>::type
+            unique_values(T const* data, long n, T* values, long* index, long* inverse)
+            {
+                if(n >= unique_hash_threshold)
+                    return unique_hash(data, n, values, index, inverse);
+                return unique_sort(data, n, values, index, inverse);
+            }
+        template<class T>
+            typename std::enable_if<not std::is_arithmetic<T>::value, long>::type
+            unique_values(T const* data, long n, T* values, long* index, long* inverse)
+            {
+                return unique_sort(data, n, values, index, inverse);
+            }
+
+    }
+
+}
+
+#endif
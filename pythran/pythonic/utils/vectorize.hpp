@@ -0,0 +1,120 @@
+#ifndef PYTHONIC_UTILS_VECTORIZE_HPP
+#define PYTHONIC_UTILS_VECTORIZE_HPP
+
+#include <algorithm>
+#include <type_traits>
+
+#ifdef _OPENMP
+#include "pythonic/omp/in_parallel.hpp"
+#endif
+
+#ifndef PYTHONIC_EXPR_THRESHOLD
+#define PYTHONIC_EXPR_THRESHOLD 65536
+#endif
+
+#ifdef USE_BOOST_SIMD
+#include <boost/simd/sdk/simd/native.hpp>
+#include <boost/simd/sdk/meta/cardinal_of.hpp>
+#include <boost/simd/include/functions/unaligned_load.hpp>
+#include <boost/simd/include/functions/unaligned_store.hpp>
+#include <boost/simd/include/functions/splat.hpp>
+#endif
+
+namespace pythonic {
+
+    namespace utils {
+
+        /* Loads the value stored at `ptr' as a V, that is either a single value
+         * or, when boost.simd is enabled, a pack of consecutive values
+         */
+        template<class V, class T>
+            typename std::enable_if<std::is_arithmetic<V>::value, V>::type load(T const* ptr) {
+                return *ptr;
+            }
+        /* Turns the scalar `value' into a V, repeating it when V is a SIMD pack */
+        template<class V, class T>
+            typename std::enable_if<std::is_arithmetic<V>::value, V>::type splat(T value) {
+                return value;
+            }
+#ifdef USE_BOOST_SIMD
+        template<class V, class T>
+            typename std::enable_if<not std::is_arithmetic<V>::value, V>::type load(T const* ptr) {
+                return boost::simd::unaligned_load<V>(ptr);
+            }
+        template<class V, class T>
+            typename std::enable_if<not std::is_arithmetic<V>::value, V>::type splat(T value) {
+                return boost::simd::splat<V>(value);
+            }
+#endif
+
+        /* Tells whether the expression E can be loaded as V values */
+        template<class E, class V>
+            struct is_loadable_as {
+                template<class F>
+                    static auto check(F const* expr) -> decltype(std::declval<V&>() = expr->template load<V>(0L), std::true_type());
+                static std::false_type check(...);
+                static const bool value = decltype(check(static_cast<E const*>(nullptr)))::value;
+            };
+
+        /* Evaluates the vectorizable expression `expr' into the contiguous values of
+         * `out' from flat index `first' to flat index `last'
+         *
+         * The values are computed by SIMD packs when boost.simd is enabled and when
+         * every operation of the expression supports packs, the few values that do not
+         * fill a whole pack being computed one by one. Otherwise, a plain loop over
+         * the flat indices is run, which the compiler is free to vectorize.
+         */
+        template<class T, class E>
+            void vectorize(T* out, E const& expr, long first, long last, std::false_type) {
+                for(long i = first; i < last; ++i)
+                    out[i] = expr.template load<T>(i);
+            }
+#ifdef USE_BOOST_SIMD
+        template<class T, class E>
+            void vectorize(T* out, E const& expr, long first, long last, std::true_type) {
+                typedef boost::simd::native<T, BOOST_SIMD_DEFAULT_EXTENSION> pack;
+                static const long step = boost::simd::meta::cardinal_of<pack>::value;
+                long const bound = last - (last - first) % step;
+                for(long i = first; i < bound; i += step)
+                    boost::simd::unaligned_store(expr.template load<pack>(i), out + i);
+                vectorize(out, expr, bound, last, std::false_type());
+            }
+#endif
+
+        /* Splits the evaluation of `expr' into `out' among threads when OpenMP is
+         * enabled, the expression holds at least PYTHONIC_EXPR_THRESHOLD values
+         * and no parallel region is already running. Each thread gets one
+         * contiguous slice whose size is a multiple of 64 values, so that the
+         * slices do not share cache lines nor split SIMD packs.
+         */
+        template<class T, class E, class P>
+            void vectorize(T* out, E const& expr, long n, P pack_path) {
+#ifdef _OPENMP
+                if(n >= PYTHONIC_EXPR_THRESHOLD and not omp::in_parallel()) {
+#pragma omp parallel
+                    {
+                        long const nthreads = omp_get_num_threads();
+                        long const slice = ((n + nthreads - 1) / nthreads + 63) & ~63L;
+                        long const first = std::min(n, omp_get_thread_num() * slice);
+                        vectorize(out, expr, first, std::min(n, first + slice), pack_path);
+                    }
+                    return;
+                }
+#endif
+                vectorize(out, expr, 0, n, pack_path);
+            }
+        template<class T, class E>
+            void vectorize(T* out, E const& expr, long n) {
+#ifdef USE_BOOST_SIMD
+                typedef boost::simd::native<T, BOOST_SIMD_DEFAULT_EXTENSION> pack;
+                vectorize(out, expr, n, std::integral_constant<bool, is_loadable_as<E, pack>::value>());
+#else
+                vectorize(out, expr, n, std::false_type());
+#endif
+            }
+
+    }
+
+}
+
+#endif
@@ -5,13 +5,37 @@ This module provides a dummy parser for pythran annotations.
 import ply.lex as lex
 import ply.yacc as yacc
 import os.path
-from numpy import array
+from numpy import array, ndarray
 from numpy import uint8, uint16, uint32, uint64
 from numpy import int8, int16, int32, int64
 from numpy import float32, float64
 from numpy import complex64, complex128
 
 
+class FixedShapeArray(ndarray):
+    '''
+    Array type whose size along some dimensions is known,
+    `extents' holds these sizes, or None for unknown ones.
+    '''
+    extents = ()
+
+
+class StridedArray(FixedShapeArray):
+    '''
+    Array type accepting NumPy arrays of any layout, such as slices or
+    transposes of other arrays, without copying them.
+    '''
+    strided = True
+
+
+class FortranArray(FixedShapeArray):
+    '''
+    Array type for two-dimensional NumPy arrays stored in Fortran order,
+    that are accepted and returned without copy.
+    '''
+    order = 'F'
+
+
 class SpecParser:
     """ A parser that scans a file lurking for lines such as the one below.
     It then generates a pythran-compatible signature to inject into compile.
@@ -19,12 +43,17 @@ class SpecParser:
 #pythran export a(str)
 #pythran export a( (str,str), int, long list list)
 #pythran export a( {str} )
+#pythran export a( float[:,3] )
+#pythran export a( float[::,::] )
+#pythran export a( float[:,:] order F )
+#pythran memoize a
 """
 
     ## lex part
     reserved = {
         'pythran': 'PYTHRAN',
         'export': 'EXPORT',
+        'memoize': 'MEMOIZE',
         'list': 'LIST',
         'set': 'SET',
         'dict': 'DICT',
@@ -46,8 +75,10 @@ class SpecParser:
         'float64': 'FLOAT64',
         'complex64': 'COMPLEX64',
         'complex128': 'COMPLEX128',
+        'order': 'ORDER',
         }
-    tokens = (['IDENTIFIER', 'SHARP', 'COMMA', 'COLUMN', 'LPAREN', 'RPAREN']
+    tokens = (['IDENTIFIER', 'NUMBER', 'SHARP', 'COMMA', 'COLUMN', 'LPAREN',
+               'RPAREN']
               + list(reserved.values())
               + ['LARRAY', 'RARRAY'])
 
@@ -86,15 +117,26 @@ class SpecParser:
 
     def p_exports(self, p):
         '''exports :
-                   | export exports'''
+                   | export exports
+                   | memoize exports'''
         p[0] = self.exports
 
     def p_export(self, p):
         '''export : SHARP PYTHRAN EXPORT IDENTIFIER LPAREN opt_types RPAREN
-                  | SHARP PYTHRAN EXPORT EXPORT LPAREN opt_types RPAREN'''
+                  | SHARP PYTHRAN EXPORT EXPORT LPAREN opt_types RPAREN
+                  | SHARP PYTHRAN EXPORT MEMOIZE LPAREN opt_types RPAREN
+                  | SHARP PYTHRAN EXPORT ORDER LPAREN opt_types RPAREN'''
         # handle the unlikely case where a function name is ... export :-)
         self.exports[p[4]] = self.exports.get(p[4], ()) + (p[6],)
 
+    def p_memoize(self, p):
+        '''memoize : SHARP PYTHRAN MEMOIZE IDENTIFIER
+                   | SHARP PYTHRAN MEMOIZE EXPORT
+                   | SHARP PYTHRAN MEMOIZE MEMOIZE
+                   | SHARP PYTHRAN MEMOIZE ORDER'''
+        # memoized functions are flagged by the frontend
+        pass
+
     def p_opt_types(self, p):
         '''opt_types :
                      | types'''
@@ -110,6 +152,8 @@ class SpecParser:
                 | type LIST
                 | type SET
                 | type LARRAY RARRAY
+                | type LARRAY extents RARRAY
+                | type ORDER IDENTIFIER
                 | type COLUMN type DICT
                 | LPAREN types RPAREN'''
         if len(p) == 2:
@@ -121,13 +165,72 @@ class SpecParser:
         elif len(p) == 4 and p[3] == ')':
             p[0] = tuple(p[2])
         elif len(p) == 4 and p[3] == ']':
-            p[0] = array([p[1]])
+            p[0] = self.array_of(p[1], [None])
+        elif len(p) == 4 and p[2] == 'order':
+            p[0] = self.ordered(p[1], p[3])
+        elif len(p) == 5 and p[4] == ']':
+            p[0] = self.array_of(p[1], p[3])
         elif len(p) == 5:
             p[0] = {p[1]: p[3]}
         else:
             raise SyntaxError("Invalid Pythran spec. "
                               "Unknown text '{0}'".format(p.value))
 
+    def p_extents(self, p):
+        '''extents : extent
+                   | extent COMMA extents'''
+        p[0] = [p[1]] + ([] if len(p) == 2 else p[3])
+
+    def p_extent(self, p):
+        '''extent : NUMBER
+                  | COLUMN
+                  | COLUMN COLUMN'''
+        if len(p) == 3:
+            p[0] = '::'
+        else:
+            p[0] = None if p[1] == ':' else int(p[1])
+
+    @staticmethod
+    def array_of(elt, extents):
+        '''
+        Builds the type of an array of `elt' with one dimension per item of
+        `extents', a fixed size, None or '::', in front of the dimensions of
+        `elt'. A '::' extent makes the whole array strided.
+        '''
+        strided = '::' in extents or getattr(elt, 'strided', False)
+        t, extents = elt, tuple(None if e == '::' else e for e in extents)
+        for _ in extents:
+            t = array([t])
+        if isinstance(elt, ndarray):
+            extents += getattr(elt, 'extents', None) or (None,) * elt.ndim
+        if strided:
+            t = t.view(StridedArray)
+        if any(extent is not None for extent in extents):
+            t = t.view(StridedArray if strided else FixedShapeArray)
+            t.extents = extents
+        return t
+
+    @staticmethod
+    def ordered(t, order):
+        '''
+        Builds the type of the array `t' with its values stored in `order',
+        'C' for row-major order or 'F' for column-major order
+        '''
+        # not a SyntaxError, from which ply silently recovers
+        if not isinstance(t, ndarray):
+            raise ValueError("Invalid Pythran spec. "
+                             "Order given for a non-array type")
+        if order not in ('C', 'F'):
+            raise ValueError("Invalid Pythran spec. "
+                             "Unknown order '{0}'".format(order))
+        if order == 'C' or t.ndim == 1 or getattr(t, 'strided', False):
+            return t
+        # arrays of more dimensions are handled as strided arrays
+        extents = getattr(t, 'extents', ())
+        t = t.view(FortranArray if t.ndim == 2 else StridedArray)
+        t.extents = extents
+        return t
+
     def p_term(self, p):
         '''term : STR
                 | BOOL
@@ -175,7 +278,14 @@ class SpecParser:
         # filter out everything that does not start with a #pythran
         pythran_data = "\n".join((line if line.startswith('#pythran') else ''
                                   for line in data.split('\n')))
-        self.parser.parse(pythran_data, lexer=self.lexer)
+        try:
+            self.parser.parse(pythran_data, lexer=self.lexer)
+        except ValueError as e:
+            err = SyntaxError(str(e))
+            err.lineno = self.lexer.lineno
+            if self.input_file:
+                err.filename = self.input_file
+            raise err
         if not self.exports:
             import logging
             logging.warn("No pythran specification, "
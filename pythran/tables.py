@@ -234,6 +234,7 @@ modules = {
         "arctanh": ConstFunctionIntr(),
         "argmax": ConstFunctionIntr(),
         "argmin": ConstFunctionIntr(),
+        "argpartition": ConstFunctionIntr(),
         "argsort": ConstFunctionIntr(),
         "argwhere": ConstFunctionIntr(),
         "around": ConstFunctionIntr(),
@@ -357,7 +358,9 @@ modules = {
         "max": ConstMethodIntr(),
         "maximum": ConstFunctionIntr(),
         "mean": ConstMethodIntr(),
-        "median": ConstFunctionIntr(),
+        # overwrite_input lets median and percentile partition their input
+        "median": FunctionIntr(argument_effects=[UpdateEffect()]
+                               + [ReadEffect()] * 3),
         "min": ConstMethodIntr(),
         "minimum": ConstFunctionIntr(),
         "mod": ConstFunctionIntr(),
@@ -380,6 +383,9 @@ modules = {
         "ones": ConstFunctionIntr(),
         "ones_like": ConstFunctionIntr(),
         "outer": ConstFunctionIntr(),
+        "partition": ConstFunctionIntr(),
+        "percentile": FunctionIntr(argument_effects=[UpdateEffect()]
+                                   + [ReadEffect()] * 4),
         "pi": ConstantIntr(),
         "place": FunctionIntr(),
         "power": ConstFunctionIntr(),
@@ -1015,6 +1021,19 @@ modules = {
     "__finfo__": {
         "eps": AttributeIntr(0),
         },
+    # BLAS kernels of recognized loop nests
+    "__blas__": {
+        "gemm": FunctionIntr(argument_effects=[ReadEffect(), ReadEffect(),
+                                               UpdateEffect()]
+                             + [ReadEffect()] * 3),
+        "gemv": FunctionIntr(argument_effects=[ReadEffect(), ReadEffect(),
+                                               UpdateEffect()]
+                             + [ReadEffect()] * 2),
+        "dot": ConstFunctionIntr(),
+        },
+    "__alias__": {
+        "disjoint": ConstFunctionIntr(),
+        },
     "__ndarray__": {
         "dtype": AttributeIntr(7),
         "fill": MethodIntr(),
@@ -0,0 +1,7 @@
+#pythran export ufunc_add(float[], float[], int)
+#runas import numpy; a = numpy.arange(100000.); b = numpy.ones(100000); ufunc_add(a, b, 100)
+import numpy
+def ufunc_add(a, b, n):
+    for i in range(n):
+        a = numpy.add(a, b)
+    return a
@@ -0,0 +1,7 @@
+#pythran export ufunc_exp(float[], int)
+#runas import numpy; a = numpy.arange(100000.); ufunc_exp(a, 100)
+import numpy
+def ufunc_exp(a, n):
+    for i in range(n):
+        a = numpy.exp(-a)
+    return a
@@ -0,0 +1,7 @@
+#pythran export ufunc_multiply(float[], float[], int)
+#runas import numpy; a = numpy.arange(100000.); b = numpy.ones(100000); ufunc_multiply(a, b, 100)
+import numpy
+def ufunc_multiply(a, b, n):
+    for i in range(n):
+        a = numpy.multiply(a, b)
+    return a
@@ -0,0 +1,7 @@
+#pythran export ufunc_sqrt(float[], int)
+#runas import numpy; a = numpy.arange(100000.); ufunc_sqrt(a, 100)
+import numpy
+def ufunc_sqrt(a, n):
+    for i in range(n):
+        a = numpy.sqrt(a)
+    return a
@@ -105,6 +105,18 @@ def loop_tuple_unpacking_in_generator(n):
     return (0,0) in f'''
         self.run_test(code, 10, loop_tuple_unpacking_in_generator=[int])
 
+    def test_single_loop_generator(self):
+        code = '''
+def squares(l, a):
+    for i in l:
+        if i % a:
+            yield i * i
+def single_loop_generator(n):
+    f = squares(range(n), 3)
+    first = f.next()
+    return first, [i + 1 for i in f]'''
+        self.run_test(code, 10, single_loop_generator=[int])
+
     def test_assign_in_except(self):
         code = '''
 def assign_in_except():
@@ -160,3 +172,14 @@ def combiner_on_empty_list():
 
     def test_add_arrays(self):
         self.run_test('def add_arrays(s): return (s,s) + (s,)', 1, add_arrays=[int])
+
+    def test_release_temporaries(self):
+        code = '''
+def release_temporaries(n):
+    from numpy import ones
+    a = ones(n)
+    b = a + a
+    c = b * b
+    l = [x for x in c]
+    return c, len(l) + len(l)'''
+        self.run_test(code, 5, release_temporaries=[int])
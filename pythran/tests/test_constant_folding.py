@@ -31,3 +31,39 @@ class TestConstantUnfolding(TestEnv):
 
     def test_constant_folding_too_expansive_calls(self):
         self.run_test("def constant_folding_too_expansive_calls(): return range(2**16)", constant_folding_too_expansive_calls=[])
+
+    def test_constant_folding_timeout(self):
+        init = """
+def constant_folding_timeout():
+    return sum(xrange(10 ** 12))"""
+        ref = """import itertools
+def constant_folding_timeout():
+    return __builtin__.sum(__builtin__.xrange(1000000000000))
+def __init__():
+    return __builtin__.None
+__init__()"""
+        self.check_ast(init, ref, ["pythran.optimizations.ConstantFolding"])
+
+    def test_constant_folding_memory_budget(self):
+        init = """
+def constant_folding_memory_budget():
+    return len([0] * 2 ** 40)"""
+        ref = """import itertools
+def constant_folding_memory_budget():
+    return __builtin__.len(([0] * 1099511627776))
+def __init__():
+    return __builtin__.None
+__init__()"""
+        self.check_ast(init, ref, ["pythran.optimizations.ConstantFolding"])
+
+    def test_constant_folding_result_too_large(self):
+        init = """
+def constant_folding_result_too_large():
+    return [1] * 2 ** 13"""
+        ref = """import itertools
+def constant_folding_result_too_large():
+    return ([1] * 8192)
+def __init__():
+    return __builtin__.None
+__init__()"""
+        self.check_ast(init, ref, ["pythran.optimizations.ConstantFolding"])
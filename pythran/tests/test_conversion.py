@@ -1,5 +1,6 @@
 from test_env import TestEnv
 from unittest import skip
+from pythran import spec_parser
 import numpy as np
 
 class TestConversion(TestEnv):
@@ -31,3 +32,45 @@ class TestConversion(TestEnv):
     def test_dict_of_complex64_and_complex_128(self):
         self.run_test('def dict_of_complex64_and_complex_128(l): return l.keys(), l.values()', {np.complex64(3.1+1.1j):4.5+5.5j}, dict_of_complex64_and_complex_128=[{np.complex64:np.complex128}])
 
+    def test_strided_array(self):
+        code = """
+#pythran export strided_array(float[:, ::])
+import numpy
+def strided_array(a):
+    return numpy.sum(a), a[1] * 2, a[:, ::-1].T"""
+        self.run_test(code, np.arange(24.).reshape(4, 6)[::2, 1::2],
+                      **spec_parser(code))
+
+    def test_strided_array_contiguous(self):
+        code = """
+#pythran export strided_array_contiguous(int[::], int)
+def strided_array_contiguous(a, n):
+    a[1:] = n
+    return a, len(a)"""
+        self.run_test(code, np.arange(5), 3, **spec_parser(code))
+
+    def test_non_contiguous_array(self):
+        code = """
+#pythran export non_contiguous_array(float[:, :])
+def non_contiguous_array(a):
+    return a[0] + a[-1]"""
+        self.run_test(code, np.arange(12.).reshape(3, 4).T,
+                      **spec_parser(code))
+
+    def test_fortran_array(self):
+        code = """
+#pythran export fortran_array(float[:, :] order F)
+import numpy
+def fortran_array(a):
+    return numpy.sum(a, 0), a[1, 2], numpy.argmax(a, 1), a"""
+        self.run_test(code, np.asfortranarray(np.arange(12.).reshape(3, 4)),
+                      **spec_parser(code))
+
+    def test_fortran_array_from_c_order(self):
+        code = """
+#pythran export fortran_array_from_c_order(int[:, :] order F, int)
+def fortran_array_from_c_order(a, n):
+    a[0] = n
+    return a.T, len(a)"""
+        self.run_test(code, np.arange(12).reshape(3, 4), 5,
+                      **spec_parser(code))
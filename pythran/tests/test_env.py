@@ -2,7 +2,7 @@ from pythran import compile_pythrancode
 from pythran.backend import Python
 from pythran.middlend import refine
 from pythran.passmanager import PassManager
-from pythran.toolchain import _parse_optimization
+from pythran.toolchain import _parse_optimization, _flag_fixed_shapes
 import pythran.frontend as frontend
 from imp import load_dynamic
 import unittest
@@ -164,7 +164,8 @@ class TestEnv(unittest.TestCase):
                     "expected exception was %s, but received %s" %
                     (python_exception_type, pythran_exception_type))
 
-    def check_ast(self, code, ref, optimizations):
+    def check_ast(self, code, ref, optimizations, fixed_point=(),
+                  max_iterations=4, specs=None):
         """
             Check if a final node is the same as expected
 
@@ -176,6 +177,15 @@ class TestEnv(unittest.TestCase):
                 The expected dump for the AST
             optimizations : [optimization]
                 list of optimisation to apply
+            fixed_point : [optimization]
+                list of optimisation to apply until none of them changes
+                the AST
+            max_iterations : int
+                maximum number of times the fixed_point optimizations are
+                applied
+            specs : dict
+                export specifications whose fixed extents are known to the
+                optimizations
 
             Raises
             ------
@@ -184,10 +194,13 @@ class TestEnv(unittest.TestCase):
         """
         pm = PassManager("testing")
 
-        ir, _ = frontend.parse(pm, code)
+        ir, renamings = frontend.parse(pm, code)
+        if specs:
+            _flag_fixed_shapes(ir, specs, renamings)
 
         optimizations = map(_parse_optimization, optimizations)
-        refine(pm, ir, optimizations)
+        fixed_point = map(_parse_optimization, fixed_point)
+        refine(pm, ir, optimizations, fixed_point, max_iterations)
 
         content = pm.dump(Python, ir)
 
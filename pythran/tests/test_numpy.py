@@ -434,9 +434,39 @@ def np_rosen_der(x):
     def test_median1(self):
         self.run_test("def np_median1(a): from numpy import median ; return median(a)", numpy.array([1, 2, 3, 4,5]), np_median1=[numpy.array([int])])
 
+    def test_median2(self):
+        self.run_test("def np_median2(a): from numpy import median ; return median(a, 1)", numpy.array([[1, 5, 2, 8], [3, 4, 9, 0]]), np_median2=[numpy.array([[int]])])
+
+    def test_median3(self):
+        self.run_test("def np_median3(a): from numpy import median ; return median(a * 2., 0)", numpy.arange(24.).reshape(2, 3, 4) % 5, np_median3=[numpy.array([[[float]]])])
+
+    def test_median4(self):
+        self.run_test("def np_median4(a): from numpy import median ; return median(a, None, None, True)", numpy.array([3., 5., 1., 2.]), np_median4=[numpy.array([float])])
+
+    def test_percentile0(self):
+        self.run_test("def np_percentile0(a): from numpy import percentile ; return percentile(a, 30)", numpy.array([[10, 7, 4], [3, 2, 1]]), np_percentile0=[numpy.array([[int]])])
+
+    def test_percentile1(self):
+        self.run_test("def np_percentile1(a): from numpy import percentile ; return percentile(a, [0, 25.5, 100], 1)", numpy.array([[10., 7., 4.], [3., 2., 1.]]), np_percentile1=[numpy.array([[float]])])
+
+    def test_percentile2(self):
+        self.run_test("def np_percentile2(a): from numpy import percentile ; return percentile(a + 1, 50, 0)", numpy.array([[10, 7, 4], [3, 2, 1]]), np_percentile2=[numpy.array([[int]])])
+
+    def test_partition0(self):
+        self.run_test("def np_partition0(a): from numpy import partition ; b = partition(a, 3) ; return b[3], sorted(b[:3]), sorted(b[4:])", numpy.array([3, 4, 2, 1, 8, 5, 9]), np_partition0=[numpy.array([int])])
+
+    def test_partition1(self):
+        self.run_test("def np_partition1(a): from numpy import partition ; b = partition(a, [0, -1], 0) ; return b[0] + b[-1]", numpy.arange(12.).reshape(4, 3) % 5, np_partition1=[numpy.array([[float]])])
+
+    def test_argpartition0(self):
+        self.run_test("def np_argpartition0(a): from numpy import argpartition ; return a[argpartition(a, 2)[2]]", numpy.array([3, 4, 2, 1, 8, 5, 9]), np_argpartition0=[numpy.array([int])])
+
     def test_mean0(self):
         self.run_test("def np_mean0(a): from numpy import mean ; return mean(a)", numpy.array([[1, 2], [3, 4]]), np_mean0=[numpy.array([[int]])])
 
+    def test_mean1(self):
+        self.run_test("def np_mean1(a): from numpy import mean ; return mean(a, 1)", numpy.arange(24.).reshape(2, 3, 4), np_mean1=[numpy.array([[[float]]])])
+
     def test_logspace0(self):
         self.run_test("def np_logspace0(start, stop): from numpy import logspace ; start, stop = 3., 4. ; return logspace(start, stop, 4)", 3., 4., np_logspace0=[float, float])
 
@@ -506,6 +536,9 @@ def np_rosen_der(x):
     def test_intersect1d0(self):
         self.run_test("def np_intersect1d0(a): from numpy import intersect1d ; b = [3, 1, 2, 1] ; return intersect1d(a,b)", [1, 3, 4, 3], np_intersect1d0=[[int]])
 
+    def test_intersect1d1(self):
+        self.run_test("def np_intersect1d1(a, b): from numpy import intersect1d ; return intersect1d(a, 2 * b)", numpy.arange(10000) * 3 % 7001, numpy.arange(5000) * 7 % 3001, np_intersect1d1=[numpy.array([int]), numpy.array([int])])
+
     def test_insert0(self):
         self.run_test("def np_insert0(a): from numpy import insert ; return insert(a, 1, 5)", numpy.array([[1, 1], [2, 2], [3, 3]]), np_insert0=[numpy.array([[int]])])
 
@@ -521,6 +554,12 @@ def np_rosen_der(x):
     def test_inner1(self):
         self.run_test("def np_inner1(x): from numpy import inner ; y = [2, 3] ; return inner(x,y)", [2, 3], np_inner1=[[int]])
 
+    def test_inner2(self):
+        self.run_test("def np_inner2(x, y): from numpy import inner ; return inner(x, y)", numpy.arange(12.).reshape(4, 3), numpy.arange(6.).reshape(2, 3), np_inner2=[numpy.array([[float]]), numpy.array([[float]])])
+
+    def test_inner3(self):
+        self.run_test("def np_inner3(x, y): from numpy import inner ; return inner(x, y)", numpy.arange(3.), numpy.arange(6.).reshape(2, 3), np_inner3=[numpy.array([float]), numpy.array([[float]])])
+
     def test_indices0(self):
         self.run_test("def np_indices0(s): from numpy import indices ; return indices(s)", (2, 3), np_indices0=[(int, int)])
 
@@ -716,6 +755,12 @@ def np_rosen_der(x):
     def test_sort4(self):
         self.run_test("def np_sort4(a): from numpy import sort ; return sort(a, 1)", numpy.arange(2*3*4, 0, -1).reshape(2,3,4), np_sort4=[numpy.array([[[int]]])])
 
+    def test_sort5(self):
+        self.run_test("def np_sort5(a): from numpy import sort ; return sort(a)", numpy.array([2., numpy.nan, 1., -3., numpy.nan, 0.]), np_sort5=[numpy.array([float])])
+
+    def test_sort6(self):
+        self.run_test("def np_sort6(a): from numpy import sort ; return sort(2 * a, 0)", (numpy.arange(60) * 7 % 11).reshape(3, 4, 5), np_sort6=[numpy.array([[[int]]])])
+
     def test_sort_complex0(self):
         self.run_test("def np_sort_complex0(a): from numpy import sort_complex ; return sort_complex(a)", numpy.array([[1,6],[7,5]]), np_sort_complex0=[numpy.array([[int]])])
 
@@ -845,6 +890,18 @@ def np_rosen_der(x):
     def test_dot4(self):
         self.run_test("def np_dot4(x): from numpy import dot ; y = [2, 3] ; return dot(x,y)", numpy.array([2, 3]), np_dot4=[numpy.array([int])])
 
+    def test_dot5(self):
+        self.run_test("def np_dot5(x, y): from numpy import dot ; return dot(x, y)", numpy.arange(12.).reshape(4, 3), numpy.arange(15.).reshape(3, 5), np_dot5=[numpy.array([[float]]), numpy.array([[float]])])
+
+    def test_dot6(self):
+        self.run_test("def np_dot6(x, y): from numpy import dot ; return dot(x, y + 1)", numpy.arange(12.).reshape(4, 3), numpy.arange(3.), np_dot6=[numpy.array([[float]]), numpy.array([float])])
+
+    def test_dot7(self):
+        self.run_test("def np_dot7(x, y): from numpy import dot ; return dot(x, y)", numpy.arange(4.) * 1j, (numpy.arange(12.) + 1j).reshape(4, 3), np_dot7=[numpy.array([complex]), numpy.array([[complex]])])
+
+    def test_dot8(self):
+        self.run_test("def np_dot8(x, y): from numpy import dot ; return dot(x, y)", numpy.arange(12, dtype=numpy.float32).reshape(4, 3), numpy.arange(3, dtype=numpy.float32).reshape(3, 1), np_dot8=[numpy.array([[numpy.float32]]), numpy.array([[numpy.float32]])])
+
     def test_digitize0(self):
         self.run_test("def np_digitize0(x): from numpy import array, digitize ; bins = array([0.0, 1.0, 2.5, 4.0, 10.0]) ; return digitize(x, bins)", numpy.array([0.2, 6.4, 3.0, 1.6]), np_digitize0=[numpy.array([float])])
 
@@ -926,6 +983,9 @@ def np_trim_zeros2(x):
     def test_union1d(self):
         self.run_test("def np_union1d(x): from numpy import arange, union1d ; y = arange(1,4); return union1d(x, y)", numpy.arange(-1,2), np_union1d=[numpy.array([int])])
 
+    def test_union1d1(self):
+        self.run_test("def np_union1d1(x, y): from numpy import union1d ; return union1d(x, y)", numpy.arange(6000) % 17 * 0.5, numpy.arange(10) * 1000, np_union1d1=[numpy.array([float]), numpy.array([int])])
+
     def test_unique0(self):
         self.run_test("def np_unique0(x): from numpy import unique ; return unique(x)", numpy.array([1,1,2,2,2,1,5]), np_unique0=[numpy.array([int])])
 
@@ -938,6 +998,12 @@ def np_trim_zeros2(x):
     def test_unique3(self):
         self.run_test("def np_unique3(x): from numpy import unique ; return unique(x, True, True)", numpy.array([1,1,2,2,2,1,5]), np_unique3=[numpy.array([int])])
 
+    def test_unique4(self):
+        self.run_test("def np_unique4(x): from numpy import unique ; return unique(x, True, True)", numpy.arange(10000) * 7919 % 1009 * 1000003, np_unique4=[numpy.array([int])])
+
+    def test_unique5(self):
+        self.run_test("def np_unique5(x): from numpy import unique ; return unique(x, True, True)", numpy.floor(numpy.sin(numpy.arange(10000.)) * 100) / 8, np_unique5=[numpy.array([float])])
+
     def test_unwrap0(self):
         self.run_test("def np_unwrap0(x): from numpy import unwrap, pi ; x[:3] += 2*pi; return unwrap(x)", numpy.arange(6), np_unwrap0=[numpy.array([int])])
 
@@ -1088,6 +1154,9 @@ def test_copy0(x):
     def test_bincount1(self):
         self.run_test("def np_bincount1(a, w): from numpy import bincount; return bincount(a,w)", numpy.array([0, 1, 1, 2, 2, 2]), numpy.array([0.3, 0.5, 0.2, 0.7, 1., -0.6]), np_bincount1=[numpy.array([int]), numpy.array([int])])
 
+    def test_bincount2(self):
+        self.run_test("def np_bincount2(a): from numpy import bincount ; return bincount(a, None, 12)", numpy.arange(30) * 7 % 10, np_bincount2=[numpy.array([int])])
+
     def test_binary_repr0(self):
         self.run_test("def np_binary_repr0(a): from numpy import binary_repr ; return binary_repr(a)", 3, np_binary_repr0=[int])
 
@@ -1259,6 +1328,12 @@ def test_copy0(x):
     def test_argsort1(self):
         self.run_test("def np_argsort1(x): from numpy import argsort ; return argsort(x)", numpy.array([[3, 1, 2], [1 , 2, 3]]), np_argsort1=[numpy.array([[int]])])
 
+    def test_argsort2(self):
+        self.run_test("def np_argsort2(x): from numpy import argsort ; return argsort(x, 0)", (numpy.arange(60) * 7 % 11).reshape(3, 4, 5), np_argsort2=[numpy.array([[[int]]])])
+
+    def test_argsort3(self):
+        self.run_test("def np_argsort3(x): from numpy import argsort ; return argsort(x)", numpy.array([3, 1, 2, 1, 3, 1]), np_argsort3=[numpy.array([int])])
+
     def test_argmax0(self):
         self.run_test("def np_argmax0(a): from numpy import argmax ; return argmax(a)", numpy.arange(6).reshape(2,3), np_argmax0=[numpy.array([[int]])])
 
@@ -1271,6 +1346,12 @@ def test_copy0(x):
     def test_argmin1(self):
         self.run_test("def np_argmin1(a): from numpy import argmin ; return argmin(a)", [1,2,3], np_argmin1=[[int]])
 
+    def test_argmax2(self):
+        self.run_test("def np_argmax2(a): from numpy import argmax ; return argmax(a, 1)", numpy.array([[3, 1, 4], [1, 5, 9], [2, 6, 5]]), np_argmax2=[numpy.array([[int]])])
+
+    def test_argmin2(self):
+        self.run_test("def np_argmin2(a): from numpy import argmin ; return argmin(a, 0)", (numpy.arange(24) % 7).reshape(2, 3, 4), np_argmin2=[numpy.array([[[int]]])])
+
     def test_append0(self):
         self.run_test("def np_append0(a): from numpy import append ; b = [[4, 5, 6], [7, 8, 9]] ; return append(a,b)", [1, 2, 3], np_append0=[[int]])
 
@@ -1490,6 +1571,12 @@ def test_copy0(x):
     def test_sum5_(self):
         self.run_test("def np_sum5_(a): return a.sum(0)", numpy.arange(10), np_sum5_=[numpy.array([int])])
 
+    def test_sum6_(self):
+        self.run_test("def np_sum6_(a): return a.sum(1)", numpy.arange(60.).reshape(3, 4, 5), np_sum6_=[numpy.array([[[float]]])])
+
+    def test_sum7_(self):
+        self.run_test("def np_sum7_(a): return (a > 10).sum(0)", numpy.arange(60).reshape(3, 4, 5), np_sum7_=[numpy.array([[[int]]])])
+
     def test_amin_amax(self):
         self.run_test("def np_amin_amax(a):\n from numpy import amin,amax\n return amin(a), amax(a)",numpy.arange(10),  np_amin_amax=[numpy.array([int])])
 
@@ -1508,6 +1595,9 @@ def test_copy0(x):
     def test_min5_(self):
         self.run_test("def np_min5_(a): return a.min(0)", numpy.arange(10), np_min5_=[numpy.array([int])])
 
+    def test_min6_(self):
+        self.run_test("def np_min6_(a): return a.min(1)", numpy.cos(numpy.arange(60.)).reshape(3, 4, 5), np_min6_=[numpy.array([[[float]]])])
+
     def test_max_(self):
         self.run_test("def np_max_(a): return a.max()", numpy.arange(10), np_max_=[numpy.array([int])])
 
@@ -1523,6 +1613,9 @@ def test_copy0(x):
     def test_max5_(self):
         self.run_test("def np_max5_(a): return a.max(0)", numpy.arange(10), np_max5_=[numpy.array([int])])
 
+    def test_max6_(self):
+        self.run_test("def np_max6_(a): return a.max(2)", numpy.sin(numpy.arange(60.)).reshape(3, 4, 5), np_max6_=[numpy.array([[[float]]])])
+
     def test_all_(self):
         self.run_test("def np_all_(a): return a.all()", numpy.arange(10), np_all_=[numpy.array([int])])
 
@@ -1715,6 +1808,15 @@ def test_copy0(x):
     def test_alltrue1(self):
         self.run_test("def np_alltrue1(a): from numpy import alltrue ; return alltrue(a >= 5)", numpy.array([1, 5, 2, 7]), np_alltrue1=[numpy.array([int])])
 
+    def test_parallel_expr0(self):
+        self.run_test("def np_parallel_expr0(a, b): from numpy import sqrt ; return sqrt(a * b) + 1", numpy.arange(100003.), numpy.arange(100003.), np_parallel_expr0=[numpy.array([float]), numpy.array([float])])
+
+    def test_parallel_expr1(self):
+        self.run_test('def np_parallel_expr1(a):\n s = [0.] * 4\n "omp parallel for"\n for i in range(4):\n  s[i] = (a * i + 1)[i]\n return s', numpy.arange(100003.), np_parallel_expr1=[numpy.array([float])])
+
+    def test_recycled_temporaries(self):
+        self.run_test("def np_recycled_temporaries(a, n):\n for i in range(n):\n  a = (a + 1j) * 0.5\n return a.flatten()", numpy.ones((7, 3), complex), 10, np_recycled_temporaries=[numpy.array([[complex]]), int])
+
 
 # automatic generation of basic test cases for ufunc
 binary_ufunc = (
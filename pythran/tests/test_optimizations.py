@@ -1,4 +1,6 @@
 from test_env import TestEnv
+from pythran import spec_parser
+import numpy
 
 
 class TestOptimization(TestEnv):
@@ -308,3 +310,615 @@ def full_unroll1():
                     for m in range(3):
                         c += 1
     return c""", full_unroll1=[])
+
+    def test_list_to_tuple0(self):
+        init = """
+def list_to_tuple0(x, y, z):
+    d = [x, y, z]
+    c = [1., 2., 3.]
+    s = 0.
+    for k in range(3):
+        s += c[k] * c[k]
+    return s + d[0] * d[1] + d[2]"""
+
+        ref = """import itertools
+def list_to_tuple0(x, y, z):
+    d = (x, y, z)
+    c = (1.0, 2.0, 3.0)
+    s = 0.0
+    k = 0
+    s += (c[k] * c[k])
+    k = 1
+    s += (c[k] * c[k])
+    k = 2
+    s += (c[k] * c[k])
+    return ((s + (d[0] * d[1])) + d[2])
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.ConstantFolding", "pythran.optimizations.LoopFullUnrolling", "pythran.optimizations.ListToTuple"])
+
+    def test_list_to_tuple_escape(self):
+        init = """
+def list_to_tuple_escape(x, i):
+    d = [x, x]
+    e = [1, 2]
+    e.append(3)
+    f = [1, 2]
+    g = [x, 1]
+    return d[i] + e[0] + f[-1] + sum(g), d"""
+
+        ref = """import itertools
+def list_to_tuple_escape(x, i):
+    d = [x, x]
+    e = [1, 2]
+    __list__.append(e, 3)
+    f = [1, 2]
+    g = [x, 1]
+    return ((((d[i] + e[0]) + f[(-1)]) + __builtin__.sum(g)), d)
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.ListToTuple"])
+
+    def test_list_to_tuple1(self):
+        self.run_test("""
+def list_to_tuple1(x):
+    s = 0.
+    for i in range(len(x)):
+        c = [.5, 1.5, -2.]
+        d = [x[i], 2 * x[i]]
+        for k in range(3):
+            s += c[k] * x[i]
+        s += max(c) + sum(c) + d[1] / d[0]
+    return s""", [1., 2., 3.], list_to_tuple1=[[float]])
+
+    def test_in_place_update0(self):
+        init = """
+import numpy
+def in_place_update0(n, b):
+    a = numpy.ones(n)
+    c = numpy.ones(n)
+    d = c
+    e = numpy.ones(n)
+    l = [1]
+    for i in range(n):
+        a = a * 0.5
+        b = b + a
+        c = c + a
+        e = e - e[::-1]
+        l = l + [i]
+    return a, b, d, e, l"""
+
+        ref = """import itertools
+import numpy as pythonic::numpy
+def in_place_update0(n, b):
+    b_ = b
+    a = numpy.ones(n)
+    c = numpy.ones(n)
+    d = c
+    e = numpy.ones(n)
+    l = [1]
+    for i in __builtin__.range(n):
+        a *= 0.5
+        b_ = (b_ + a)
+        c = (c + a)
+        e = (e - e[::(-1)])
+        l = (l + [i])
+    return (a, b_, d, e, l)
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.InPlaceUpdate"])
+
+    def test_in_place_update1(self):
+        self.run_test("""
+import numpy
+def in_place_update1(n):
+    u = numpy.ones(n)
+    v = numpy.ones(n)
+    w = v
+    for i in range(3):
+        u = u + 2. * i
+        v = v * 0.5
+    return u, v, w""", 10, in_place_update1=[int])
+
+    def test_in_place_update2(self):
+        init = """
+import numpy
+def in_place_update2(n, m):
+    a = numpy.ones(n)
+    b = a[1:]
+    c = numpy.ones((n, m))
+    d = c.T
+    e = numpy.ones(n * m)
+    f = numpy.reshape(e, (n, m))
+    g = numpy.ones(n)
+    h = numpy.ones((1, m))
+    for i in range(n):
+        a = a * 2
+        c = c * 2
+        e = e * 2
+        g = g + a
+        h = h * c
+    return b, d, f, g, h"""
+
+        ref = """import itertools
+import numpy as pythonic::numpy
+def in_place_update2(n, m):
+    a = numpy.ones(n)
+    b = a[1:]
+    c = numpy.ones((n, m))
+    d = __builtin__.getattr(c, 'T')
+    e = numpy.ones((n * m))
+    f = numpy.reshape(e, (n, m))
+    g = numpy.ones(n)
+    h = numpy.ones((1, m))
+    for i in __builtin__.range(n):
+        a = (a * 2)
+        c = (c * 2)
+        e = (e * 2)
+        g = (g + a)
+        h = (h * c)
+    return (b, d, f, g, h)
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.InPlaceUpdate"])
+
+    def test_function_specialization0(self):
+        init = """
+def step(grid, k, periodic):
+    s = 0
+    for i in range(k):
+        s += grid[i]
+    if periodic:
+        s += grid[-1]
+    return s
+def function_specialization0(grid):
+    return step(grid, 2, False) + step(grid, len(grid), True)"""
+
+        ref = """import itertools
+def step(grid, k, periodic):
+    s = 0
+    for i in __builtin__.range(k):
+        s += grid[i]
+    if periodic:
+        s += grid[(-1)]
+    return s
+def step_0(grid):
+    s = 0
+    i = 0
+    s += grid[i]
+    i = 1
+    s += grid[i]
+    pass
+    return s
+def step_1(grid, k):
+    s = 0
+    for i in __builtin__.range(k):
+        s += grid[i]
+    s += grid[(-1)]
+    return s
+def function_specialization0(grid):
+    return (step_0(grid) + step_1(grid, __builtin__.len(grid)))
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.FunctionSpecialization", "pythran.optimizations.ConstantFolding", "pythran.optimizations.LoopFullUnrolling", "pythran.optimizations.DeadCodeElimination"])
+
+    def test_function_specialization1(self):
+        self.run_test("""
+def step(grid, k, periodic):
+    s = 0
+    for i in range(k):
+        s += grid[i]
+    if periodic:
+        s += grid[-1]
+    return s
+def function_specialization1(grid):
+    return step(grid, 2, False) + step(grid, len(grid), True)""", [1, 2, 3], function_specialization1=[[int]])
+
+    def test_shape_specialization0(self):
+        code = """
+#pythran export shape_specialization0(float[:,3])
+import numpy
+def shape_specialization0(pts):
+    out = numpy.zeros(len(pts))
+    for i in range(len(pts)):
+        for j in range(pts.shape[1]):
+            out[i] += pts[i][j] * pts[i][j]
+    return out, pts.ndim"""
+        self.run_test(code, numpy.arange(12.).reshape(4, 3),
+                      **spec_parser(code))
+
+    def test_shape_specialization1(self):
+        init = """
+#pythran export shape_specialization1(float[:,3,4], int)
+def shape_specialization1(pts, t):
+    s = 0
+    for i in range(len(pts)):
+        s += len(pts[i]) + len(pts[i, 1:]) + len(pts[:, 2][0])
+    idx = (t, 1)
+    s += len(pts[idx]) + len(pts[t]) + len(pts[1:][0])
+    return s"""
+
+        ref = """import itertools
+def shape_specialization1(pts, t):
+    s = 0
+    for i in __builtin__.range(__builtin__.len(pts)):
+        s += ((3 + __builtin__.len(pts[i, 1:])) + 4)
+    idx = (t, 1)
+    s += ((__builtin__.len(pts[idx]) + __builtin__.len(pts[t])) + 3)
+    return s
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.ShapeSpecialization"],
+                       specs=spec_parser(init))
+
+    def test_fixed_point(self):
+        init = """
+def fixed_point(a):
+    if 1 > 2:
+        b = a
+    else:
+        b = 3
+    return b + b"""
+        ref = """import itertools
+def fixed_point(a):
+    pass
+    return 6
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, [], ["pythran.optimizations.ForwardSubstitution", "pythran.optimizations.ConstantFolding", "pythran.optimizations.DeadCodeElimination"])
+
+    def test_iterator_fusion0(self):
+        init = """
+def iterator_fusion0(l, a):
+    s = 0
+    for x in map(lambda y: y * a, filter(lambda y: y > a, l)):
+        s += x
+    return s, sum(map(abs, map(lambda y: y - a, l)))"""
+
+        ref = """import functools
+import itertools
+def iterator_fusion0(l, a):
+    s = 0
+    for x_ in l:
+        if iterator_fusion0_lambda1(a, x_):
+            x = iterator_fusion0_lambda0(a, x_)
+            s += x
+    return (s, __builtin__.sum(itertools.imap(functools.partial(iterator_fusion0_fused0, a), l)))
+def __init__():
+    return __builtin__.None
+def iterator_fusion0_lambda0(a, y):
+    return (y * a)
+def iterator_fusion0_lambda1(a, y):
+    return (y > a)
+def iterator_fusion0_lambda2(a, y):
+    return (y - a)
+def iterator_fusion0_fused0(b0, x0):
+    return __builtin__.abs(iterator_fusion0_lambda2(b0, x0))
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.IterTransformation",
+                                   "pythran.optimizations.IteratorFusion"])
+
+    def test_iterator_fusion1(self):
+        self.run_test("""
+def iterator_fusion1(l, a):
+    s = 0
+    for x in map(lambda y: y * a, filter(None, l)):
+        s += x
+    for x in map(lambda y, z: y * z, l, l):
+        s -= x
+    return s, sum(map(abs, map(lambda y: y - a, l)))""",
+                      [1, 0, -3, 4], 2, iterator_fusion1=[[int], int])
+
+    def test_loop_versioning0(self):
+        init = """
+import numpy
+def loop_versioning0(x, y, n):
+    z = numpy.zeros(n)
+    for i in range(n):
+        z[i] = 2 * x[i]
+    for i in range(n):
+        y[i] += z[i] * x[i]
+    return z"""
+
+        ref = """import __alias__
+import itertools
+import numpy as pythonic::numpy
+def loop_versioning0(x, y, n):
+    z = numpy.zeros(n)
+    for i_ in __builtin__.range(n):
+        z[i_] = (2 * x[i_])
+    if __alias__.disjoint(y, x):
+        for i in __builtin__.range(n):
+            y[i] += (z[i] * x[i])
+    else:
+        for i in __builtin__.range(n):
+            y[i] += (z[i] * x[i])
+    return z
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.LoopVersioning"])
+
+    def test_loop_versioning1(self):
+        self.run_test("""
+import numpy
+def loop_versioning1(a, x, y):
+    for i in range(len(x)):
+        y[i] += a * x[i]
+    z = numpy.ones(len(x))
+    for i in range(len(x)):
+        z[i] -= y[i]
+    l = [0.] * len(x)
+    for i in range(len(l)):
+        l[i] = z[i] + y[i]
+    return y, z, l""", 2., numpy.arange(10.), numpy.ones(10), loop_versioning1=[float, numpy.array([float]), numpy.array([float])])
+
+    def test_blas_recognition0(self):
+        init = """
+import numpy
+def blas_recognition0(a, x, y, n):
+    z = numpy.zeros(n)
+    for i in range(n):
+        for j in range(n):
+            z[i] += x[j] * a[i, j]
+    for i in range(n):
+        for j in range(n):
+            y[i] += a[i, j] * z[j]
+    return z"""
+
+        ref = """import __blas__
+import itertools
+import numpy as pythonic::numpy
+def blas_recognition0(a, x, y, n):
+    z = numpy.zeros(n)
+    __blas__.gemv(a, x, z, n, n)
+    for i in __builtin__.range(n):
+        for j in __builtin__.range(n):
+            y[i] += (a[(i, j)] * z[j])
+    return z
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.BlasRecognition"])
+
+    def test_blas_recognition1(self):
+        self.run_test("""
+import numpy
+def blas_recognition1(n):
+    a = numpy.arange(n * n * 1.).reshape((n, n))
+    c = numpy.ones((n, n))
+    for i in range(n):
+        for k in range(n):
+            for j in range(n):
+                c[i][j] += a[k][j] * a[i][k]
+    return c""", 20, blas_recognition1=[int])
+
+    def test_blas_recognition2(self):
+        init = """
+import numpy
+def blas_recognition2(a, b, n):
+    x = a[:, 0]
+    y = numpy.ones(n)
+    r = numpy.zeros(n)
+    s = 0.
+    t = 0.
+    for i in range(n):
+        s += x[i] * y[i]
+    for i in range(n):
+        r += b[i] * b[i]
+    for i in range(n):
+        t += y[i] * y[i]
+    return r, s, t"""
+
+        ref = """import __blas__
+import itertools
+import numpy as pythonic::numpy
+def blas_recognition2(a, b, n):
+    x = a[:, 0]
+    y = numpy.ones(n)
+    r = numpy.zeros(n)
+    s = 0.0
+    t = 0.0
+    for i__ in __builtin__.range(n):
+        s += (x[i__] * y[i__])
+    for i_ in __builtin__.range(n):
+        r += (b[i_] * b[i_])
+    t += __blas__.dot(y, y, n)
+    return (r, s, t)
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.BlasRecognition"])
+
+    def test_reduction_recognition0(self):
+        init = """
+def reduction_recognition0(l, n):
+    s = 0
+    p = 1
+    f = 0
+    res = [0]
+    alias = res
+    for x in range(n):
+        s += x
+    for y in range(1, n):
+        p *= y
+    for z in l:
+        f += z
+    for r in l:
+        res += [r]
+    return s, p, f, len(alias)"""
+
+        ref = """import operator_
+import itertools
+def reduction_recognition0(l, n):
+    s = 0
+    p = 1
+    f = 0
+    res = [0]
+    alias = res
+    s = __builtin__.sum(__builtin__.range(n), s)
+    p = __builtin__.reduce(operator_.mul, __builtin__.range(1, n), p)
+    for z in l:
+        f += z
+    for r in l:
+        res += [r]
+    return (s, p, f, __builtin__.len(alias))
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.ReductionRecognition"])
+
+    def test_reduction_recognition1(self):
+        self.run_test("""
+def reduction_recognition1(l):
+    m, found = 0, False
+    for x in l:
+        m = max(m, x)
+    for y in l:
+        if not y:
+            found = True
+            break
+    return m, found""", [3, -4, 0, 2], reduction_recognition1=[[int]])
+
+    def test_loop_interchange0(self):
+        init = """
+import numpy
+def loop_interchange0(a, n, m):
+    b = numpy.zeros((n, m))
+    for j in range(m):
+        for i in range(n):
+            b[i, j] = 2 * a[i, j]
+    s = 0
+    for j in range(m):
+        for i in range(n):
+            s += a[i, j]
+    for j in range(1, m):
+        for i in range(n):
+            a[i, j] = a[i, j - 1]
+    return b, s"""
+
+        ref = """import itertools
+import numpy as pythonic::numpy
+def loop_interchange0(a, n, m):
+    b = numpy.zeros((n, m))
+    for i__ in __builtin__.range(n):
+        for j in __builtin__.range(m):
+            b[(i__, j)] = (2 * a[(i__, j)])
+    s = 0
+    for j in __builtin__.range(m):
+        for i in __builtin__.range(n):
+            s += a[(i, j)]
+    for j in __builtin__.range(1, m):
+        for i_ in __builtin__.range(n):
+            a[(i_, j)] = a[(i_, (j - 1))]
+    return (b, s)
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.LoopInterchange"])
+
+    def test_loop_interchange1(self):
+        self.run_test("""
+import numpy
+def loop_interchange1(n, m):
+    a = numpy.ones((n, m))
+    b = numpy.zeros((n, m))
+    for j in range(m):
+        for i in range(n):
+            t = a[i, j] + i * j
+            b[i, j] = t * t
+    return b""", 3, 5, loop_interchange1=[int, int])
+
+    def test_loop_tiling0(self):
+        init = """
+import numpy
+def loop_tiling0(a, b, n):
+    c = numpy.zeros((n, n))
+    #omp parallel for
+    for i in range(n):
+        for j in range(n):
+            for k in range(n):
+                c[i, j] += a[i, k] * b[k, j]
+    return c"""
+
+        ref = """import itertools
+import numpy as pythonic::numpy
+def loop_tiling0(a, b, n):
+    c = numpy.zeros((n, n))
+    'omp parallel for'
+    for i_tile in __builtin__.range(0, n, 64):
+        for j_tile in __builtin__.range(0, n, 64):
+            for k_tile in __builtin__.range(0, n, 64):
+                for i in __builtin__.range(i_tile, __builtin__.min((i_tile + 64), n)):
+                    for j in __builtin__.range(j_tile, __builtin__.min((j_tile + 64), n)):
+                        for k in __builtin__.range(k_tile, __builtin__.min((k_tile + 64), n)):
+                            c[(i, j)] += (a[(i, k)] * b[(k, j)])
+    return c
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.LoopTiling"])
+
+    def test_loop_tiling1(self):
+        self.run_test("""
+import numpy
+def loop_tiling1(n):
+    a = numpy.arange(n * n).reshape(n, n)
+    b = numpy.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            b[i, j] = a[j, i] - a[i, j]
+    return b""", 300, loop_tiling1=[int])
+
+    def test_loop_tiling2(self):
+        init = """
+import numpy
+def loop_tiling2(a, b, n):
+    c = numpy.zeros((n, n))
+    #omp parallel for
+    for i in range(n):
+        for j in range(n):
+            for k in range(n):
+                c[i, j] += a[i, k] * b[k, j]
+    for i in range(n):
+        c[i, i] = 1.
+    return c"""
+
+        ref = """import itertools
+import numpy as pythonic::numpy
+def loop_tiling2(a, b, n):
+    c = numpy.zeros((n, n))
+    'omp parallel for'
+    for i in __builtin__.range(n):
+        for j in __builtin__.range(n):
+            for k in __builtin__.range(n):
+                c[(i, j)] += (a[(i, k)] * b[(k, j)])
+    for i in __builtin__.range(n):
+        c[(i, i)] = 1.0
+    return c
+def __init__():
+    return __builtin__.None
+__init__()"""
+
+        self.check_ast(init, ref, ["pythran.optimizations.LoopTiling"])
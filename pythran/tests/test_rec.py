@@ -1,4 +1,6 @@
 from test_env import TestEnv
+from pythran import generate_cxx
+from pythran.syntax import PythranSyntaxError
 
 class TestBase(TestEnv):
 
@@ -18,3 +20,19 @@ def test_rec1(n):
     z = n * test_rec1(n-1)
     n -= 1
   return z""", 5, test_rec1=[int])
+
+    def test_memoize_rec(self):
+        self.run_test("""
+#pythran memoize test_memoize_rec
+def test_memoize_rec(n):
+  return n if n < 2 else test_memoize_rec(n-1) + test_memoize_rec(n-2)""",
+                      60, test_memoize_rec=[int])
+
+    def test_memoize_unhashable(self):
+        code = """
+# pythran memoize test_memoize_unhashable
+def test_memoize_unhashable(n, l):
+  return n + len(l)"""
+        self.assertRaises(PythranSyntaxError, generate_cxx,
+                          "test_memoize_unhashable", code,
+                          {"test_memoize_unhashable": [int, [int]]})
@@ -39,6 +39,16 @@ def simd_rosen_der(n):
     return der'''
         self.run_test(code, 40, simd_rosen_der=[int])
 
+    def test_simd_flat_expr(self):
+        code = '''
+import numpy
+def simd_flat_expr(n):
+    a = numpy.arange(n * 3.).reshape(n, 3)
+    b = numpy.sqrt(2 * a + 1) - a / 3
+    b[1] = a[0] * a[2] + 1.5
+    return b'''
+        self.run_test(code, 11, simd_flat_expr=[int])
+
 
 
 # automatic generation of basic test cases for ufunc
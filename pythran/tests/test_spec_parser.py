@@ -10,6 +10,12 @@ import os.path
 #pythran export a( long )
 #pythran export a( long[] )
 #pythran export a( long[][] )
+#pythran export a( long[3] )
+#pythran export a( float[:,3] )
+#pythran export a( float[4,4] list )
+#pythran export a( float[::] )
+#pythran export a( int[:, ::] )
+#pythran export a( float[:,:] order F )
 #pythran export a( int8 )
 #pythran export a( uint8 )
 #pythran export a( int16 )
@@ -29,6 +35,7 @@ import os.path
 #pythran export a( (int32, ( uint32 , int64 ) ) )
 #pythran export a( uint64:float32 dict )
 #pythran export a( float64, complex64, complex128 )
+#pythran memoize a
 
 class TestSpecParser(unittest.TestCase):
 
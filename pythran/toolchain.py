@@ -15,15 +15,16 @@ import ast
 from middlend import refine
 from backend import Cxx
 import frontend
-from syntax import check_syntax
+from syntax import check_syntax, PythranSyntaxError
 from passes import NormalizeIdentifiers, ExtractTopLevelStmts
 from openmp import GatherOMPData
 from config import cfg
 from passmanager import PassManager
-from numpy import get_include
+from numpy import get_include, ndarray
 from typing import extract_constructed_types, pytype_to_ctype, pytype_to_deps
 from tables import pythran_ward, functions
 from intrinsic import ConstExceptionIntr
+import metadata
 
 from os import devnull
 from subprocess import check_call, check_output, STDOUT, CalledProcessError
@@ -51,6 +52,89 @@ def _extract_specs_dependencies(specs):
     return deps
 
 
+def _fixed_shapes(signatures):
+    '''Returns the extents of the arguments whose shape is fixed the same
+    way by all `signatures', as a dict indexed by argument position'''
+    shapes = dict()
+    for i, types in enumerate(zip(*signatures)):
+        extents = {getattr(t, 'extents', None) or None for t in types}
+        if len(extents) == 1 and None not in extents:
+            shapes[i] = extents.pop()
+    return shapes
+
+
+def _flag_fixed_shapes(ir, specs, renamings):
+    '''Attaches the extents fixed by `specs' to the exported functions'''
+    functions = {stmt.name: stmt for stmt in ir.body
+                 if isinstance(stmt, ast.FunctionDef)}
+    for function_name, signatures in specs.iteritems():
+        function = functions.get(renamings.get(function_name, function_name))
+        if function is None:
+            continue
+        if not isinstance(signatures, tuple):
+            signatures = (signatures,)
+        for i, extents in _fixed_shapes(signatures).iteritems():
+            if i < len(function.args.args):
+                metadata.add(function,
+                             metadata.FixedShape(function.args.args[i].id,
+                                                 extents))
+
+
+def _unhashable(t):
+    '''Name of the unhashable container in type `t', or None'''
+    if isinstance(t, tuple):
+        return next((n for n in map(_unhashable, t) if n), None)
+    for container, name in ((list, 'list'), (set, 'set'), (dict, 'dict'),
+                            (ndarray, 'array')):
+        if isinstance(t, container):
+            return name
+    return None
+
+
+def _check_memoized_signatures(ir, specs, renamings):
+    '''Memoized functions are indexed by the value of their arguments, so
+    `specs' must not export them with containers that cannot be hashed'''
+    functions = {stmt.name: stmt for stmt in ir.body
+                 if isinstance(stmt, ast.FunctionDef)}
+    for function_name, signatures in specs.iteritems():
+        function = functions.get(renamings.get(function_name, function_name))
+        if function is None or not metadata.get(function, metadata.Memoize):
+            continue
+        if not isinstance(signatures, tuple):
+            signatures = (signatures,)
+        for signature in signatures:
+            for arg, t in zip(function.args.args, signature):
+                name = _unhashable(t)
+                if name:
+                    raise PythranSyntaxError(
+                        "Cannot memoize function `{0}': argument `{1}' "
+                        "is an unhashable {2}".format(function_name, arg.id,
+                                                      name),
+                        function)
+
+
+def _check_fixed_shapes(function_name, arguments, signature):
+    '''Statements raising a ValueError if the shape of an argument does not
+    match the extents given by `signature'.
+    '''
+    message = "argument {0} of `{1}' should have {2} elements along axis {3}"
+    return [If("{0}.shape[{1}] != {2}".format(arg, axis, extent),
+               Statement('throw pythonic::types::ValueError("{0}")'.format(
+                   message.format(i, function_name, extent, axis))))
+            for i, (arg, t) in enumerate(zip(arguments, signature))
+            for axis, extent in enumerate(getattr(t, 'extents', None) or ())
+            if extent is not None]
+
+
+def _contiguous_signature(signature):
+    '''`signature' where strided arrays are replaced by contiguous ones, or
+    None if it has no strided array'''
+    if not any(getattr(t, 'strided', False) for t in signature):
+        return None
+    return [t.view(ndarray) if getattr(t, 'strided', False) else t
+            for t in signature]
+
+
 def _parse_optimization(optimization):
     '''Turns an optimization of the form
         my_optim
@@ -76,6 +160,25 @@ def _pythran_cppflags():
     return [get('.'), get('pythran')]
 
 
+def _blas_cppflags():
+    return [] if cfg.get('blas', 'library') == 'none' else ['-DPYTHRAN_BLAS']
+
+
+def _blas_ldflags():
+    library = cfg.get('blas', 'library')
+    return [] if library == 'none' else cfg.get('blas', library).split()
+
+
+def _openmp_cppflags():
+    return ['-DPYTHONIC_EXPR_THRESHOLD=' + cfg.get('openmp', 'expr_threshold'),
+            '-DPYTHONIC_SORT_THRESHOLD=' + cfg.get('openmp', 'sort_threshold')]
+
+
+def _allocator_cppflags():
+    pool_size = cfg.getint('allocator', 'pool_size')
+    return ['-DPYTHONIC_POOL_SIZE={0}L'.format(pool_size << 20)]
+
+
 def _python_ldflags():
     return ["-L" + sysconfig.get_config_var("LIBPL"),
             "-lpython" + sysconfig.get_config_var('VERSION')]
@@ -129,6 +232,9 @@ def cppflags():
     return (_python_cppflags() +
             _numpy_cppflags() +
             _pythran_cppflags() +
+            _blas_cppflags() +
+            _openmp_cppflags() +
+            _allocator_cppflags() +
             cfg.get('sys', 'cppflags').split() +
             cfg.get('user', 'cppflags').split())
 
@@ -136,6 +242,7 @@ def cppflags():
 def ldflags():
     """The linker flags to link a Pythran code into a shared library"""
     return (_python_ldflags() +
+            _blas_ldflags() +
             cfg.get('sys', 'ldflags').split() +
             cfg.get('user', 'ldflags').split())
 
@@ -150,11 +257,19 @@ def generate_cxx(module_name, code, specs=None, optimizations=None):
     # front end
     ir, renamings = frontend.parse(pm, code)
 
+    # shapes fixed by the specs are known to the middle-end
+    if specs:
+        _flag_fixed_shapes(ir, specs, renamings)
+        _check_memoized_signatures(ir, specs, renamings)
+
     # middle-end
     optimizations = (optimizations or
                      cfg.get('pythran', 'optimizations').split())
     optimizations = map(_parse_optimization, optimizations)
-    refine(pm, ir, optimizations)
+    fixed_point_optimizations = map(_parse_optimization,
+                                    cfg.get('pythran', 'fixed_point').split())
+    max_iterations = cfg.getint('pythran', 'max_iterations')
+    refine(pm, ir, optimizations, fixed_point_optimizations, max_iterations)
 
     # back-end
     content = pm.dump(Cxx, ir)
@@ -232,19 +347,48 @@ def generate_cxx(module_name, code, specs=None, optimizations=None):
                 arguments = ["a{0}".format(i)
                              for i in xrange(len(arguments_types))]
                 name_fmt = pythran_ward + "{0}::{1}::type{2}"
-                args_list = ", ".join(arguments_types)
-                specialized_fname = name_fmt.format(module_name,
-                                                    internal_func_name,
-                                                    "<{0}>".format(args_list)
-                                                    if has_arguments else "")
-                result_type = ("typename std::remove_reference"
-                               + "<typename {0}::result_type>::type".format(
-                                 specialized_fname))
+
+                def result_type_of(types):
+                    specialized_fname = name_fmt.format(
+                        module_name, internal_func_name,
+                        "<{0}>".format(", ".join(types))
+                        if has_arguments else "")
+                    return ("typename std::remove_reference"
+                            + "<typename {0}::result_type>::type".format(
+                              specialized_fname))
+                result_type = result_type_of(arguments_types)
+                call_fmt = "{0}()({{0}})".format(
+                    pythran_ward + '{0}::{1}'.format(module_name,
+                                                     internal_func_name))
+                call = call_fmt.format(', '.join(arguments))
                 mod.add_to_init(
                     [Statement("pythonic::python_to_pythran<{0}>()".format(t))
                      for t in _extract_all_constructed_types(signature)])
                 mod.add_to_init([Statement(
                     "pythonic::pythran_to_python<{0}>()".format(result_type))])
+                contiguous_signature = _contiguous_signature(signature)
+                if contiguous_signature is None:
+                    body = [Statement("return {0}".format(call))]
+                else:
+                    # strided arrays that happen to be contiguous are handed
+                    # to the kernel specialized for contiguous arrays
+                    strided = [a for a, t in zip(arguments, signature)
+                               if getattr(t, 'strided', False)]
+                    contiguous_call = call_fmt.format(', '.join(
+                        a + ".contiguous()" if a in strided else a
+                        for a in arguments))
+                    contiguous_type = result_type_of(
+                        [pytype_to_ctype(t) for t in contiguous_signature])
+                    mod.add_to_init([Statement(
+                        "pythonic::pythran_to_python<{0}>()".format(
+                            contiguous_type))])
+                    body = [If(" and ".join(a + ".is_contiguous()"
+                                            for a in strided),
+                               Statement("return boost::python::object("
+                                         "{0})".format(contiguous_call))),
+                            Statement("return boost::python::object("
+                                      "{0})".format(call))]
+                    result_type = "boost::python::object"
                 mod.add_function(
                     FunctionBody(
                         FunctionDeclaration(
@@ -253,10 +397,8 @@ def generate_cxx(module_name, code, specs=None, optimizations=None):
                                 numbered_function_name),
                             [Value(t, a)
                              for t, a in zip(arguments_types, arguments)]),
-                        Block([Statement("return {0}()({1})".format(
-                            pythran_ward + '{0}::{1}'.format(
-                                module_name, internal_func_name),
-                            ', '.join(arguments)))])
+                        Block(_check_fixed_shapes(function_name, arguments,
+                                                  signature) + body)
                     ),
                     function_name
                 )
@@ -52,8 +52,14 @@ def pytype_to_ctype(t):
             ", ".join('std::declval<{}>()'.format(
                 pytype_to_ctype(_)) for _ in t)
             )
+    elif isinstance(t, ndarray) and getattr(t, 'order', 'C') == 'F' \
+            and t.ndim == 2:
+        # column-major matrices are seen as transposed row-major matrices
+        return 'pythonic::types::numpy_texpr<{0}>'.format(
+            pytype_to_ctype(t.view(ndarray)))
     elif isinstance(t, ndarray):
-        return 'pythonic::types::ndarray<{0},{1}>'.format(
+        return 'pythonic::types::{0}<{1},{2}>'.format(
+            'strided_ndarray' if getattr(t, 'strided', False) else 'ndarray',
             pytype_to_ctype(t.flat[0]), t.ndim)
     elif t in pytype_to_ctype_table:
         return pytype_to_ctype_table[t]
@@ -74,7 +80,11 @@ def pytype_to_deps(t):
     elif isinstance(t, tuple):
         return {'pythonic/types/tuple.hpp'}.union(*map(pytype_to_deps, t))
     elif isinstance(t, ndarray):
-        return {'pythonic/types/ndarray.hpp'}.union(pytype_to_deps(t[0]))
+        deps = {'pythonic/types/ndarray.hpp'}.union(pytype_to_deps(t[0]))
+        # the wrapper checks the extents fixed by the spec
+        if getattr(t, 'extents', None):
+            deps.add('pythonic/__builtin__/ValueError.hpp')
+        return deps
     elif t in pytype_to_ctype_table:
         return {'pythonic/types/{}.hpp'.format(t.__name__)}
     else:
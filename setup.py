@@ -148,7 +148,7 @@ class BenchmarkCommand(Command):
          'number of times the benchmark is run'
          '(default={0})'.format(default_nb_iter)),
         ('mode=', None,
-         'mode to use (cpython, pythran, pythran' '+omp)')
+         'mode to use (cpython, pythran, pythran+omp, pythran+simd)')
     ]
 
     runas_marker = '#runas '
@@ -203,6 +203,8 @@ class BenchmarkCommand(Command):
                         cxxflags = ["-Ofast", "-DNDEBUG"]
                         if self.mode == "pythran+omp":
                             cxxflags.append("-fopenmp")
+                        elif self.mode == "pythran+simd":
+                            cxxflags += ["-DUSE_BOOST_SIMD", "-march=native"]
                         compile_pythranfile(candidate,
                                             cxxflags=cxxflags)
 